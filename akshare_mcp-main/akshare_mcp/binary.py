@@ -0,0 +1,75 @@
+"""
+二进制输出格式：Arrow IPC 与 Parquet
+
+下游直接把结果读回 pandas 时，文本格式的渲染与解析都是浪费。这里把 DataFrame
+编码为 Arrow IPC 流或 Parquet 文件，作为 MCP 内嵌资源（base64 blob）返回。
+客户端用 akshare_mcp.client.decode_table 解码，Arrow 格式无需复制数据。
+
+依赖 pyarrow：pip install akshare_mcp[arrow]
+"""
+import base64
+import math
+from typing import Literal
+
+import pandas as pd
+from mcp.types import BlobResourceContents, EmbeddedResource
+
+__all__ = ["ARROW_MIME", "PARQUET_MIME", "dataframe_to_arrow", "dataframe_to_parquet", "binary_resource", "require_pyarrow"]
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+PARQUET_MIME = "application/vnd.apache.parquet"
+
+
+def require_pyarrow():
+    """导入 pyarrow，未安装时提示安装方式"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("arrow/parquet 格式需要 pyarrow，请执行 pip install akshare_mcp[arrow]") from None
+    return pyarrow
+
+
+def _to_table(df: pd.DataFrame):
+    pa = require_pyarrow()
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    # 部分 akshare 接口的 object 列混有字符串与数字，这些列转为字符串
+    df = df.copy()
+    for name in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[name], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[name] = [None if v is None or (isinstance(v, float) and math.isnan(v)) else str(v)
+                        for v in df[name].tolist()]
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def dataframe_to_arrow(df: pd.DataFrame, compression: Literal["lz4", "zstd", None] = None) -> bytes:
+    """编码为 Arrow IPC 流；不压缩时客户端可零拷贝读取"""
+    pa = require_pyarrow()
+    table = _to_table(df)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def dataframe_to_parquet(df: pd.DataFrame, compression: str = "zstd") -> bytes:
+    """编码为 Parquet 文件，体积最小"""
+    pa = require_pyarrow()
+    sink = pa.BufferOutputStream()
+    pa.parquet.write_table(_to_table(df), sink, compression=compression)
+    return sink.getvalue().to_pybytes()
+
+
+def binary_resource(data: bytes, mime_type: str, uri: str) -> EmbeddedResource:
+    """包装为 MCP 内嵌资源，数据以 base64 blob 传输"""
+    return EmbeddedResource(
+        type="resource",
+        resource=BlobResourceContents(uri=uri, mimeType=mime_type, blob=base64.b64encode(data).decode("ascii")),
+    )
@@ -0,0 +1,239 @@
+"""
+按函数配置的结果缓存
+
+配置文件中的 ``cache`` 为每个 akshare 函数声明 TTL、参与缓存键的参数、最大条目数
+以及是否落盘。缓存条目保存函数返回的原始数据，同时保存按输出格式渲染好的文本，
+命中时既不请求上游也不重新渲染；每个条目保留的渲染结果数不超过 max_rendered，
+超出时淘汰最久未用的。
+
+同一个键同时只有一个上游请求，其余调用等待并共用其结果。配置共享缓存
+（akshare_mcp.shared_cache.SharedCache）时原始数据改存其中，多个进程之间同样如此。
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from akshare_mcp.shared_cache import SharedCache
+
+__all__ = ["CachePolicy", "CacheEntry", "FunctionCache", "cache_dir", "load_policies"]
+
+
+def cache_dir() -> str:
+    """本地缓存目录，AKSHARE_MCP_CACHE_DIR 优先"""
+    return os.environ.get("AKSHARE_MCP_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "akshare_mcp")
+
+
+@dataclass
+class CachePolicy:
+    """单个函数的缓存策略"""
+    ttl: float = 0
+    key: Optional[List[str]] = None
+    max_entries: int = 16
+    persist: bool = False
+    max_rendered: int = 4
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+
+def load_policies(config: Dict[str, Dict[str, Any]]) -> Dict[str, CachePolicy]:
+    """解析配置文件中的 cache 字典，"*" 的取值作为各函数的默认值"""
+    names = {f.name for f in fields(CachePolicy)}
+    for func_name, options in config.items():
+        unknown = set(options) - names
+        if unknown:
+            raise ValueError(f"{func_name} 的缓存配置包含未知字段: {sorted(unknown)}，可选字段: {sorted(names)}")
+    defaults = config.get("*", {})
+    policies = {"*": CachePolicy(**defaults)}
+    for func_name, options in config.items():
+        if func_name != "*":
+            policies[func_name] = CachePolicy(**{**defaults, **options})
+    return policies
+
+
+@dataclass
+class CacheEntry:
+    """缓存条目：原始数据及其各种渲染结果"""
+    value: Any
+    expires_at: float
+    rendered: "OrderedDict[Hashable, Any]" = field(default_factory=OrderedDict)
+
+
+class _Flight:
+    """进行中的上游请求，等待者从这里取结果"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[CacheEntry] = None
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class FunctionCache:
+    """单个函数的 LRU 缓存
+
+    persist=True 时原始数据同时写入磁盘；配置 shared 时原始数据写入共享缓存，
+    persist 不再起作用（共享缓存本身在磁盘上）。
+    """
+
+    def __init__(self, name: str, signature: inspect.Signature, policy: CachePolicy, root: Optional[str] = None,
+                 shared: Optional[SharedCache] = None):
+        self.name = name
+        self.signature = signature
+        self.policy = policy
+        self.root = os.path.join(root or os.path.join(cache_dir(), "results"), name)
+        self.shared = shared
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, args: tuple, kwargs: Dict[str, Any]) -> str:
+        """按 key 策略生成缓存键，未列出的参数不影响命中"""
+        bound = self.signature.bind_partial(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if self.policy.key is not None:
+            arguments = {k: arguments.get(k) for k in self.policy.key}
+        return json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".pkl")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """返回未过期的条目，内存未命中时尝试读取磁盘"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    return entry
+                del self._entries[key]
+        if self.shared is not None:
+            found = self.shared.get(self.name, key)
+            return None if found is None else self._store(key, CacheEntry(found[1], found[0]))
+        if not self.policy.persist:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if expires_at <= now:
+            return None
+        return self._store(key, CacheEntry(value, expires_at))
+
+    def put(self, key: str, value: Any) -> Optional[CacheEntry]:
+        """写入原始数据；空结果不缓存，返回 None"""
+        if value is None or (hasattr(value, "empty") and value.empty) or (isinstance(value, (list, dict)) and not value):
+            return None
+        entry = CacheEntry(value, time.time() + self.policy.ttl)
+        if self.shared is not None:
+            self.shared.put(self.name, key, entry.expires_at, value, self.policy.max_entries)
+        elif self.policy.persist:
+            self._write(self._path(key), (entry.expires_at, value))
+        return self._store(key, entry)
+
+    def fetch(self, key: str, call: Callable[[], Any]) -> Tuple[Optional[CacheEntry], Any]:
+        """缓存未命中时调用 call 请求上游，返回 (条目, 原始数据)，结果为空时条目为 None
+
+        同一个键同时只有一个线程请求上游，其余线程等待并共用其结果或异常。
+        """
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry, flight.value
+        try:
+            flight.entry, flight.value = self._fetch(key, call)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+        return flight.entry, flight.value
+
+    def _fetch(self, key: str, call: Callable[[], Any]) -> Tuple[Optional[CacheEntry], Any]:
+        if self.shared is None:
+            value = call()
+            return self.put(key, value), value
+        while True:
+            entry = self.get(key)
+            if entry is not None:
+                return entry, entry.value
+            token = self.shared.acquire(self.name, key)
+            if token is None:
+                # 其它进程正在请求，等它写入结果；请求失败或结果为空时重新争取租约
+                self.shared.wait(self.name, key)
+                continue
+            try:
+                # 取得租约前其它进程可能刚好写入了结果
+                entry = self.get(key)
+                if entry is not None:
+                    return entry, entry.value
+                value = call()
+                return self.put(key, value), value
+            finally:
+                self.shared.release(self.name, key, token)
+
+    def rendered(self, entry: CacheEntry, render_key: Hashable) -> Optional[Any]:
+        """返回条目中已保存的渲染结果"""
+        with self._lock:
+            content = entry.rendered.get(render_key)
+            if content is not None:
+                entry.rendered.move_to_end(render_key)
+            return content
+
+    def keep_rendered(self, entry: CacheEntry, render_key: Hashable, content: Any) -> None:
+        """保存渲染结果，超过 max_rendered 种时淘汰最久未用的"""
+        if self.policy.max_rendered <= 0:
+            return
+        with self._lock:
+            entry.rendered[render_key] = content
+            entry.rendered.move_to_end(render_key)
+            while len(entry.rendered) > self.policy.max_rendered:
+                entry.rendered.popitem(last=False)
+
+    def _store(self, key: str, entry: CacheEntry) -> CacheEntry:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.policy.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _write(path: str, payload: Any) -> None:
+        # 先写临时文件再原子替换；磁盘不可写或数据无法序列化时只保留内存缓存
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            os.unlink(tmp)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
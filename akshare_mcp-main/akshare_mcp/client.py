@@ -0,0 +1,56 @@
+"""
+客户端解码工具
+
+把 arrow/parquet 格式的工具结果还原为 pyarrow.Table 或 pandas.DataFrame::
+
+    from fastmcp import Client
+    from akshare_mcp.client import decode_dataframe
+
+    async with Client("http://127.0.0.1:8000/mcp") as client:
+        result = await client.call_tool("stock_zh_a_spot_em", {"format": "arrow"})
+        df = decode_dataframe(result)
+
+Arrow IPC 流直接在 base64 解码后的内存上构建列，不再复制；
+Parquet 需要解压，但体积更小。
+"""
+import base64
+from typing import Any
+
+from akshare_mcp.binary import ARROW_MIME, PARQUET_MIME, require_pyarrow
+
+__all__ = ["decode_table", "decode_dataframe"]
+
+
+def _blob(result: Any):
+    """从 CallToolResult、content 列表、EmbeddedResource 或 BlobResourceContents 中取出 blob"""
+    if hasattr(result, "content"):
+        result = result.content
+    if isinstance(result, (list, tuple)):
+        for item in result:
+            if getattr(getattr(item, "resource", None), "blob", None) is not None:
+                return item.resource
+        raise ValueError("结果中没有二进制内容，请以 format='arrow' 或 'parquet' 调用工具")
+    if hasattr(result, "resource"):
+        result = result.resource
+    return result
+
+
+def decode_table(result: Any):
+    """解码为 pyarrow.Table"""
+    pa = require_pyarrow()
+    if isinstance(result, (bytes, bytearray, memoryview)):
+        data, mime_type = bytes(result), None
+    else:
+        blob = _blob(result)
+        data, mime_type = base64.b64decode(blob.blob), blob.mimeType
+    buffer = pa.py_buffer(data)
+    if mime_type == PARQUET_MIME or (mime_type is None and data[:4] == b"PAR1"):
+        return pa.parquet.read_table(pa.BufferReader(buffer))
+    if mime_type not in (ARROW_MIME, None):
+        raise ValueError(f"不支持的类型: {mime_type}")
+    return pa.ipc.open_stream(buffer).read_all()
+
+
+def decode_dataframe(result: Any):
+    """解码为 pandas.DataFrame"""
+    return decode_table(result).to_pandas()
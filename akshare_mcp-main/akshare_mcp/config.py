@@ -1 +1,65 @@
+# 请复制函数名到名单中。https://akshare.akfamily.xyz/data/index.html
 
+# 白名单
+white_list = [
+    # "stock_info_global_cls",  # 资讯数据-财联社
+    "stock_info_cjzc_em",  # 资讯数据-财经早餐-东方财富
+    "stock_info_global_em" , # 资讯数据-东方财富
+    "stock_info_global_sina",  # 资讯数据-新浪财经
+    "stock_info_global_futu",  # 资讯数据-富途牛牛
+    "stock_info_global_ths",  # 资讯数据-同花顺
+    "stock_info_broker_sina",  # 新浪财经-证券-证券原创
+    "stock_zh_index_spot_em",
+    "index_global_spot_em",
+    "stock_zh_a_spot_em",
+    "stock_yjbb_em",
+    "stock_zt_pool_em",
+]
+
+# 黑名单
+black_list = [
+    "car_market_total_cpca",
+]
+
+# 缓存，键为函数名，"*"为所有函数的默认值
+#   ttl: 缓存秒数，0表示不缓存
+#   key: 参与缓存键的参数名，None表示全部参数
+#   max_entries: 最多缓存的参数组合数
+#   persist: 是否写入磁盘，重启后未过期的数据仍然有效
+#   max_rendered: 每个参数组合最多保留的渲染结果数（不同格式、limit/offset/columns）
+cache = {
+    "*": {"ttl": 0, "key": None, "max_entries": 16, "persist": False, "max_rendered": 4},
+    "stock_info_cjzc_em": {"ttl": 600},
+    "stock_info_global_em": {"ttl": 60},
+    "stock_info_global_sina": {"ttl": 60},
+    "stock_info_global_futu": {"ttl": 60},
+    "stock_info_global_ths": {"ttl": 60},
+    "stock_info_broker_sina": {"ttl": 600},
+    "stock_zh_index_spot_em": {"ttl": 30},
+    "index_global_spot_em": {"ttl": 30},
+    "stock_zh_a_spot_em": {"ttl": 30},
+    "stock_yjbb_em": {"ttl": 86400, "key": ["date"], "persist": True},
+    "stock_zt_pool_em": {"ttl": 60, "key": ["date"], "max_entries": 32},
+}
+
+# 执行akshare调用和渲染的线程数，sse/streamable-http下多个客户端的请求并发执行
+workers = 8
+
+# 每个函数同时执行的调用数上限，键为函数名，"*"为默认值，None或0表示只受workers限制
+concurrency = {
+    "*": 4,
+    "stock_zh_a_spot_em": 2,
+}
+
+# 大结果转存，渲染后超过threshold字节的markdown/csv/json结果写入本地，以MCP资源
+# akshare://results/{result_id} 暴露，工具只返回列信息、行数、前head行和资源URI
+#   threshold: 字节数，0表示不转存
+#   ttl: 转存结果保留秒数
+#   head: 工具响应中内联的行数
+spill = {"threshold": 64 * 1024, "ttl": 3600, "head": 10}
+
+# 多进程共享缓存，多个akshare_mcp进程部署在同一主机时使用
+#   backend: None表示各进程独立缓存，"sqlite"表示共享同一个SQLite数据库（WAL模式）
+#   path: 数据库路径，None表示缓存目录下的shared.sqlite3，各进程须一致
+#   lease: 秒数，某个进程请求上游期间其它进程等待其结果，超过该时间未完成则由其它进程接手
+shared_cache = {"backend": None, "path": None, "lease": 60}
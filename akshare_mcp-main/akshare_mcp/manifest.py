@@ -0,0 +1,186 @@
+"""
+akshare 工具清单
+
+`import akshare` 会加载上千个接口所在的全部子模块，是启动耗时的主要来源。
+这里把 akshare 命名空间中所有函数的名称、所在模块、签名和文档预先扫描成清单并缓存到磁盘，
+akshare 版本变化时自动重建。注册工具时直接从清单生成函数，真正的 akshare 模块
+在工具第一次被调用时才导入。
+"""
+import ast
+import datetime
+import importlib
+import importlib.metadata
+import inspect
+import json
+import os
+import tempfile
+import typing
+from typing import Any, Callable, Dict, Optional
+
+from akshare_mcp.cache import cache_dir
+
+MANIFEST_FORMAT = 1
+
+# 清单中保存的注解字符串可还原成的类型，只按名称查表，不执行清单中的文本
+_ANNOTATION_NAMES: Dict[str, Any] = {
+    "str": str, "int": int, "float": float, "bool": bool, "list": list, "dict": dict, "tuple": tuple,
+    "date": datetime.date, "datetime.date": datetime.date, "datetime.datetime": datetime.datetime,
+    **{name: getattr(typing, name) for name in ("Any", "AnyStr", "Dict", "List", "Literal", "Optional", "Tuple", "Union")},
+}
+
+_resolved: Dict[str, Callable] = {}
+
+
+def akshare_version() -> str:
+    """不导入 akshare 直接读取已安装的版本号"""
+    return importlib.metadata.version("akshare")
+
+
+def manifest_path() -> str:
+    return os.path.join(cache_dir(), "manifest.json")
+
+
+def _jsonable(value: Any) -> bool:
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _describe(name: str, func: Callable) -> Dict[str, Any]:
+    params = []
+    for param in inspect.signature(func).parameters.values():
+        item: Dict[str, Any] = {"name": param.name, "kind": param.kind.name}
+        if param.annotation is not inspect.Parameter.empty:
+            item["annotation"] = inspect.formatannotation(param.annotation)
+        if param.default is not inspect.Parameter.empty:
+            if _jsonable(param.default):
+                item["default"] = param.default
+            else:
+                item["default_repr"] = repr(param.default)
+        params.append(item)
+    return {
+        "name": name,
+        "module": func.__module__,
+        "qualname": func.__name__,
+        "doc": inspect.getdoc(func) or "",
+        "parameters": params,
+    }
+
+
+def build_manifest() -> Dict[str, Any]:
+    """扫描 akshare 命名空间生成清单（需要完整导入 akshare）"""
+    import akshare as ak
+
+    functions = {}
+    for name, func in inspect.getmembers(ak, inspect.isfunction):
+        try:
+            functions[name] = _describe(name, func)
+        except (TypeError, ValueError):
+            continue
+    return {"format": MANIFEST_FORMAT, "akshare_version": akshare_version(), "functions": functions}
+
+
+def load_manifest(path: Optional[str] = None, rebuild: bool = False) -> Dict[str, Any]:
+    """读取缓存的清单，版本不一致或文件损坏时重建并写回"""
+    path = path or manifest_path()
+    version = akshare_version()
+    if not rebuild and os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("format") == MANIFEST_FORMAT and manifest.get("akshare_version") == version:
+                return manifest
+        except (OSError, ValueError):
+            pass
+
+    manifest = build_manifest()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # 缓存目录不可写时仅在本次进程内使用
+    return manifest
+
+
+def _dotted_name(node: ast.AST) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return _dotted_name(node.value) + "." + node.attr
+    raise ValueError(ast.dump(node))
+
+
+def _annotation_node(node: ast.AST) -> Any:
+    """还原注解语法树：名称查表，支持下标、Literal 中的常量和 X | Y"""
+    if isinstance(node, (ast.Name, ast.Attribute)):
+        return _ANNOTATION_NAMES[_dotted_name(node)]
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Tuple):
+        return tuple(_annotation_node(item) for item in node.elts)
+    if isinstance(node, ast.Subscript):
+        return _annotation_node(node.value)[_annotation_node(node.slice)]
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return typing.Union[_annotation_node(node.left), _annotation_node(node.right)]
+    raise ValueError(ast.dump(node))
+
+
+def _annotation(text: Optional[str]) -> Any:
+    """把清单中的注解字符串还原为类型，无法识别时视为没有注解"""
+    if text is None:
+        return inspect.Parameter.empty
+    try:
+        return _annotation_node(ast.parse(text, mode="eval").body)
+    except (SyntaxError, ValueError, KeyError, TypeError):
+        return inspect.Parameter.empty
+
+
+def resolve(entry: Dict[str, Any]) -> Callable:
+    """导入清单条目对应的 akshare 函数（首次调用时）"""
+    func = _resolved.get(entry["name"])
+    if func is None:
+        module = importlib.import_module(entry["module"])
+        func = getattr(module, entry["qualname"], None)
+        if func is None:
+            func = getattr(importlib.import_module("akshare"), entry["name"])
+        _resolved[entry["name"]] = func
+    return func
+
+
+def make_tool(entry: Dict[str, Any]) -> Callable:
+    """根据清单条目生成与原函数签名一致、延迟导入的函数"""
+    parameters = []
+    # 默认值无法写入清单的参数以 None 占位，调用时不传给 akshare，使用原函数默认值
+    placeholders = set()
+    for item in entry["parameters"]:
+        kind = getattr(inspect.Parameter, item["kind"])
+        annotation = _annotation(item.get("annotation"))
+        if "default" in item:
+            default = item["default"]
+        elif "default_repr" in item:
+            default = None
+            placeholders.add(item["name"])
+            if annotation is not inspect.Parameter.empty:
+                annotation = Optional[annotation]
+        else:
+            default = inspect.Parameter.empty
+        parameters.append(inspect.Parameter(item["name"], kind, default=default, annotation=annotation))
+
+    def tool(*args, **kwargs):
+        for name in placeholders:
+            if kwargs.get(name) is None:
+                kwargs.pop(name, None)
+        return resolve(entry)(*args, **kwargs)
+
+    tool.__name__ = tool.__qualname__ = entry["name"]
+    tool.__doc__ = entry["doc"]
+    tool.__module__ = entry["module"]
+    tool.__signature__ = inspect.Signature(parameters)
+    # pydantic 按 __annotations__ 取参数类型
+    tool.__annotations__ = {p.name: p.annotation for p in parameters if p.annotation is not inspect.Parameter.empty}
+    return tool
@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+DataFrame 快速 Markdown（pipe 表格）渲染器
+
+``DataFrame.to_markdown`` 经由 tabulate 对每个单元格逐个推断类型、格式化、测量宽度。
+这里按列向量化完成同样的工作：数值列整列格式化，字符串列只对去重后的取值推断类型
+和测量宽度，最后整表一次 join。
+
+- pad=True 时输出与 ``df.to_markdown(index=False, floatfmt=floatfmt)`` 逐字节一致
+- pad=False 时省略对齐空格，表头、对齐行与冒号位置不变，体积更小
+- 含换行、ANSI 控制符或 bytes 的表格交给 tabulate 处理（pad=False 时换行改写为 <br>）
+"""
+import math
+import re
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from wcwidth import wcswidth
+except ImportError:  # 与 tabulate 一致：没有 wcwidth 时按字符数计算宽度
+    wcswidth = None
+
+__all__ = ["dataframe_to_markdown", "floatfmt_for_precision"]
+
+# tabulate 在表头宽度上额外留出的空格
+MIN_PADDING = 2
+
+# tabulate 的列类型，数值越大越通用
+_NONE, _BOOL, _INT, _FLOAT, _STR = 0, 1, 2, 3, 5
+
+_THOUSANDS = re.compile(r"^(([+-]?[0-9]{1,3})(?:,([0-9]{3}))*)?(?(1)\.[0-9]*|\.[0-9]+)?$")
+_FIXED = re.compile(r"^\.(\d+)f$")
+
+
+class _Fallback(Exception):
+    """表格含有本渲染器不处理的内容"""
+
+
+def floatfmt_for_precision(precision: Optional[int]) -> str:
+    """固定小数位数对应的格式，None 表示 tabulate 默认的 "g\""""
+    return "g" if precision is None else f".{int(precision)}f"
+
+
+def _width(text: str) -> int:
+    if text.isascii() and text.isprintable():
+        return len(text)
+    return wcswidth(text) if wcswidth is not None else len(text)
+
+
+def _is_int_str(text: str) -> bool:
+    try:
+        int(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _is_number_str(text: str) -> bool:
+    try:
+        value = float(text)
+    except ValueError:
+        return False
+    # 溢出成 inf 的 "1e400" 不算数字，字面量 inf/nan 算
+    return not (math.isinf(value) or math.isnan(value)) or text.lower() in ("inf", "-inf", "nan")
+
+
+def _value_type(value: Any) -> int:
+    """单个值的类型，与 tabulate._type 的判定顺序一致"""
+    if value is None:
+        return _NONE
+    if isinstance(value, str):
+        if not value:
+            return _NONE
+        if "\n" in value or "\r" in value or "\x1b" in value:
+            raise _Fallback
+        if value in ("True", "False"):
+            return _BOOL
+        if _is_int_str(value) or ("." not in value and _THOUSANDS.match(value)):
+            return _INT
+        if _is_number_str(value) or _THOUSANDS.match(value):
+            return _FLOAT
+        return _STR
+    if isinstance(value, bytes):
+        raise _Fallback
+    if hasattr(value, "isoformat"):
+        return _STR
+    if type(value) is bool:
+        return _BOOL
+    if type(value) is int or isinstance(value, np.signedinteger):
+        return _INT
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return _STR
+    return _FLOAT
+
+
+def _format_value(value: Any, column_type: int, floatfmt: str) -> str:
+    if value is None or (isinstance(value, str) and not value):
+        return ""
+    if column_type == _FLOAT:
+        try:
+            return format(float(value.replace(",", "") if isinstance(value, str) else value), floatfmt)
+        except (TypeError, ValueError):
+            pass
+    return f"{value}"
+
+
+def _float_cells(values: np.ndarray, floatfmt: str, pad: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """浮点列：整列格式化，按小数点对齐（tabulate 的 decimal 对齐）"""
+    values = values.astype(np.float64, copy=False)
+    text = list(map(("{:" + floatfmt + "}").format, values.tolist()))
+    cells = np.array(text, dtype=object)
+    widths = np.fromiter(map(len, text), dtype=np.int64, count=len(text))
+    if not pad:
+        return cells, widths
+
+    fixed = _FIXED.match(floatfmt)
+    if fixed:
+        # 固定小数位：有限值的小数位数都相同，nan/inf 没有小数点
+        digits = int(fixed.group(1))
+        after = np.where(np.isfinite(values), digits if digits else -1, -1)
+    else:
+        arr = np.array(text, dtype=str)
+        pos = np.char.rfind(arr, ".")
+        pos = np.where(pos < 0, np.char.rfind(np.char.lower(arr), "e"), pos)
+        after = np.where(pos >= 0, widths - pos - 1, -1)
+    return _decimal_pad(cells, widths, after)
+
+
+def _decimal_pad(cells: np.ndarray, widths: np.ndarray, after: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    extra = after.max() - after
+    if extra.any():
+        cells = cells + _spaces(int(extra.max()))[extra]
+        widths = widths + extra
+    return cells, widths
+
+
+def _datetime_cells(series: pd.Series) -> np.ndarray:
+    """无时区的 datetime 列，文本与 str(pd.Timestamp) 相同"""
+    values = series.to_numpy(dtype="datetime64[ns]")
+    text = np.char.replace(np.datetime_as_string(values, unit="s"), "T", " ").astype(object)
+    ticks = values.view("int64")
+    fraction = (ticks % 1_000_000_000 != 0) & ~np.isnat(values)
+    for i in np.flatnonzero(fraction):
+        text[i] = str(pd.Timestamp(values[i]))
+    text[np.isnat(values)] = "NaT"
+    return text
+
+
+def _object_cells(series: pd.Series, floatfmt: str, pad: bool) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """通用列：对去重后的取值推断类型、格式化、测量宽度，再按 codes 展开"""
+    values = series.to_numpy(dtype=object)
+    if pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        uniques = list(uniques)
+        na_values = values[codes < 0].tolist()
+    else:
+        # 1、1.0 与 True 哈希相同，混合类型的列逐个处理
+        codes, uniques, na_values = np.arange(len(values)), values.tolist(), []
+    try:
+        types = [_value_type(v) for v in uniques] + [_value_type(v) for v in na_values]
+    except _Fallback:
+        if pad:
+            raise
+        values = series.map(lambda v: v.replace("\r\n", "<br>").replace("\n", "<br>").replace("\r", "<br>")
+                            if isinstance(v, str) else v)
+        if values.map(lambda v: isinstance(v, bytes) or (isinstance(v, str) and "\x1b" in v)).any():
+            raise
+        return _object_cells(values.astype(object), floatfmt, pad)
+    column_type = max(types, default=_BOOL)
+    column_type = max(column_type, _BOOL)
+    numeric = column_type in (_INT, _FLOAT)
+
+    text = [_format_value(v, column_type, floatfmt) for v in uniques]
+    if not numeric:
+        text = [t.strip() for t in text]
+    unique_cells = np.array(text + [""], dtype=object)
+    unique_widths = np.fromiter(map(_width, text), dtype=np.int64, count=len(text))
+    cells = unique_cells[codes]
+    widths = np.append(unique_widths, 0)[codes]
+    if na_values:
+        na_text = [_format_value(v, column_type, floatfmt) for v in na_values]
+        if not numeric:
+            na_text = [t.strip() for t in na_text]
+        cells[codes < 0] = na_text
+        widths[codes < 0] = list(map(_width, na_text))
+
+    if pad and column_type == _FLOAT:
+        after = np.array([_afterpoint(t) for t in unique_cells[:-1]] + [-1], dtype=np.int64)[codes]
+        if na_values:
+            after[codes < 0] = [_afterpoint(t) for t in cells[codes < 0]]
+        cells, widths = _decimal_pad(cells, widths, after)
+    return cells, widths, numeric
+
+
+def _afterpoint(text: str) -> int:
+    """小数点（或指数符号）后的字符数，整数和非数字为 -1，同 tabulate._afterpoint"""
+    if not (_is_number_str(text) or _THOUSANDS.match(text)) or _is_int_str(text):
+        return -1
+    pos = text.rfind(".")
+    if pos < 0:
+        pos = text.lower().rfind("e")
+    return len(text) - pos - 1 if pos >= 0 else -1
+
+
+def _spaces(n: int) -> np.ndarray:
+    return np.array([" " * i for i in range(n + 1)], dtype=object)
+
+
+def _uniform_kind(df: pd.DataFrame) -> Optional[str]:
+    """tabulate 通过 df.values 取值：没有 object 列时各列先合并成同一类型
+
+    返回合并后的 numpy kind（"i"/"u"/"f"/"b"），合并为 object 时返回 None 逐列处理。
+    """
+    dtypes = list(df.dtypes)
+    if any(d == object for d in dtypes):
+        return None
+    if all(isinstance(d, np.dtype) and d.kind in "iuf" for d in dtypes):
+        return np.result_type(*dtypes).kind
+    kind = df.values.dtype.kind
+    if kind == "O":
+        return None
+    if kind in "iufb":
+        return kind
+    raise _Fallback  # 如全是 datetime 的表，合并后按 numpy 标量输出
+
+
+def _column(series: pd.Series, uniform: Optional[str], floatfmt: str,
+            pad: bool) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """返回 (单元格文本, 显示宽度, 是否按数值右对齐)"""
+    dtype = series.dtype
+    if uniform is not None:
+        # 合并后 int 保持整数，uint/bool 与 float 一样按浮点格式化
+        if uniform == "i":
+            cells = series.to_numpy(dtype=np.int64).astype(str).astype(object)
+            return cells, np.fromiter(map(len, cells), dtype=np.int64, count=len(cells)), True
+        cells, widths = _float_cells(series.to_numpy(dtype=np.float64, na_value=np.nan), floatfmt, pad)
+        return cells, widths, True
+    if isinstance(dtype, np.dtype):
+        if dtype.kind == "f":
+            cells, widths = _float_cells(series.to_numpy(), floatfmt, pad)
+            return cells, widths, True
+        if dtype.kind in "iu":
+            cells = series.to_numpy().astype(str).astype(object)
+            return cells, np.fromiter(map(len, cells), dtype=np.int64, count=len(cells)), True
+        if dtype.kind == "b":
+            cells = np.where(series.to_numpy(), "True", "False").astype(object)
+            return cells, np.where(series.to_numpy(), 4, 5), False
+        if dtype.kind == "M":
+            cells = _datetime_cells(series)
+            return cells, np.fromiter(map(len, cells), dtype=np.int64, count=len(cells)), False
+    return _object_cells(series, floatfmt, pad)
+
+
+def _render(df: pd.DataFrame, floatfmt: str, pad: bool) -> str:
+    uniform = _uniform_kind(df)
+    headers = [f"{name}" for name in df.columns]
+    for header in headers:
+        if "\n" in header or "\r" in header or "\x1b" in header:
+            if pad:
+                raise _Fallback
+
+    n_rows, n_cols = df.shape
+    grid = np.empty((n_rows, 2 * n_cols + 1), dtype=object)
+    grid[:, 0] = "| "
+    header_cells, rule = [], []
+    for i, (_, series) in enumerate(df.items()):
+        cells, widths, numeric = _column(series, uniform, floatfmt, pad)
+        header = headers[i]
+        if pad:
+            header_width = _width(header)
+            width = max(int(widths.max()), header_width + MIN_PADDING)
+            pads = _spaces(width - int(widths.min()))[width - widths]
+            cells = pads + cells if numeric else cells + pads
+            header_pad = " " * (width - header_width)
+            header = header_pad + header if numeric else header + header_pad
+            rule.append("-" * (width + 1) + ":" if numeric else ":" + "-" * (width + 1))
+        else:
+            header = header.replace("\n", "<br>")
+            rule.append("---:" if numeric else ":---")
+        header_cells.append(header)
+        grid[:, 2 * i + 1] = cells
+        grid[:, 2 * i + 2] = " | "
+    grid[:, -1] = " |\n"
+    grid[-1, -1] = " |"
+    head = "| " + " | ".join(header_cells) + " |\n|" + "|".join(rule) + "|\n"
+    return head + "".join(grid.ravel().tolist())
+
+
+def dataframe_to_markdown(df: pd.DataFrame, floatfmt: str = "g", pad: bool = True) -> str:
+    """把 DataFrame 渲染为 Markdown pipe 表格（不含索引）
+
+    Args:
+        df: 待渲染的 DataFrame
+        floatfmt: 浮点格式，如 ".2f" 固定两位小数；默认 "g" 与 tabulate 相同
+        pad: 是否用空格把各列补齐到同一宽度
+    """
+    if df.shape[0] == 0 or df.shape[1] == 0:
+        return df.to_markdown(index=False, floatfmt=floatfmt)
+    try:
+        return _render(df, floatfmt, pad)
+    except _Fallback:
+        return df.to_markdown(index=False, floatfmt=floatfmt)
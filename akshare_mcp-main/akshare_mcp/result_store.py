@@ -0,0 +1,140 @@
+"""
+大结果的本地存储
+
+渲染后超过阈值的结果不再内联在工具响应里，而是写入本地存储并作为 MCP 资源暴露：
+
+    akshare://results/{result_id}                       全部数据
+    akshare://results/{result_id}/{offset}/{limit}      从 offset 开始的 limit 行
+
+工具只返回列信息、行数、前几行和资源 URI。存储的结果超过 TTL 后删除：启动时清理一次，
+之后每次写入或读取时检查，间隔不少于 TTL 的十分之一。
+"""
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+__all__ = ["ResultStore", "RESULT_URI"]
+
+RESULT_URI = "akshare://results/{result_id}"
+
+_RESULT_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ResultStore:
+    """按 TTL 过期的 DataFrame 存储，文件名即结果 ID"""
+
+    # 估算渲染体积时采样的行数
+    SAMPLE_ROWS = 200
+
+    def __init__(self, root: str, ttl: float = 3600, threshold: int = 64 * 1024, head: int = 10,
+                 loaded: int = 4):
+        """
+        Args:
+            root: 存储目录
+            ttl: 结果保留秒数
+            threshold: 渲染结果超过该字节数时转存
+            head: 工具响应中内联的行数
+            loaded: 内存中保留的已读取结果数，连续分段读取时不必反复读盘
+        """
+        self.root = root
+        self.ttl = ttl
+        self.threshold = threshold
+        self.head = head
+        self._loaded: "OrderedDict[str, Tuple[pd.DataFrame, str]]" = OrderedDict()
+        self._max_loaded = loaded
+        self._lock = threading.Lock()
+        self._gc_interval = ttl / 10
+        self._last_gc = 0.0
+
+    def exceeds(self, df: pd.DataFrame, render: Callable[[pd.DataFrame], str]) -> bool:
+        """按前 SAMPLE_ROWS 行的渲染体积估算整表是否超过阈值，不渲染整表"""
+        sample = df.head(self.SAMPLE_ROWS)
+        size = len(render(sample).encode("utf-8"))
+        return size * len(df) / len(sample) > self.threshold
+
+    def _path(self, result_id: str) -> str:
+        if not _RESULT_ID.match(result_id):
+            raise KeyError(f"无效的结果ID: {result_id}")
+        return os.path.join(self.root, result_id + ".pkl")
+
+    def put(self, df: pd.DataFrame, format: str) -> str:
+        """保存结果及其输出格式，返回结果 ID；顺带清理过期结果"""
+        self.maybe_gc()
+        result_id = uuid.uuid4().hex
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((df, format), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(result_id))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        with self._lock:
+            self._remember(result_id, (df, format))
+        return result_id
+
+    def _remember(self, result_id: str, stored: Tuple[pd.DataFrame, str]) -> None:
+        self._loaded[result_id] = stored
+        self._loaded.move_to_end(result_id)
+        while len(self._loaded) > self._max_loaded:
+            self._loaded.popitem(last=False)
+
+    def read(self, result_id: str, offset: int = 0, limit: Optional[int] = None) -> Tuple[pd.DataFrame, str]:
+        """读取结果的 [offset, offset + limit) 行及其输出格式，结果不存在或已过期时抛出 KeyError"""
+        path = self._path(result_id)
+        self.maybe_gc()
+        try:
+            expired = os.path.getmtime(path) + self.ttl <= time.time()
+        except OSError:
+            expired = True
+        if expired:
+            with self._lock:
+                self._loaded.pop(result_id, None)
+            raise KeyError(f"结果不存在或已过期: {result_id}")
+        with self._lock:
+            stored = self._loaded.get(result_id)
+        if stored is None:
+            with open(path, "rb") as f:
+                stored = pickle.load(f)
+            with self._lock:
+                self._remember(result_id, stored)
+        df, format = stored
+        return df.iloc[offset:None if limit is None else offset + limit], format
+
+    def maybe_gc(self) -> int:
+        """距上次清理超过 TTL 的十分之一时清理过期结果，返回删除的数量"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_gc < self._gc_interval:
+                return 0
+            self._last_gc = now
+        return self.gc()
+
+    def gc(self) -> int:
+        """删除过期结果，返回删除的数量"""
+        with self._lock:
+            self._last_gc = time.monotonic()
+        if not os.path.isdir(self.root):
+            return 0
+        deadline = time.time() - self.ttl
+        removed = 0
+        for entry in os.scandir(self.root):
+            try:
+                if entry.name.endswith((".pkl", ".tmp")) and entry.stat().st_mtime <= deadline:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                continue  # 其它进程已删除
+        with self._lock:
+            for result_id in [k for k in self._loaded if not os.path.exists(os.path.join(self.root, k + ".pkl"))]:
+                del self._loaded[result_id]
+        return removed
@@ -1,116 +1,285 @@
+import asyncio
+import os
+import importlib.util
 import inspect
 import pathlib
 import sys
-from functools import wraps
-from typing import Literal
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Annotated, List, Literal, Optional
 
-import akshare as ak
 import fastmcp
 import pandas as pd
+from pydantic import Field
+
+from akshare_mcp import config as default_config
+from akshare_mcp.binary import ARROW_MIME, PARQUET_MIME, binary_resource, dataframe_to_arrow, dataframe_to_parquet
+from akshare_mcp.cache import FunctionCache, cache_dir, load_policies
+from akshare_mcp.config import black_list, white_list
+from akshare_mcp.markdown import dataframe_to_markdown, floatfmt_for_precision
+from akshare_mcp.manifest import load_manifest, make_tool
+from akshare_mcp.result_store import RESULT_URI, ResultStore
+from akshare_mcp.shared_cache import SharedCache
 
 mcp = fastmcp.FastMCP("AKShare MCP Server")
 
-# 请复制函数名到名单中。https://akshare.akfamily.xyz/data/index.html
-
-# 白名单
-white_list = [
-    # "stock_info_global_cls",  # 资讯数据-财联社
-    "stock_info_cjzc_em",  # 资讯数据-财经早餐-东方财富
-    "stock_info_global_em" , # 资讯数据-东方财富
-    "stock_info_global_sina",  # 资讯数据-新浪财经
-    "stock_info_global_futu",  # 资讯数据-富途牛牛
-    "stock_info_global_ths",  # 资讯数据-同花顺
-    "stock_info_broker_sina",  # 新浪财经-证券-证券原创
-    "stock_zh_index_spot_em",
-    "index_global_spot_em",
-    "stock_zh_a_spot_em",
-    "stock_yjbb_em",
-    "stock_zt_pool_em",
-]
+# arrow/parquet 为二进制格式，以 base64 内嵌资源返回，需要安装 pyarrow
+OutputFormat = Literal["markdown", "csv", "json", "arrow", "parquet"]
 
-# 黑名单
-black_list = [
-    "car_market_total_cpca",
+# 每个工具额外提供的调用参数，在渲染之前作用于 DataFrame
+CALL_PARAMETERS = [
+    inspect.Parameter("limit", inspect.Parameter.KEYWORD_ONLY, default=None,
+                      annotation=Annotated[Optional[int], Field(description="最多返回的行数，默认返回全部", ge=0)]),
+    inspect.Parameter("offset", inspect.Parameter.KEYWORD_ONLY, default=0,
+                      annotation=Annotated[int, Field(description="跳过前面的行数", ge=0)]),
+    inspect.Parameter("columns", inspect.Parameter.KEYWORD_ONLY, default=None,
+                      annotation=Annotated[Optional[List[str]], Field(description="只返回这些列，默认返回全部列")]),
+    inspect.Parameter("format", inspect.Parameter.KEYWORD_ONLY, default=None,
+                      annotation=Annotated[Optional[OutputFormat],
+                                           Field(description="输出格式，默认使用服务端的--format；arrow/parquet为二进制格式，可用akshare_mcp.client解码")]),
 ]
 
-def output_format(func, format: Literal["markdown", "csv", "json"]):
+
+def select_rows(df: pd.DataFrame, limit: int = None, offset: int = 0, columns: List[str] = None) -> pd.DataFrame:
+    """按列名、偏移和行数截取DataFrame"""
+    if columns:
+        names = {str(c): c for c in df.columns}
+        missing = [c for c in columns if c not in names]
+        if missing:
+            raise ValueError(f"列不存在: {missing}，可选列: {list(names)}")
+        df = df[[names[c] for c in columns]]
+    if offset or limit is not None:
+        df = df.iloc[offset:None if limit is None else offset + limit]
+    return df
+
+
+def add_call_parameters(func, decorated):
+    """把CALL_PARAMETERS追加到decorated的签名中，与akshare原有参数同名的不追加"""
+    signature = inspect.signature(func)
+    extra = [p for p in CALL_PARAMETERS if p.name not in signature.parameters]
+    params = list(signature.parameters.values())
+    # 关键字参数须在**kwargs之前
+    split = len(params) - (1 if params and params[-1].kind == inspect.Parameter.VAR_KEYWORD else 0)
+    decorated.__signature__ = signature.replace(parameters=params[:split] + extra + params[split:])
+    decorated.__annotations__ = {**getattr(func, "__annotations__", {}),
+                                 **{p.name: p.annotation for p in extra}}
+    return extra
+
+
+def render_text(df: pd.DataFrame, format: OutputFormat, precision: int = None, pad: bool = True) -> str:
+    """渲染为markdown/csv/json文本"""
+    if format == 'csv':
+        return df.to_csv(index=False)
+    if format == 'json':
+        return df.to_json(force_ascii=False, indent=2, orient='records')
+    return dataframe_to_markdown(df, floatfmt=floatfmt_for_precision(precision), pad=pad)
+
+
+def spill_summary(df: pd.DataFrame, format: OutputFormat, store: ResultStore, precision: int = None,
+                  pad: bool = True) -> dict:
+    """把整表写入结果存储，返回列信息、行数、前几行和资源URI"""
+    result_id = store.put(df, format)
+    uri = RESULT_URI.format(result_id=result_id)
+    return {
+        "content": render_text(df.head(store.head), format, precision=precision, pad=pad),
+        "rows": len(df),
+        "columns": [{"name": str(name), "dtype": str(dtype)} for name, dtype in df.dtypes.items()],
+        "result_uri": uri,
+        "range_uri": uri + "/{offset}/{limit}",
+        "expires_in": store.ttl,
+        "note": f"结果共{len(df)}行，超出内联大小，以上仅为前{min(store.head, len(df))}行；"
+                f"读取资源result_uri获取全部数据，或读取range_uri分段获取",
+    }
+
+
+def render(result, format: OutputFormat, precision: int = None, pad: bool = True,
+           limit: int = None, offset: int = 0, columns: List[str] = None, name: str = "result",
+           arrow_compression: str = None, spill: ResultStore = None):
+    # 检查返回结果类型
+    if result is None:
+        return {"content": "No data available"}
+    
+    # 如果不是 DataFrame，尝试转换或直接返回
+    if not isinstance(result, pd.DataFrame):
+        if isinstance(result, (list, dict)):
+            # 将 list 或 dict 转换为 DataFrame
+            if isinstance(result, list) and len(result) > 0:
+                if isinstance(result[0], dict):
+                    df = pd.DataFrame(result)
+                else:
+                    df = pd.DataFrame({"value": result})
+            elif isinstance(result, dict):
+                df = pd.DataFrame([result])
+            else:
+                return {"content": str(result)}
+        else:
+            return {"content": str(result)}
+    else:
+        df = result
+
+    # 先截取再渲染，不渲染、不传输用不到的行和列
+    df = select_rows(df, limit=limit, offset=offset, columns=columns)
+    
+    # 检查 DataFrame 是否为空
+    if df.empty:
+        return {"content": "No data available"}
+    
+    # 格式化输出
+    if format == 'arrow':
+        return binary_resource(dataframe_to_arrow(df, compression=arrow_compression), ARROW_MIME,
+                               f"akshare://{name}.arrow")
+    elif format == 'parquet':
+        return binary_resource(dataframe_to_parquet(df), PARQUET_MIME, f"akshare://{name}.parquet")
+
+    # 文本结果过大时转存，按抽样估算大小，不渲染整表
+    if spill is not None and spill.threshold and \
+            spill.exceeds(df, lambda sample: render_text(sample, format, precision=precision, pad=pad)):
+        return spill_summary(df, format, spill, precision=precision, pad=pad)
+
+    content = render_text(df, format, precision=precision, pad=pad)
+
+    # 确保返回字典格式
+    return {"content": content}
+
+
+def output_format(func, format: OutputFormat, precision: int = None, pad: bool = True,
+                  cache: FunctionCache = None, arrow_compression: str = None, spill: ResultStore = None):
     @wraps(func)
     def decorated(*args, **kwargs):
+        options = {p.name: kwargs.pop(p.name, p.default) for p in extra}
+        output = options.pop("format", None) or format
+        # 同一份数据按格式和截取参数分别缓存渲染结果
+        render_key = (output, options.get("limit"), options.get("offset", 0), tuple(options.get("columns") or ()))
         try:
-            result = func(*args, **kwargs)
-            
-            # 检查返回结果类型
-            if result is None:
-                return {"content": "No data available"}
-            
-            # 如果不是 DataFrame，尝试转换或直接返回
-            if not isinstance(result, pd.DataFrame):
-                if isinstance(result, (list, dict)):
-                    # 将 list 或 dict 转换为 DataFrame
-                    if isinstance(result, list) and len(result) > 0:
-                        if isinstance(result[0], dict):
-                            df = pd.DataFrame(result)
-                        else:
-                            df = pd.DataFrame({"value": result})
-                    elif isinstance(result, dict):
-                        df = pd.DataFrame([result])
-                    else:
-                        return {"content": str(result)}
-                else:
-                    return {"content": str(result)}
+            entry = None
+            if cache is not None:
+                key = cache.make_key(args, kwargs)
+                entry = cache.get(key)
+                content = cache.rendered(entry, render_key) if entry is not None else None
+                if content is not None:
+                    return content
+            if entry is not None:
+                result = entry.value
+            elif cache is not None:
+                entry, result = cache.fetch(key, partial(func, *args, **kwargs))
             else:
-                df = result
-            
-            # 检查 DataFrame 是否为空
-            if df.empty:
-                return {"content": "No data available"}
-            
-            # 格式化输出
-            if format == 'markdown':
-                content = df.to_markdown(index=False)
-            elif format == 'csv':
-                content = df.to_csv(index=False)
-            elif format == 'json':
-                content = df.to_json(force_ascii=False, indent=2, orient='records')
-            else:
-                content = df.to_markdown(index=False)
-            
-            # 确保返回字典格式
-            return {"content": content}
+                result = func(*args, **kwargs)
+
+            content = render(result, output, precision=precision, pad=pad, name=func.__name__,
+                             arrow_compression=arrow_compression, spill=spill, **options)
+            # 转存的结果会过期，摘要不缓存
+            if entry is not None and not (isinstance(content, dict) and "result_uri" in content):
+                cache.keep_rendered(entry, render_key, content)
+            return content
             
         except Exception as e:
             # 错误处理
             return {"content": f"Error processing data: {str(e)}"}
 
+    extra = add_call_parameters(func, decorated)
     return decorated
 
 
-def register(white_list, black_list, format: Literal["markdown", "csv", "json"]):
-    for name, func in inspect.getmembers(ak, inspect.isfunction):
-        if white_list and name not in white_list:
-            continue
+def run_in_pool(func, executor: ThreadPoolExecutor, limit: int = None):
+    """把同步工具包装成异步工具，在线程池中执行akshare调用和渲染
+
+    limit限制该函数同时执行的调用数，其余调用在事件循环中等待，不占用线程池
+    """
+    semaphore = asyncio.Semaphore(limit) if limit else None
+
+    @wraps(func)
+    async def tool(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = partial(func, *args, **kwargs)
+        if semaphore is None:
+            return await loop.run_in_executor(executor, call)
+        async with semaphore:
+            return await loop.run_in_executor(executor, call)
+
+    return tool
+
+
+def load_config(path: str = None):
+    """读取配置文件，未指定时使用包内的config.py"""
+    if not path:
+        return default_config
+    spec = importlib.util.spec_from_file_location("akshare_mcp_user_config", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def register_results(store: ResultStore, executor: ThreadPoolExecutor, precision: int = None, pad: bool = True):
+    """注册转存结果的资源模板，按转存时的格式渲染"""
+
+    def read(result_id: str, offset: int = 0, limit: int = None) -> str:
+        df, format = store.read(result_id, offset=offset, limit=limit)
+        return render_text(df, format, precision=precision, pad=pad)
+
+    @mcp.resource(RESULT_URI, name="akshare_result", mime_type="text/plain",
+                  description="转存的大结果，格式与调用工具时相同")
+    async def read_result(result_id: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(executor, read, result_id)
+
+    @mcp.resource(RESULT_URI + "/{offset}/{limit}", name="akshare_result_range", mime_type="text/plain",
+                  description="转存结果中从offset开始的limit行")
+    async def read_result_range(result_id: str, offset: int, limit: int) -> str:
+        return await asyncio.get_running_loop().run_in_executor(executor, read, result_id, offset, limit)
+
+
+def register(white_list, black_list, format: OutputFormat, precision: int = None, pad: bool = True,
+             cache: dict = None, workers: int = 8, concurrency: dict = None, arrow_compression: str = None,
+             spill: dict = None, shared_cache: dict = None):
+    # 从缓存的清单生成工具，不在启动时导入akshare
+    functions = load_manifest()["functions"]
+    policies = load_policies(cache or {})
+    concurrency = concurrency or {}
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="akshare")
+    shared = None
+    if shared_cache and shared_cache.get("backend"):
+        if shared_cache["backend"] != "sqlite":
+            raise ValueError(f"不支持的共享缓存: {shared_cache['backend']}，可选: sqlite")
+        shared = SharedCache(shared_cache.get("path") or os.path.join(cache_dir(), "shared.sqlite3"),
+                             lease=shared_cache.get("lease", 60))
+    store = None
+    if spill and spill.get("threshold"):
+        store = ResultStore(os.path.join(cache_dir(), "spill"), **spill)
+        # 清理上次运行留下的过期结果
+        store.gc()
+        register_results(store, executor, precision=precision, pad=pad)
+    names = [name for name in white_list if name in functions] if white_list else sorted(functions)
+    for name in names:
         if black_list and name in black_list:
             continue
 
         try:
-            # 添加函数签名检查，避免注册有问题的函数
-            sig = inspect.signature(func)
-            # 跳过没有参数或参数过多的函数
-                
-            wrapped_func = output_format(func, format=format)
-            mcp.tool()(wrapped_func)
+            func = make_tool(functions[name])
+            policy = policies.get(name, policies["*"])
+            func_cache = FunctionCache(name, inspect.signature(func), policy, shared=shared) \
+                if policy.enabled else None
+            wrapped_func = output_format(func, format=format, precision=precision, pad=pad, cache=func_cache,
+                                         arrow_compression=arrow_compression, spill=store)
+            limit = concurrency.get(name, concurrency.get("*"))
+            mcp.tool(output_schema=None)(run_in_pool(wrapped_func, executor, limit))
             
         except Exception as e:
             # 可以使用日志记录而不是打印
             pass
 
 
-def serve(format: Literal["markdown", "csv", "json"], transport: Literal["stdio", "sse", "streamable-http"], host: str, port: int, config: str = None):
-    register(white_list, black_list, format=format)
+def serve(format: OutputFormat, transport: Literal["stdio", "sse", "streamable-http"], host: str, port: int, config: str = None,
+          precision: int = None, pad: bool = True, arrow_compression: str = None):
+    settings = load_config(config)
+    register(getattr(settings, "white_list", []), getattr(settings, "black_list", []), format=format,
+             precision=precision, pad=pad, cache=getattr(settings, "cache", {}),
+             workers=getattr(settings, "workers", 8), concurrency=getattr(settings, "concurrency", {}),
+             arrow_compression=arrow_compression, spill=getattr(settings, "spill", None),
+             shared_cache=getattr(settings, "shared_cache", None))
 
-    fastmcp.settings.host = host
-    fastmcp.settings.port = port
-    mcp.run(transport=transport)
+    if transport == "stdio":
+        mcp.run(transport=transport)
+    else:
+        mcp.run(transport=transport, host=host, port=port)
 
 
 def main():
@@ -118,10 +287,11 @@ def main():
 
     parser = argparse.ArgumentParser(
         description="AKShare MCP Server",
+        epilog=f"默认配置文件: {default_config.__file__}",
     )
 
     parser.add_argument("--format", type=str, help="输出格式",
-                        default='markdown', choices=['markdown', 'csv', 'json'])
+                        default='markdown', choices=['markdown', 'csv', 'json', 'arrow', 'parquet'])
     parser.add_argument("--transport", type=str, help="传输类型",
                         default='stdio', choices=['stdio', 'sse', 'streamable-http'])
     parser.add_argument("--host", type=str, help="MCP服务端绑定地址",
@@ -130,8 +300,14 @@ def main():
                         default='8000')
     parser.add_argument("--config", type=str, help="配置文件路径",
                         nargs="?")
+    parser.add_argument("--precision", type=int, help="markdown浮点数保留的小数位数，默认按g格式输出",
+                        default=None)
+    parser.add_argument("--no-pad", action="store_true", help="markdown表格不补齐列宽，减小输出体积")
+    parser.add_argument("--arrow-compression", type=str, help="arrow格式的压缩算法，不压缩时客户端可零拷贝读取",
+                        default=None, choices=['lz4', 'zstd'])
     args = parser.parse_args()
-    serve(args.format, args.transport, args.host, args.port, args.config)
+    serve(args.format, args.transport, args.host, args.port, args.config,
+          precision=args.precision, pad=not args.no_pad, arrow_compression=args.arrow_compression)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+"""
+多进程共享缓存
+
+同一主机上运行多个 akshare_mcp 进程时，各进程的内存缓存互不可见，上游请求量随进程数
+成倍增加。SharedCache 把原始数据保存在 SQLite（WAL 模式，读写互不阻塞）中供所有进程
+读取，并用租约记录正在请求上游的键：拿到租约的进程请求上游并写入结果，其余进程等待
+结果出现，因此每个键在 TTL 内只请求一次上游。持有租约的进程退出后，租约到期即由
+其它进程接手。
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional, Tuple
+
+__all__ = ["SharedCache"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (name, key)
+);
+CREATE TABLE IF NOT EXISTS inflight (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    token TEXT NOT NULL,
+    lease_until REAL NOT NULL,
+    PRIMARY KEY (name, key)
+);
+"""
+
+
+class SharedCache:
+    """基于 SQLite 的跨进程缓存与上游请求协调"""
+
+    def __init__(self, path: str, lease: float = 60, poll: float = 0.05):
+        """
+        Args:
+            path: 数据库文件路径，所有进程须使用同一路径
+            lease: 租约秒数，持有者在此时间内未写入结果时由其它进程接手
+            poll: 等待其它进程结果时的初始轮询间隔，逐步加倍至 1 秒
+        """
+        self.path = path
+        self.lease = lease
+        self.poll = poll
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 连接不能跨线程使用，每个线程一个连接
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, name: str, key: str) -> Optional[Tuple[float, Any]]:
+        """返回未过期的 (expires_at, value)"""
+        row = self._conn().execute(
+            "SELECT expires_at, value FROM entries WHERE name = ? AND key = ? AND expires_at > ?",
+            (name, key, time.time())).fetchone()
+        if row is None:
+            return None
+        try:
+            return row[0], pickle.loads(row[1])
+        except (pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError):
+            return None
+
+    def put(self, name: str, key: str, expires_at: float, value: Any, max_entries: int) -> None:
+        """写入数据，并删除该函数已过期及超出 max_entries 的条目；无法序列化时不写入"""
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (name, key, expires_at, blob))
+            conn.execute("DELETE FROM entries WHERE name = ? AND expires_at <= ?", (name, time.time()))
+            conn.execute(
+                "DELETE FROM entries WHERE name = ? AND key NOT IN "
+                "(SELECT key FROM entries WHERE name = ? ORDER BY expires_at DESC LIMIT ?)",
+                (name, name, max_entries))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def acquire(self, name: str, key: str) -> Optional[str]:
+        """尝试取得请求上游的租约，成功时返回令牌，已有其它请求在进行时返回 None"""
+        token = uuid.uuid4().hex
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM inflight WHERE name = ? AND key = ? AND lease_until <= ?", (name, key, now))
+            acquired = conn.execute("INSERT OR IGNORE INTO inflight VALUES (?, ?, ?, ?)",
+                                    (name, key, token, now + self.lease)).rowcount == 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return token if acquired else None
+
+    def release(self, name: str, key: str, token: str) -> None:
+        """释放租约；租约已被其它进程接手时不做任何事"""
+        self._conn().execute("DELETE FROM inflight WHERE name = ? AND key = ? AND token = ?", (name, key, token))
+
+    def wait(self, name: str, key: str) -> Optional[Tuple[float, Any]]:
+        """等待其它进程的请求结束，返回其写入的结果；请求失败或结果为空时返回 None"""
+        delay = self.poll
+        conn = self._conn()
+        while True:
+            found = self.get(name, key)
+            if found is not None:
+                return found
+            if conn.execute("SELECT 1 FROM inflight WHERE name = ? AND key = ? AND lease_until > ?",
+                            (name, key, time.time())).fetchone() is None:
+                return self.get(name, key)
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
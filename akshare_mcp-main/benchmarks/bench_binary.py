@@ -0,0 +1,60 @@
+"""
+输出格式基准：markdown/csv/json vs arrow/parquet
+
+对每种格式统计服务端编码耗时、传输体积（二进制格式按 base64 计）和
+客户端还原为 DataFrame 的耗时。数据同 bench_markdown.py。
+
+运行: python benchmarks/bench_binary.py [--data benchmarks/data] [--repeat 3]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from akshare_mcp.client import decode_dataframe  # noqa: E402
+from akshare_mcp.server import render  # noqa: E402
+from bench_markdown import load_tables, timeit  # noqa: E402
+
+
+def payload(content) -> bytes:
+    if isinstance(content, dict):
+        content = content["content"]
+    if isinstance(content, str):
+        return content.encode("utf-8")
+    return content.resource.blob.encode("ascii")
+
+
+# (名称, 格式, render 参数, 客户端还原为 DataFrame 的方法)
+FORMATS = [
+    ("markdown", "markdown", {}, lambda c: pd.read_csv(io.StringIO(c["content"]), sep="|", skiprows=[1], skipinitialspace=True)),
+    ("csv", "csv", {}, lambda c: pd.read_csv(io.StringIO(c["content"]))),
+    ("json", "json", {}, lambda c: pd.DataFrame(json.loads(c))),
+    ("arrow", "arrow", {}, decode_dataframe),
+    ("arrow+zstd", "arrow", {"arrow_compression": "zstd"}, decode_dataframe),
+    ("parquet", "parquet", {}, decode_dataframe),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="输出格式基准")
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, df in load_tables(args.data).items():
+        print(f"\n{name} {df.shape[0]}×{df.shape[1]}")
+        print(f"{'格式':<12}{'体积':>12}{'编码':>10}{'解码':>10}")
+        for label, fmt, options, decode in FORMATS:
+            content = render(df, fmt, **options)
+            t_encode = timeit(lambda: render(df, fmt, **options), args.repeat)
+            t_decode = timeit(lambda: decode(content), args.repeat)
+            print(f"{label:<12}{len(payload(content)) / 1024:>10.0f}KB{t_encode * 1000:>8.1f}ms{t_decode * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
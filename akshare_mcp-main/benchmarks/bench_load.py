@@ -0,0 +1,303 @@
+"""
+HTTP 传输压测：akshare_mcp / mcp-akshare-hust
+
+在本机子进程中启动服务（sse 或 streamable-http），akshare 的所有函数替换为本地替身：
+按 --latency 等待后返回与 stock_zh_a_spot_em、stock_info_global_em 结构相同的合成表，
+不访问网络。然后按 --concurrency 逐级增加并发会话数，每个会话是独立的 MCP 客户端，
+按权重随机调用工具，每级运行 --duration 秒，统计吞吐、p50/p99 延迟、错误率和服务端
+峰值 RSS。
+
+调用组合默认见 MIXES，也可以用 --mix 指定 JSON 文件：
+    [{"tool": "stock_zh_a_spot_em", "arguments": {"limit": 50}, "weight": 3}, ...]
+
+运行:
+    python benchmarks/bench_load.py --server akshare_mcp --transport streamable-http --concurrency 1,8,32,128
+    python benchmarks/bench_load.py --server mcp-akshare --transport sse --latency 0.2
+    python benchmarks/bench_load.py --server akshare_mcp -- --config my_config.py   # -- 之后的参数传给服务端
+    python benchmarks/bench_load.py --url http://127.0.0.1:8000/mcp --pid 1234      # 压测已运行的服务
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH, "..")
+MCP_AKSHARE_SRC = os.path.join(ROOT, "..", "mcp-akshare-main", "src")
+
+# 各服务端的默认调用组合
+MIXES: Dict[str, List[Dict[str, Any]]] = {
+    "akshare_mcp": [
+        {"tool": "stock_zh_a_spot_em", "arguments": {"limit": 50}, "weight": 3},
+        {"tool": "stock_zh_a_spot_em", "arguments": {"limit": 500, "format": "json"}, "weight": 1},
+        {"tool": "stock_info_global_em", "arguments": {"limit": 20}, "weight": 2},
+        {"tool": "stock_zt_pool_em", "arguments": {"date": "20240102"}, "weight": 1},
+    ],
+    "mcp-akshare": [
+        {"tool": "stock_zh_a_st_em", "arguments": {}, "weight": 3},
+        {"tool": "stock_info_global_sina", "arguments": {}, "weight": 2},
+        {"tool": "stock_szse_summary", "arguments": {"date": "20240102"}, "weight": 1},
+        {"tool": "get_current_time", "arguments": {}, "weight": 1},
+    ],
+}
+
+# 服务端把上游异常包装成正常结果返回，按文本识别
+ERROR_MARKERS = ("Error processing data", '"success":false', '"success": false')
+
+
+def serve_standin(server: str, latency: float, rows: int, argv: List[str]) -> None:
+    """（子进程）用本地替身替换 akshare 后启动服务端"""
+    import inspect
+
+    import akshare
+
+    from bench_markdown import synthetic_news, synthetic_spot
+
+    spot, news = synthetic_spot(rows), synthetic_news()
+
+    def standin(name: str, func):
+        table = news if "news" in name or "info" in name else spot
+
+        # 保留原函数的签名和所在模块，akshare_mcp 据此生成工具清单
+        @functools.wraps(func)
+        def fetch(*args, **kwargs):
+            time.sleep(latency)
+            return table.copy()
+
+        return fetch
+
+    for name, func in inspect.getmembers(akshare, inspect.isfunction):
+        fake = standin(name, func)
+        setattr(akshare, name, fake)
+        # akshare_mcp 从定义函数的子模块取函数
+        module = sys.modules.get(func.__module__)
+        if module is not None and getattr(module, name, None) is func:
+            setattr(module, name, fake)
+
+    if server == "akshare_mcp":
+        from akshare_mcp.server import main
+    else:
+        sys.path.insert(0, MCP_AKSHARE_SRC)
+        from mcp_akshare.main import main
+    sys.argv = [server] + argv
+    main()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss(pid: int) -> Optional[int]:
+    """进程常驻内存字节数，读取 /proc，不可用时调用 ps"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True, check=True)
+        return int(out.stdout.strip()) * 1024
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return None
+
+
+def is_error(result) -> bool:
+    if result.is_error:
+        return True
+    text = "".join(getattr(c, "text", "") for c in result.content)
+    return any(marker in text[:200] for marker in ERROR_MARKERS)
+
+
+async def wait_ready(url: str, process: Optional[subprocess.Popen], timeout: float) -> None:
+    from fastmcp import Client
+
+    deadline = time.monotonic() + timeout
+    while True:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"服务端已退出，返回码 {process.returncode}")
+        try:
+            async with Client(url, timeout=5) as client:
+                await client.ping()
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.5)
+
+
+async def run_stage(url: str, mix: List[Dict[str, Any]], sessions: int, duration: float,
+                    pid: Optional[int], timeout: float) -> Dict[str, Any]:
+    """sessions 个会话同时连接后开始计时，运行 duration 秒"""
+    from fastmcp import Client
+
+    weights = [call.get("weight", 1) for call in mix]
+    latencies: List[float] = []
+    errors = 0
+    connect_errors = 0
+    pending = sessions
+    start = asyncio.Event()
+    deadline = 0.0
+
+    def connected():
+        nonlocal pending, deadline
+        pending -= 1
+        if pending == 0:
+            deadline = time.perf_counter() + duration
+            start.set()
+
+    async def session(i: int):
+        nonlocal errors, connect_errors
+        rng = random.Random(i)
+        try:
+            client = Client(url, timeout=timeout)
+            await client.__aenter__()
+        except Exception:
+            connect_errors += 1
+            connected()
+            return
+        try:
+            connected()
+            await start.wait()
+            while time.perf_counter() < deadline:
+                call = rng.choices(mix, weights)[0]
+                began = time.perf_counter()
+                try:
+                    result = await client.call_tool(call["tool"], call.get("arguments", {}), raise_on_error=False)
+                    failed = is_error(result)
+                except Exception:
+                    failed = True
+                latencies.append(time.perf_counter() - began)
+                errors += failed
+        finally:
+            try:
+                await client.__aexit__(None, None, None)
+            except Exception:
+                pass
+
+    peak = 0
+
+    async def sample_rss():
+        nonlocal peak
+        while True:
+            peak = max(peak, rss(pid) or 0)
+            await asyncio.sleep(0.2)
+
+    sampler = asyncio.create_task(sample_rss()) if pid else None
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    if sampler is not None:
+        sampler.cancel()
+
+    calls = len(latencies)
+    ms = np.array(latencies) * 1000 if calls else np.zeros(1)
+    return {
+        "sessions": sessions,
+        "calls": calls,
+        "throughput": calls / duration,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "error_rate": errors / calls if calls else 1.0,
+        "connect_errors": connect_errors,
+        "rss_mb": peak / 2 ** 20 if peak else None,
+    }
+
+
+def report(row: Dict[str, Any]) -> None:
+    rss_mb = f"{row['rss_mb']:.0f}" if row["rss_mb"] else "-"
+    print(f"{row['sessions']:>8}{row['calls']:>9}{row['throughput']:>10.1f}{row['p50_ms']:>10.1f}"
+          f"{row['p99_ms']:>10.1f}{row['error_rate'] * 100:>8.2f}%{row['connect_errors']:>6}{rss_mb:>9}")
+
+
+async def run(args, server_args: List[str]) -> List[Dict[str, Any]]:
+    process = None
+    cache_dir = None
+    url, pid = args.url, args.pid
+    if url is None:
+        port = free_port()
+        path = "/sse" if args.transport == "sse" else "/mcp"
+        url = f"http://127.0.0.1:{port}{path}"
+        command = [sys.executable, os.path.abspath(__file__), "_serve", args.server, str(args.latency), str(args.rows),
+                   "--transport", args.transport, "--host", "127.0.0.1", "--port", str(port)] + server_args
+        # 替身数据只能写入临时缓存目录，按日期的缓存对过去日期永久有效，不能污染真实缓存
+        cache_dir = tempfile.TemporaryDirectory(prefix="bench_load_")
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join([BENCH, ROOT, os.environ.get("PYTHONPATH", "")]),
+               "MCP_AKSHARE_DATA_DIR": cache_dir.name, "AKSHARE_MCP_CACHE_DIR": cache_dir.name}
+        process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL,
+                                   stderr=None if args.verbose else subprocess.DEVNULL)
+        pid = process.pid
+    mix = MIXES[args.server]
+    if args.mix:
+        with open(args.mix, encoding="utf-8") as f:
+            mix = json.load(f)
+
+    rows = []
+    try:
+        await wait_ready(url, process, args.startup_timeout)
+        print(f"{url}  上游延迟 {args.latency * 1000:.0f}ms  每级 {args.duration:.0f}s")
+        print(f"{'会话数':>5}{'调用数':>6}{'吞吐/s':>8}{'p50ms':>10}{'p99ms':>10}{'错误率':>6}{'连接失败':>3}{'RSS MB':>9}")
+        for sessions in args.concurrency:
+            row = await run_stage(url, mix, sessions, args.duration, pid, args.timeout)
+            report(row)
+            rows.append(row)
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if cache_dir is not None:
+            cache_dir.cleanup()
+    return rows
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "_serve":
+        server, latency, rows = sys.argv[2], float(sys.argv[3]), int(sys.argv[4])
+        serve_standin(server, latency, rows, sys.argv[5:])
+        return
+
+    argv, server_args = sys.argv[1:], []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, server_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="MCP HTTP 传输压测")
+    parser.add_argument("--server", default="akshare_mcp", choices=sorted(MIXES))
+    parser.add_argument("--transport", default="streamable-http", choices=["sse", "streamable-http"])
+    parser.add_argument("--concurrency", default="1,4,16,64",
+                        type=lambda s: [int(n) for n in s.split(",")], help="逐级的并发会话数，逗号分隔")
+    parser.add_argument("--duration", type=float, default=10, help="每级运行秒数")
+    parser.add_argument("--latency", type=float, default=0.05, help="替身上游每次调用的延迟秒数")
+    parser.add_argument("--rows", type=int, default=5600, help="替身行情表的行数")
+    parser.add_argument("--mix", help="调用组合JSON文件")
+    parser.add_argument("--timeout", type=float, default=60, help="单次调用超时秒数")
+    parser.add_argument("--startup-timeout", type=float, default=120, help="等待服务端就绪的秒数")
+    parser.add_argument("--url", help="压测已运行的服务，不启动替身")
+    parser.add_argument("--pid", type=int, help="配合--url，统计该进程的RSS")
+    parser.add_argument("--json", help="结果另存为JSON文件，便于对比回归")
+    parser.add_argument("--verbose", action="store_true", help="显示服务端日志")
+    args = parser.parse_args(argv)
+
+    rows = asyncio.run(run(args, server_args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"server": args.server, "transport": args.transport, "latency": args.latency,
+                       "stages": rows}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Markdown 渲染基准：tabulate (DataFrame.to_markdown) vs akshare_mcp.markdown
+
+数据取白名单中的真实接口；--data 目录下已有 <函数名>.pkl 时直接读取，
+否则联网获取并保存。无法联网时用与 stock_zh_a_spot_em、stock_info_global_em
+结构相同的合成表代替。每张表都会校验 pad=True 的输出与 tabulate 逐字节一致。
+
+运行: python benchmarks/bench_markdown.py [--data benchmarks/data] [--precision 2] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from akshare_mcp.markdown import dataframe_to_markdown, floatfmt_for_precision  # noqa: E402
+from akshare_mcp.server import white_list  # noqa: E402
+
+
+def synthetic_spot(rows: int = 5600) -> pd.DataFrame:
+    """与 stock_zh_a_spot_em 列名、类型一致的合成行情表"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "序号": np.arange(1, rows + 1),
+        "代码": [f"{i:06d}" for i in rng.integers(0, 999999, rows)],
+        "名称": [rng.choice(["平安", "万科", "中信", "招商", "宁德", "比亚"]) + f"{i % 97}号" for i in range(rows)],
+    })
+    columns = ["最新价", "涨跌幅", "涨跌额", "成交量", "成交额", "振幅", "最高", "最低", "今开", "昨收", "量比",
+               "换手率", "市盈率-动态", "市净率", "总市值", "流通市值", "涨速", "5分钟涨跌", "60日涨跌幅", "年初至今涨跌幅"]
+    scale = {"成交量": 1e6, "成交额": 1e9, "总市值": 1e11, "流通市值": 1e11}
+    for name in columns:
+        col = np.round(np.abs(rng.normal(10, 8, rows)) * scale.get(name, 1), 2)
+        col[rng.random(rows) < 0.03] = np.nan  # 停牌股
+        df[name] = col
+    return df
+
+
+def synthetic_news(rows: int = 200) -> pd.DataFrame:
+    """与 stock_info_global_em 结构一致的合成快讯表"""
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "标题": [f"快讯{i}：央行开展逆回购操作" for i in range(rows)],
+        "摘要": ["据央行公告，为维护银行体系流动性合理充裕。" * int(rng.integers(1, 6)) for _ in range(rows)],
+        "发布时间": pd.date_range("2024-06-01 09:00", periods=rows, freq="min").astype(str),
+        "链接": [f"https://finance.eastmoney.com/a/{202406010000 + i}.html" for i in range(rows)],
+    })
+
+
+def load_tables(data_dir: str):
+    os.makedirs(data_dir, exist_ok=True)
+    tables = {}
+    for name in white_list:
+        path = os.path.join(data_dir, name + ".pkl")
+        if os.path.exists(path):
+            tables[name] = pd.read_pickle(path)
+            continue
+        try:
+            import akshare as ak
+            df = getattr(ak, name)()
+        except Exception as e:
+            print(f"跳过 {name}: {type(e).__name__}")
+            continue
+        if isinstance(df, pd.DataFrame) and not df.empty:
+            df.to_pickle(path)
+            tables[name] = df
+    if not tables:
+        print("无法获取真实数据，使用合成表")
+        tables = {"stock_zh_a_spot_em(合成)": synthetic_spot(), "stock_info_global_em(合成)": synthetic_news()}
+    return tables
+
+
+def timeit(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Markdown 渲染基准")
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+    parser.add_argument("--precision", type=int, default=None, help="浮点小数位数，默认与 tabulate 相同的 g 格式")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    floatfmt = floatfmt_for_precision(args.precision)
+    print(f"{'表':<28}{'行×列':>12}{'tabulate':>12}{'pad':>10}{'no-pad':>10}{'加速':>8}{'体积(no-pad)':>16}")
+    for name, df in load_tables(args.data).items():
+        expected = df.to_markdown(index=False, floatfmt=floatfmt)
+        padded = dataframe_to_markdown(df, floatfmt=floatfmt)
+        assert padded == expected, f"{name}: 输出与 tabulate 不一致"
+        compact = dataframe_to_markdown(df, floatfmt=floatfmt, pad=False)
+
+        t_tab = timeit(lambda: df.to_markdown(index=False, floatfmt=floatfmt), args.repeat)
+        t_pad = timeit(lambda: dataframe_to_markdown(df, floatfmt=floatfmt), args.repeat)
+        t_raw = timeit(lambda: dataframe_to_markdown(df, floatfmt=floatfmt, pad=False), args.repeat)
+        shape = f"{df.shape[0]}×{df.shape[1]}"
+        print(f"{name:<28}{shape:>12}{t_tab * 1000:>10.1f}ms{t_pad * 1000:>8.1f}ms{t_raw * 1000:>8.1f}ms"
+              f"{t_tab / t_pad:>7.1f}x{len(compact) / len(expected):>15.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+冷启动耗时：旧的全量扫描注册 vs 基于清单的注册
+
+每种方式在独立子进程中运行，取多次最优。fastmcp/pandas 的导入两者相同，不计入。
+运行: python benchmarks/bench_startup.py [--repeat 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+EAGER = """
+import fastmcp, pandas
+import time; t = time.perf_counter()
+import inspect
+import akshare as ak
+from akshare_mcp.server import mcp, output_format, white_list, black_list
+for name, func in inspect.getmembers(ak, inspect.isfunction):
+    if white_list and name not in white_list:
+        continue
+    if black_list and name in black_list:
+        continue
+    inspect.signature(func)
+    mcp.tool(output_schema=None)(output_format(func, format="markdown"))
+print(time.perf_counter() - t)
+"""
+
+MANIFEST = """
+import fastmcp, pandas
+import time; t = time.perf_counter()
+from akshare_mcp.server import register, white_list, black_list
+register(white_list, black_list, format="markdown")
+print(time.perf_counter() - t)
+"""
+
+
+def run(code: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        best = min(best, float(out.stdout.strip().splitlines()[-1]))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="冷启动耗时基准")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(MANIFEST, 1)  # 确保清单已生成
+    eager = run(EAGER, args.repeat)
+    manifest = run(MANIFEST, args.repeat)
+    print(f"全量扫描注册: {eager * 1000:8.1f} ms")
+    print(f"清单注册:     {manifest * 1000:8.1f} ms  加速: {eager / manifest:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+FunctionCache / SharedCache 测试：单次上游请求、空结果与失败不缓存、租约过期接手
+
+运行: python -m pytest -q tests
+"""
+import inspect
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+from akshare_mcp.cache import CachePolicy, FunctionCache
+from akshare_mcp.shared_cache import SharedCache
+
+
+def stock_quote(symbol: str = "000001"):
+    """仅用于生成函数签名"""
+
+
+class Upstream:
+    """记录调用次数的假上游，可设置耗时、返回值或异常"""
+
+    def __init__(self, results=None, delay: float = 0.0):
+        self.results = list(results or [])
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            result = self.results.pop(0) if self.results else pd.DataFrame({"close": [10.5, 12.34]})
+        time.sleep(self.delay)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.policy = CachePolicy(ttl=60)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_cache(self, shared: SharedCache = None) -> FunctionCache:
+        return FunctionCache("stock_quote", inspect.signature(stock_quote), self.policy, root=self.tmp.name,
+                             shared=shared)
+
+    def make_shared(self, lease: float = 60) -> SharedCache:
+        return SharedCache(os.path.join(self.tmp.name, "shared.sqlite3"), lease=lease, poll=0.01)
+
+
+class TestFunctionCache(CacheTestCase):
+    """进程内缓存"""
+
+    def test_concurrent_callers_single_fetch(self):
+        """N 个并发调用只请求一次上游，全部拿到同一结果"""
+        cache = self.make_cache()
+        upstream = Upstream(delay=0.2)
+        key = cache.make_key(("000001",), {})
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(cache.fetch(key, upstream)[1])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_empty_result_not_cached(self):
+        """空结果不缓存，下一次调用重新请求上游"""
+        cache = self.make_cache()
+        upstream = Upstream([pd.DataFrame()])
+        key = cache.make_key(("000001",), {})
+        entry, value = cache.fetch(key, upstream)
+        self.assertIsNone(entry)
+        self.assertTrue(value.empty)
+        self.assertIsNone(cache.get(key))
+        entry, value = cache.fetch(key, upstream)
+        self.assertIsNotNone(entry)
+        self.assertEqual(upstream.calls, 2)
+        # 非空结果写入缓存
+        self.assertIs(cache.get(key), entry)
+
+    def test_failed_fetch_not_cached(self):
+        """上游异常传给所有等待者且不缓存，下一次调用重试"""
+        cache = self.make_cache()
+        upstream = Upstream([ConnectionError("timeout")])
+        key = cache.make_key(("000001",), {})
+        with self.assertRaises(ConnectionError):
+            cache.fetch(key, upstream)
+        self.assertIsNone(cache.get(key))
+        entry, _ = cache.fetch(key, upstream)
+        self.assertIsNotNone(entry)
+        self.assertEqual(upstream.calls, 2)
+
+    def test_rendered_variants_bounded(self):
+        """每个条目最多保留 max_rendered 种渲染结果，淘汰最久未用的"""
+        self.policy = CachePolicy(ttl=60, max_rendered=2)
+        cache = self.make_cache()
+        key = cache.make_key(("000001",), {})
+        entry, _ = cache.fetch(key, Upstream())
+        cache.keep_rendered(entry, ("markdown", None, 0, ()), "md")
+        cache.keep_rendered(entry, ("csv", None, 0, ()), "csv")
+        self.assertEqual(cache.rendered(entry, ("markdown", None, 0, ())), "md")
+        cache.keep_rendered(entry, ("json", None, 0, ()), "json")
+        self.assertEqual(len(entry.rendered), 2)
+        self.assertIsNone(cache.rendered(entry, ("csv", None, 0, ())))
+        self.assertEqual(cache.rendered(entry, ("markdown", None, 0, ())), "md")
+
+
+class TestSharedCache(CacheTestCase):
+    """多进程共享缓存，每个 FunctionCache 实例模拟一个进程"""
+
+    def test_concurrent_processes_single_fetch(self):
+        """多个进程的并发调用合计只请求一次上游"""
+        shared = self.make_shared()
+        caches = [self.make_cache(shared) for _ in range(3)]
+        upstream = Upstream(delay=0.2)
+        key = caches[0].make_key(("000001",), {})
+        barrier = threading.Barrier(9)
+        results = []
+
+        def worker(cache):
+            barrier.wait()
+            results.append(cache.fetch(key, upstream)[1])
+
+        threads = [threading.Thread(target=worker, args=(caches[i % 3],)) for i in range(9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(len(results), 9)
+        for result in results:
+            pd.testing.assert_frame_equal(result, results[0])
+
+    def test_expired_lease_taken_over(self):
+        """持有租约的进程退出后，租约到期由其它进程接手请求"""
+        shared = self.make_shared(lease=0.3)
+        cache = self.make_cache(shared)
+        key = cache.make_key(("000001",), {})
+        stale = shared.acquire("stock_quote", key)
+        self.assertIsNotNone(stale)
+        self.assertIsNone(shared.acquire("stock_quote", key))
+
+        upstream = Upstream()
+        started = time.monotonic()
+        entry, _ = cache.fetch(key, upstream)
+        self.assertGreaterEqual(time.monotonic() - started, 0.25)
+        self.assertIsNotNone(entry)
+        self.assertEqual(upstream.calls, 1)
+        # 原持有者迟到的释放不影响新租约
+        token = shared.acquire("stock_quote", key)
+        self.assertIsNotNone(token)
+        shared.release("stock_quote", key, stale)
+        self.assertIsNone(shared.acquire("stock_quote", key))
+        shared.release("stock_quote", key, token)
+
+    def test_failed_leader_retried(self):
+        """其它进程请求失败（释放租约但没有写入结果）时，等待者自己重新请求"""
+        shared = self.make_shared()
+        cache = self.make_cache(shared)
+        key = cache.make_key(("000001",), {})
+        token = shared.acquire("stock_quote", key)
+        timer = threading.Timer(0.1, shared.release, args=("stock_quote", key, token))
+        timer.start()
+        upstream = Upstream()
+        entry, _ = cache.fetch(key, upstream)
+        timer.join()
+        self.assertIsNotNone(entry)
+        self.assertEqual(upstream.calls, 1)
+
+    def test_empty_result_not_shared(self):
+        """空结果不写入共享缓存，其它进程重新请求"""
+        shared = self.make_shared()
+        first, second = self.make_cache(shared), self.make_cache(shared)
+        key = first.make_key(("000001",), {})
+        upstream = Upstream([pd.DataFrame()])
+        self.assertIsNone(first.fetch(key, upstream)[0])
+        self.assertIsNone(shared.get("stock_quote", key))
+        self.assertIsNotNone(second.fetch(key, upstream)[0])
+        self.assertEqual(upstream.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+akshare_mcp.manifest 测试：注解字符串按名称查表还原，不执行清单中的文本
+
+运行: python -m pytest -q tests
+"""
+import datetime
+import inspect
+import typing
+import unittest
+
+from akshare_mcp.manifest import _annotation, make_tool
+
+
+class TestAnnotation(unittest.TestCase):
+
+    def test_known_annotations(self):
+        self.assertIs(_annotation("str"), str)
+        self.assertIs(_annotation("datetime.date"), datetime.date)
+        self.assertEqual(_annotation("Optional[str]"), typing.Optional[str])
+        self.assertEqual(_annotation("str | None"), typing.Optional[str])
+        self.assertEqual(_annotation("Literal['daily', 'weekly']"), typing.Literal["daily", "weekly"])
+        self.assertEqual(_annotation("Dict[str, int]"), typing.Dict[str, int])
+
+    def test_unknown_or_code_is_empty(self):
+        for text in ("pd.DataFrame", "__import__('os').system('true')", "().__class__", "[x for x in ()]", "str["):
+            with self.subTest(text=text):
+                self.assertIs(_annotation(text), inspect.Parameter.empty)
+        self.assertIs(_annotation(None), inspect.Parameter.empty)
+
+    def test_make_tool_signature(self):
+        tool = make_tool({
+            "name": "stock_demo", "module": "akshare", "qualname": "stock_demo", "doc": "",
+            "parameters": [
+                {"name": "frame", "kind": "POSITIONAL_OR_KEYWORD", "annotation": "pd.DataFrame"},
+                {"name": "symbol", "kind": "POSITIONAL_OR_KEYWORD", "annotation": "str", "default": "000001"},
+            ],
+        })
+        params = inspect.signature(tool).parameters
+        self.assertIs(params["symbol"].annotation, str)
+        self.assertIs(params["frame"].annotation, inspect.Parameter.empty)
+        self.assertEqual(tool.__annotations__, {"symbol": str})
+
+
+if __name__ == "__main__":
+    unittest.main()
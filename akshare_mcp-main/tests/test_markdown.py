@@ -0,0 +1,69 @@
+"""
+akshare_mcp.markdown 测试：pad=True 的输出与 DataFrame.to_markdown (tabulate) 逐字节一致
+
+运行: python -m pytest -q tests
+"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from akshare_mcp.markdown import dataframe_to_markdown, floatfmt_for_precision
+
+
+def sample_tables():
+    rng = np.random.default_rng(0)
+    rows = 200
+    spot = pd.DataFrame({
+        "序号": np.arange(1, rows + 1),
+        "代码": [f"{i:06d}" for i in rng.integers(0, 999999, rows)],
+        "名称": [f"股票{i % 17}" for i in range(rows)],
+        "最新价": np.round(np.abs(rng.normal(10, 8, rows)), 2),
+        "成交额": np.round(np.abs(rng.normal(10, 8, rows)) * 1e9, 2),
+    })
+    spot.loc[::13, "最新价"] = np.nan
+    return {
+        "spot": spot,
+        "news": pd.DataFrame({
+            "标题": ["央行开展逆回购操作", "A股三大指数收涨", ""],
+            "发布时间": pd.date_range("2024-06-01 09:00", periods=3, freq="min").astype(str),
+            "链接": ["https://finance.eastmoney.com/a/1.html", None, "https://finance.eastmoney.com/a/3.html"],
+        }),
+        "numeric": pd.DataFrame({"a": [1, 2, 3], "b": [0.5, -1.25, 1e-7], "c": [10 ** 12, 0, -5]}),
+        "mixed": pd.DataFrame({
+            "flag": [True, False, True],
+            "date": pd.to_datetime(["2024-01-02 00:00:00", "2024-01-03 15:00:00", None]),
+            "text": ["1,234.5", "3.14", "abc"],
+            "obj": [1, 2.5, "x"],
+        }),
+    }
+
+
+class TestMarkdownParity(unittest.TestCase):
+
+    def test_matches_tabulate(self):
+        for name, df in sample_tables().items():
+            for precision in (None, 0, 2):
+                floatfmt = floatfmt_for_precision(precision)
+                with self.subTest(table=name, precision=precision):
+                    self.assertEqual(dataframe_to_markdown(df, floatfmt=floatfmt),
+                                     df.to_markdown(index=False, floatfmt=floatfmt))
+
+    def test_multiline_falls_back(self):
+        df = pd.DataFrame({"摘要": ["第一行\n第二行", "单行"]})
+        self.assertEqual(dataframe_to_markdown(df), df.to_markdown(index=False))
+        self.assertIn("<br>", dataframe_to_markdown(df, pad=False))
+
+    def test_unpadded_same_cells(self):
+        """pad=False 只去掉对齐空格"""
+        df = sample_tables()["spot"]
+        padded = dataframe_to_markdown(df).splitlines()
+        compact = dataframe_to_markdown(df, pad=False).splitlines()
+        self.assertEqual(len(padded), len(compact))
+        for line_padded, line_compact in zip(padded[2:], compact[2:]):
+            self.assertEqual([cell.strip() for cell in line_padded.split("|")],
+                             [cell.strip() for cell in line_compact.split("|")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+ResultStore 测试：过期结果在读取时按间隔清理，不依赖新的写入
+
+运行: python -m pytest -q tests
+"""
+import os
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+from akshare_mcp.result_store import ResultStore
+
+
+class TestResultStoreGC(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ResultStore(self.tmp.name, ttl=60)
+        self.df = pd.DataFrame({"close": [10.5, 12.34]})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expire(self, result_id: str) -> str:
+        path = os.path.join(self.tmp.name, result_id + ".pkl")
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        return path
+
+    def test_read_removes_expired(self):
+        """只有读取、没有新的写入时，过期文件也会被删除"""
+        stale, live = self.store.put(self.df, "csv"), self.store.put(self.df, "csv")
+        path = self.expire(stale)
+        self.store._last_gc -= self.store._gc_interval
+        df, _ = self.store.read(live)
+        self.assertEqual(len(df), 2)
+        self.assertFalse(os.path.exists(path))
+        with self.assertRaises(KeyError):
+            self.store.read(stale)
+
+    def test_gc_throttled(self):
+        """两次清理的间隔不少于 TTL 的十分之一"""
+        stale = self.store.put(self.df, "csv")
+        path = self.expire(stale)
+        self.assertEqual(self.store.maybe_gc(), 0)
+        self.assertTrue(os.path.exists(path))
+        self.store._last_gc -= self.store._gc_interval
+        self.assertEqual(self.store.maybe_gc(), 1)
+
+    def test_startup_gc(self):
+        """新建的存储清理上次运行留下的过期文件"""
+        path = self.expire(self.store.put(self.df, "csv"))
+        self.assertEqual(ResultStore(self.tmp.name, ttl=60).gc(), 1)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
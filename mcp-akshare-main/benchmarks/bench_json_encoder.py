@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON编码基准：5000×20 行情表
+
+对比 _process_result 旧路径（to_dict + FastMCP 再序列化）与 json_encoder 的列式编码。
+运行: python benchmarks/bench_json_encoder.py [--rows 5000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pydantic_core
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "mcp_akshare"))
+
+from json_encoder import dumps  # noqa: E402
+
+
+def make_table(rows: int) -> pd.DataFrame:
+    """构造与 stock_zh_a_spot_em 相似的 20 列表"""
+    rng = np.random.default_rng(0)
+    industries = ["银行", "半导体", "医药", "汽车整车", "光伏设备", "证券", "白酒", "电力"]
+    df = pd.DataFrame({
+        "序号": np.arange(1, rows + 1),
+        "代码": [f"{i:06d}" for i in rng.integers(0, 999999, rows)],
+        "名称": [f"股票{i}" for i in range(rows)],
+        "行业": pd.Categorical(rng.choice(industries, rows)),
+        "日期": pd.date_range("2024-01-01", periods=rows, freq="min"),
+    })
+    for i in range(15):
+        col = rng.normal(10, 5, rows).round(2)
+        col[rng.random(rows) < 0.05] = np.nan
+        df[f"指标{i}"] = col
+    return df
+
+
+def timeit(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON编码基准")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = make_table(args.rows)
+    envelope = {"success": True, "count": len(df), "total_count": len(df), "function": "bench"}
+
+    def mcp_akshare_old():
+        # _process_result 的 to_dict + FastMCP 的文本内容与结构化内容两次序列化
+        result = dict(envelope, data=df.to_dict(orient="records"))
+        pydantic_core.to_json(result, fallback=str)
+        pydantic_core.to_jsonable_python(result, fallback=str)
+
+    def mcp_akshare_new():
+        dumps(dict(envelope, data=df))
+
+    assert json.loads(dumps(dict(envelope, data=df)))["data"][0]["代码"] == df["代码"].iloc[0]
+
+    print(f"表格: {df.shape[0]}×{df.shape[1]}，取 {args.repeat} 次最优")
+    for label, old, new in [
+        ("mcp-akshare _process_result", mcp_akshare_old, mcp_akshare_new),
+    ]:
+        t_old, t_new = timeit(old, args.repeat), timeit(new, args.repeat)
+        print(f"{label:<30} 旧: {t_old * 1000:8.1f} ms  新: {t_new * 1000:8.1f} ms  加速: {t_old / t_new:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+工具结果缓存
+
+进入缓存的 DataFrame 会先做内存压缩：
+- 整数列按取值范围向下转换（int64 -> int32/int16/int8）
+- 浮点列在不丢失精度（或在容差内）时转换为 float32
+- 代码/名称/行业等重复字符串列转换为 category
+
+读取时按原 dtype 还原，调用方拿到的类型与未缓存时一致。
+每个缓存条目都记录压缩前后的字节数，便于评估容量。
+所有缓存共享一个进程级的 MemoryManager 字节预算。
+"""
+import heapq
+import itertools
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["compact_frame", "restore_frame", "frame_nbytes", "value_nbytes", "CacheEntry",
+           "MemoryManager", "ResultCache"]
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """DataFrame 实际占用字节数（含字符串对象）"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def value_nbytes(value: Any) -> int:
+    """估算缓存值占用的字节数，DataFrame 按列统计，list/dict 递归累加"""
+    if isinstance(value, pd.DataFrame):
+        return frame_nbytes(value)
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(value_nbytes(k) + value_nbytes(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(value_nbytes(v) for v in value)
+    return size
+
+
+def _downcast_float(values: np.ndarray, rtol: float) -> Optional[np.ndarray]:
+    narrowed = values.astype(np.float32)
+    if not np.isfinite(narrowed[np.isfinite(values)]).all():
+        return None  # 超出 float32 范围
+    if rtol > 0:
+        ok = np.allclose(narrowed.astype(np.float64), values, rtol=rtol, atol=0, equal_nan=True)
+    else:
+        # 无损：float32 的最短十进制表示必须还原出原值，如 12.34、-1.5
+        restored = narrowed.astype(str).astype(np.float64)
+        ok = np.array_equal(restored, values, equal_nan=True)
+    return narrowed if ok else None
+
+
+def _compact_column(series: pd.Series, float_rtol: float) -> pd.Series:
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in "iu":
+            return pd.to_numeric(series, downcast="integer" if dtype.kind == "i" else "unsigned")
+        if dtype == np.float64:
+            narrowed = _downcast_float(series.to_numpy(), float_rtol)
+            if narrowed is not None:
+                return pd.Series(narrowed, index=series.index, name=series.name)
+            return series
+        if dtype != object:
+            return series
+    elif not pd.api.types.is_string_dtype(dtype):
+        return series
+
+    # 字符串列：只在确实更省内存时才转 category（逐笔唯一的新闻正文不会转换）
+    try:
+        categorical = series.astype("category")
+    except TypeError:
+        return series
+    if categorical.memory_usage(deep=True) < series.memory_usage(deep=True):
+        return categorical
+    return series
+
+
+def compact_frame(df: pd.DataFrame, float_rtol: float = 0.0) -> Tuple[pd.DataFrame, int, int]:
+    """压缩 DataFrame 的列类型
+
+    Args:
+        df: 原始 DataFrame，不会被修改
+        float_rtol: float64 转 float32 允许的相对误差，0 表示要求十进制表示完全不变
+
+    Returns:
+        (压缩后的 DataFrame, 压缩前字节数, 压缩后字节数)
+    """
+    before = frame_nbytes(df)
+    compacted = pd.DataFrame(
+        {i: _compact_column(df.iloc[:, i], float_rtol) for i in range(df.shape[1])},
+        index=df.index,
+    )
+    compacted.columns = df.columns
+    after = frame_nbytes(compacted)
+    if after >= before:
+        return df, before, before
+    return compacted, before, after
+
+
+def _restore_column(series: pd.Series, dtype) -> pd.Series:
+    if series.dtype == np.float32 and dtype == np.float64:
+        # 经最短十进制表示还原，12.34f 得到 12.34 而不是 12.34000015258789
+        values = series.to_numpy().astype(str).astype(np.float64)
+        return pd.Series(values, index=series.index, name=series.name)
+    return series.astype(dtype)
+
+
+def restore_frame(df: pd.DataFrame, dtypes: pd.Series) -> pd.DataFrame:
+    """把 compact_frame 压缩过的 DataFrame 还原为原来的列类型，返回新的 DataFrame"""
+    restored = pd.DataFrame(
+        {i: _restore_column(df.iloc[:, i], dtypes.iloc[i]) if df.dtypes.iloc[i] != dtypes.iloc[i]
+         else df.iloc[:, i].copy() for i in range(df.shape[1])},
+        index=df.index,
+    )
+    restored.columns = df.columns
+    return restored
+
+
+class MemoryManager:
+    """进程级缓存字节预算
+
+    按 GreedyDual-Size 淘汰：每个条目的优先级为 ``时钟 + 重新获取耗时 / 字节数``，
+    命中时刷新；超出预算时淘汰优先级最低的条目，并把时钟推进到该优先级。
+    这样又大又便宜、且久未访问的条目最先被淘汰，小而昂贵的条目保留更久。
+    """
+
+    # 重新获取耗时的下限(秒)，避免耗时为0的条目只按大小排序时全部并列
+    MIN_COST = 1e-3
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._clock = 0.0
+        self._used = 0
+        self._usage: Dict[str, int] = defaultdict(int)
+        # (id(owner), key) -> [priority, seq, owner, key, nbytes, category, cost, token]
+        self._charges: Dict[Tuple[int, Hashable], list] = {}
+        self._heap: List[Tuple[float, int, Tuple[int, Hashable]]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _push_locked(self, ident: Tuple[int, Hashable], charge: list) -> None:
+        charge[0] = self._clock + max(charge[6], self.MIN_COST) / max(charge[4], 1)
+        charge[1] = next(self._seq)
+        heapq.heappush(self._heap, (charge[0], charge[1], ident))
+
+    def _release_locked(self, ident: Tuple[int, Hashable], token: Any = None) -> None:
+        charge = self._charges.get(ident)
+        if charge is not None and (token is None or charge[7] is token):
+            del self._charges[ident]
+            self._used -= charge[4]
+            self._usage[charge[5]] -= charge[4]
+            if not self._usage[charge[5]]:
+                del self._usage[charge[5]]
+
+    def charge(self, owner: "ResultCache", key: Hashable, nbytes: int,
+               category: str = "default", cost: float = 0.0, token: Any = None) -> bool:
+        """登记一个缓存条目，必要时淘汰其它条目；超过整个预算的条目返回 False
+
+        同一个键原有的登记总是先释放，即使新条目因超出预算不予登记。
+        token 标识这次登记的条目，释放和淘汰回调时原样带回。
+        """
+        ident = (id(owner), key)
+        victims = []
+        with self._lock:
+            self._release_locked(ident)
+            if nbytes > self.budget_bytes:
+                return False
+            charge = [0.0, 0, owner, key, nbytes, category, cost, token]
+            self._charges[ident] = charge
+            self._used += nbytes
+            self._usage[category] += nbytes
+            self._push_locked(ident, charge)
+            while self._used > self.budget_bytes and self._heap:
+                priority, seq, victim = heapq.heappop(self._heap)
+                current = self._charges.get(victim)
+                if current is None or current[1] != seq:
+                    continue  # 已释放或已刷新过的旧堆项
+                self._clock = priority
+                self._release_locked(victim)
+                victims.append((current[2], current[3], current[7]))
+        # 在锁外通知各缓存删除，避免与缓存自身的锁交叉
+        for victim_owner, victim_key, victim_token in victims:
+            victim_owner.discard(victim_key, victim_token)
+        return (owner, key, token) not in victims
+
+    def touch(self, owner: "ResultCache", key: Hashable) -> None:
+        """命中时刷新条目优先级"""
+        ident = (id(owner), key)
+        with self._lock:
+            charge = self._charges.get(ident)
+            if charge is not None:
+                self._push_locked(ident, charge)
+            if len(self._heap) > 4 * len(self._charges) + 64:
+                self._heap = [(c[0], c[1], i) for i, c in self._charges.items()]
+                heapq.heapify(self._heap)
+
+    def release(self, owner: "ResultCache", key: Hashable, token: Any = None) -> None:
+        """释放登记；给出 token 时只释放该条目自己的登记，该键已被重新写入时不做任何事"""
+        with self._lock:
+            self._release_locked((id(owner), key), token)
+
+    def usage(self) -> Dict[str, Any]:
+        """当前内存占用，按类别统计"""
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "used_bytes": self._used,
+                "entries": len(self._charges),
+                "by_category": dict(self._usage),
+            }
+
+
+@dataclass
+class CacheEntry:
+    """缓存条目"""
+    value: Any
+    expires_at: float
+    nbytes_raw: int = 0
+    nbytes: int = 0
+    category: str = "default"
+    # 压缩前的列类型，未压缩时为 None
+    dtypes: Optional[pd.Series] = None
+
+
+class ResultCache:
+    """带 TTL 和条目上限的 LRU 结果缓存，DataFrame 入缓存前自动压缩，读取时还原列类型
+
+    传入 memory 时，条目的字节数计入共享的 MemoryManager 预算，由其跨缓存淘汰。
+    登记与释放都以 CacheEntry 本身为 token，锁外的释放不会误删同一个键新写入的条目。
+    """
+
+    def __init__(self, max_entries: int = 128, float_rtol: float = 0.0,
+                 memory: Optional[MemoryManager] = None):
+        self.max_entries = max_entries
+        self.float_rtol = float_rtol
+        self.memory = memory
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """返回 (是否命中, 值)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            expired = None
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                entry, expired = None, entry
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if self.memory is not None:
+            if expired is not None:
+                self.memory.release(self, key, expired)
+            elif entry is not None:
+                self.memory.touch(self, key)
+        if entry is None:
+            return False, None
+        if entry.dtypes is not None:
+            return True, restore_frame(entry.value, entry.dtypes)
+        return True, entry.value
+
+    def put(self, key: Hashable, value: Any, ttl: float,
+            category: str = "default", cost: float = 0.0) -> CacheEntry:
+        """写入缓存，DataFrame 会先经过 compact_frame，返回的条目中是压缩后的值
+
+        Args:
+            category: 内存统计类别
+            cost: 重新获取该值的耗时(秒)，用于淘汰排序
+        """
+        dtypes = None
+        if isinstance(value, pd.DataFrame):
+            compacted, nbytes_raw, nbytes = compact_frame(value, self.float_rtol)
+            if compacted is not value:
+                value, dtypes = compacted, value.dtypes
+        else:
+            nbytes_raw = nbytes = value_nbytes(value)
+        entry = CacheEntry(value, time.monotonic() + ttl, nbytes_raw, nbytes, category, dtypes)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            overflow = []
+            while len(self._entries) > self.max_entries:
+                overflow.append(self._entries.popitem(last=False))
+        if self.memory is not None:
+            for old_key, old_entry in overflow:
+                self.memory.release(self, old_key, old_entry)
+            if not self.memory.charge(self, key, nbytes, category, cost, token=entry):
+                self.discard(key, entry)  # 单个条目超过整个预算
+        return entry
+
+    def discard(self, key: Hashable, entry: Optional[CacheEntry] = None) -> None:
+        """删除条目（MemoryManager 淘汰时回调）；给出 entry 时只在它仍是当前条目时删除"""
+        with self._lock:
+            if entry is None or self._entries.get(key) is entry:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+        if self.memory is not None:
+            for key, entry in entries:
+                self.memory.release(self, key, entry)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """各缓存条目压缩前后的字节数"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "key": repr(key),
+                    "category": entry.category,
+                    "bytes_before": entry.nbytes_raw,
+                    "bytes_after": entry.nbytes,
+                    "ttl_remaining": round(max(entry.expires_at - now, 0.0), 1),
+                }
+                for key, entry in self._entries.items()
+            ]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+按日期键的永久磁盘缓存
+
+交易所统计数据（如 stock_szse_summary(date)）在统计周期结束后不再变化。
+早于当前周期的日期（YYYYMMDD 早于今天，YYYYMM 早于本月）视为不可变，
+首次获取后写入磁盘并永不过期；当前周期的数据每次直接透传到上游。
+"""
+import datetime
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+__all__ = ["DateKeyedDiskCache", "period_dates"]
+
+logger = logging.getLogger(__name__)
+
+
+def _today() -> datetime.date:
+    # 交易所统计按北京时间划分日期
+    return datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=8))).date()
+
+
+def period_dates(start_month: str, end_month: str, daily: bool) -> List[str]:
+    """展开月份区间
+
+    Args:
+        start_month: 开始年月，YYYYMM
+        end_month: 结束年月，YYYYMM（含）
+        daily: True 返回区间内所有工作日(YYYYMMDD)，False 返回各月(YYYYMM)
+    """
+    start = pd.Period(start_month, freq="M")
+    end = pd.Period(end_month, freq="M")
+    if daily:
+        days = pd.bdate_range(start.start_time, end.end_time.normalize())
+        return [d.strftime("%Y%m%d") for d in days]
+    return [p.strftime("%Y%m") for p in pd.period_range(start, end, freq="M")]
+
+
+class DateKeyedDiskCache:
+    """不可变日期数据的磁盘缓存"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def is_immutable(date: str, today: Optional[datetime.date] = None) -> bool:
+        """日期所在统计周期是否已经结束"""
+        today = today or _today()
+        if not date.isdigit():
+            return False
+        if len(date) == 8:
+            return date < today.strftime("%Y%m%d")
+        if len(date) == 6:
+            return date < today.strftime("%Y%m")
+        return False
+
+    def _path(self, name: str, date: str, kwargs: Dict[str, Any]) -> str:
+        parts = [str(kwargs[k]) for k in sorted(kwargs)] + [date]
+        filename = "_".join(parts).replace(os.sep, "-") + ".pkl"
+        return os.path.join(self.root, name, filename)
+
+    def fetch(self, name: str, func: Callable[..., pd.DataFrame], date: str, **kwargs) -> pd.DataFrame:
+        """读取缓存，未命中时调用 func(date=date, **kwargs) 并在数据不可变时落盘"""
+        if not self.is_immutable(date):
+            return func(date=date, **kwargs)
+        path = self._path(name, date, kwargs)
+        if os.path.exists(path):
+            return pd.read_pickle(path)
+        df = func(date=date, **kwargs)
+        if isinstance(df, pd.DataFrame) and not df.empty:
+            self._write(path, df)
+        return df
+
+    @staticmethod
+    def _write(path: str, df: pd.DataFrame) -> None:
+        # 先写临时文件再原子替换，进程中断不会留下半截缓存
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                df.to_pickle(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def backfill(self, name: str, func: Callable[..., pd.DataFrame], dates: Iterable[str],
+                 max_workers: int = 4, **kwargs) -> Dict[str, int]:
+        """并发预取一批日期，返回各状态的数量
+
+        状态: cached(已在磁盘)、fetched(新落盘)、empty(无数据，如非交易日)、
+        mutable(当前周期，不缓存)、error(上游失败)
+        """
+        def load(date: str) -> str:
+            if not self.is_immutable(date):
+                return "mutable"
+            if os.path.exists(self._path(name, date, kwargs)):
+                return "cached"
+            try:
+                df = self.fetch(name, func, date, **kwargs)
+            except Exception as e:
+                logger.warning(f"回填 {name} {date} 失败: {e}")
+                return "error"
+            return "fetched" if isinstance(df, pd.DataFrame) and not df.empty else "empty"
+
+        summary = {"cached": 0, "fetched": 0, "empty": 0, "mutable": 0, "error": 0}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for status in pool.map(load, list(dates)):
+                summary[status] += 1
+        return summary
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+个股资金流排行历史存储
+
+stock_fund_flow_individual 只返回当前排行，这里定时把各周期排行快照追加到本地的
+列式存储中，按时间和股票代码查询排名与净流入的时间序列。
+
+存储布局（只追加，不改写）::
+
+    <root>/symbols.txt               股票代码字典，行号即编码
+    <root>/<周期>/ts.bin              int64   快照时间(Unix秒)
+    <root>/<周期>/symbol.bin          int32   股票代码编码
+    <root>/<周期>/rank.bin            int32   排名(序号)
+    <root>/<周期>/net_inflow.bin      float64 净额(元)
+    <root>/<周期>/price.bin           float32 最新价
+    <root>/<周期>/pct_change.bin      float32 涨跌幅(%)
+
+查询时用 np.memmap 直接映射各列文件，不需要把历史读入内存。
+"""
+import logging
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["FUND_FLOW_WINDOWS", "FundFlowHistoryStore", "FundFlowSnapshotter", "parse_amount"]
+
+logger = logging.getLogger(__name__)
+
+FUND_FLOW_WINDOWS = ["即时", "3日排行", "5日排行", "10日排行", "20日排行"]
+
+_COLUMNS = (
+    ("ts", np.dtype("<i8")),
+    ("symbol", np.dtype("<i4")),
+    ("rank", np.dtype("<i4")),
+    ("net_inflow", np.dtype("<f8")),
+    ("price", np.dtype("<f4")),
+    ("pct_change", np.dtype("<f4")),
+)
+
+_UNITS = {"亿": 1e8, "万": 1e4}
+_NUMBER = re.compile(r"^\s*([-+]?\d+(?:\.\d+)?)\s*(亿|万)?\s*%?\s*$")
+
+
+def parse_amount(value) -> float:
+    """把 "1.23亿"、"-4567.8万"、"3.21%" 之类的文本转成数值，无法解析返回 NaN"""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    match = _NUMBER.match(str(value))
+    if not match:
+        return float("nan")
+    return float(match.group(1)) * _UNITS.get(match.group(2), 1.0)
+
+
+def _first_column(df: pd.DataFrame, names: Iterable[str]) -> Optional[pd.Series]:
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return None
+
+
+class FundFlowHistoryStore:
+    """资金流排行快照的只追加列式存储"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._symbols_path = os.path.join(root, "symbols.txt")
+        self._symbols: List[str] = []
+        if os.path.exists(self._symbols_path):
+            with open(self._symbols_path, encoding="utf-8") as f:
+                self._symbols = f.read().split()
+        self._symbol_ids: Dict[str, int] = {s: i for i, s in enumerate(self._symbols)}
+
+    def _window_dir(self, window: str) -> str:
+        if window not in FUND_FLOW_WINDOWS:
+            raise ValueError(f"不支持的排行周期: {window}，可选值: {FUND_FLOW_WINDOWS}")
+        return os.path.join(self.root, window)
+
+    def _encode_symbols(self, codes: List[str]) -> np.ndarray:
+        new = [c for c in dict.fromkeys(codes) if c not in self._symbol_ids]
+        if new:
+            os.makedirs(self.root, exist_ok=True)
+            with open(self._symbols_path, "a", encoding="utf-8") as f:
+                f.write("".join(c + "\n" for c in new))
+            for code in new:
+                self._symbol_ids[code] = len(self._symbols)
+                self._symbols.append(code)
+        return np.fromiter((self._symbol_ids[c] for c in codes), dtype="<i4", count=len(codes))
+
+    def _row_count(self, window: str) -> int:
+        """各列文件的公共行数（写入中断时以最短的列为准）"""
+        counts = []
+        for name, dtype in _COLUMNS:
+            path = os.path.join(self._window_dir(window), name + ".bin")
+            counts.append(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0)
+        return min(counts)
+
+    def append(self, window: str, df: pd.DataFrame, ts: Optional[float] = None) -> int:
+        """追加一次排行快照，返回写入的行数"""
+        codes = _first_column(df, ["股票代码", "代码"])
+        if codes is None or df.empty:
+            return 0
+        codes = codes.astype(str).str.zfill(6).tolist()
+        rank = _first_column(df, ["序号"])
+        rank = (pd.to_numeric(rank, errors="coerce").fillna(-1).to_numpy()
+                if rank is not None else np.arange(1, len(df) + 1))
+        net = _first_column(df, ["净额", "资金流入净额"])
+        price = _first_column(df, ["最新价"])
+        pct = _first_column(df, ["涨跌幅", "阶段涨跌幅"])
+
+        def numeric(series):
+            if series is None:
+                return np.full(len(df), np.nan)
+            return np.fromiter(map(parse_amount, series.tolist()), dtype=float, count=len(df))
+
+        stamp = int(ts if ts is not None else time.time())
+        with self._lock:
+            columns = {
+                "ts": np.full(len(df), stamp),
+                "symbol": self._encode_symbols(codes),
+                "rank": rank,
+                "net_inflow": numeric(net),
+                "price": numeric(price),
+                "pct_change": numeric(pct),
+            }
+            window_dir = self._window_dir(window)
+            os.makedirs(window_dir, exist_ok=True)
+            rows = self._row_count(window)
+            for name, dtype in _COLUMNS:
+                path = os.path.join(window_dir, name + ".bin")
+                with open(path, "ab") as f:
+                    # 丢弃上次中断写入留下的半截数据，保证各列对齐
+                    f.truncate(rows * dtype.itemsize)
+                    f.write(np.asarray(columns[name], dtype=dtype).tobytes())
+        return len(df)
+
+    def query(self, symbol: str, window: str = "即时",
+              start: Optional[float] = None, end: Optional[float] = None) -> pd.DataFrame:
+        """查询单只股票在某个排行周期下的排名与净流入时间序列（按时间升序）"""
+        columns = ["时间", "排名", "净额", "最新价", "涨跌幅"]
+        symbol_id = self._symbol_ids.get(str(symbol).zfill(6))
+        with self._lock:
+            rows = self._row_count(window)
+        if symbol_id is None or rows == 0:
+            return pd.DataFrame(columns=columns)
+        window_dir = self._window_dir(window)
+        data = {
+            name: np.memmap(os.path.join(window_dir, name + ".bin"), dtype=dtype, mode="r", shape=(rows,))
+            for name, dtype in _COLUMNS
+        }
+        mask = data["symbol"] == symbol_id
+        if start is not None:
+            mask &= data["ts"] >= int(start)
+        if end is not None:
+            mask &= data["ts"] <= int(end)
+        idx = np.flatnonzero(mask)
+        return pd.DataFrame({
+            "时间": pd.to_datetime(data["ts"][idx], unit="s", utc=True).tz_convert("Asia/Shanghai").tz_localize(None),
+            "排名": data["rank"][idx],
+            "净额": data["net_inflow"][idx],
+            "最新价": data["price"][idx],
+            "涨跌幅": data["pct_change"][idx],
+        })
+
+
+class FundFlowSnapshotter:
+    """后台线程，按固定间隔把各周期排行写入 FundFlowHistoryStore"""
+
+    def __init__(self, store: FundFlowHistoryStore, fetch: Callable[..., pd.DataFrame],
+                 interval: float, windows: Optional[List[str]] = None):
+        self.store = store
+        self.fetch = fetch
+        self.interval = interval
+        self.windows = windows or FUND_FLOW_WINDOWS
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot_once(self) -> Dict[str, int]:
+        """抓取所有周期的当前排行并追加，返回各周期写入行数"""
+        stamp = time.time()
+        written = {}
+        for window in self.windows:
+            try:
+                written[window] = self.store.append(window, self.fetch(symbol=window), ts=stamp)
+            except Exception as e:
+                logger.warning(f"资金流排行快照失败 {window}: {e}")
+                written[window] = 0
+        return written
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.snapshot_once()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="fund-flow-snapshot", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
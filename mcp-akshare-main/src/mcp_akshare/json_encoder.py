@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+DataFrame 高性能 JSON 编码器
+
+按列向量化地把 numpy/pandas 列直接写成 JSON 文本，不经过
+``to_dict(orient="records")`` 的中间 Python 字典，也不需要 FastMCP 再序列化一次。
+
+- 浮点 NaN/Inf、NaT、None、pd.NA -> null
+- datetime64 / Timestamp / date -> ISO 8601 字符串
+- Decimal -> JSON 数字
+- category -> 只编码一次类别，再按 codes 取值
+"""
+import datetime
+import math
+from decimal import Decimal
+from json.encoder import encode_basestring
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["dumps", "dataframe_to_json"]
+
+
+# C 实现，等价于 json.dumps(value, ensure_ascii=False) 但没有 dumps 的调用开销
+_encode_str = encode_basestring
+
+
+def _encode_scalar(value: Any) -> str:
+    """编码单个标量（也用于 dict/list 中的值）"""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return "null"
+    if isinstance(value, str):
+        return _encode_str(value)
+    if isinstance(value, (bool, np.bool_)):
+        return "true" if value else "false"
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value)) if math.isfinite(value) else "null"
+    if isinstance(value, Decimal):
+        return str(value) if value.is_finite() else "null"
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+        if value is pd.NaT:
+            return "null"
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return '"' + value.isoformat() + '"'
+    if isinstance(value, (dict, list, tuple, pd.DataFrame, pd.Series)):
+        return dumps(value)
+    return _encode_str(str(value))
+
+
+def _datetime_fragments(series: pd.Series) -> np.ndarray:
+    suffix = ""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        suffix = "Z"
+    values = series.to_numpy(dtype="datetime64[ns]")
+    mask = np.isnat(values)
+    ticks = values.view("int64")
+    unit = "s" if not (ticks[~mask] % 1_000_000_000).any() else "us"
+    text = np.datetime_as_string(values, unit=unit).astype(object)
+    return np.where(mask, "null", '"' + text + (suffix + '"'))
+
+
+def _float_fragments(values: np.ndarray) -> np.ndarray:
+    if values.dtype == np.float64:
+        # float.__repr__ 给出最短往返表示，比 astype(str) 快
+        text = np.array(list(map(float.__repr__, values.tolist())), dtype=object)
+    else:
+        text = values.astype(str).astype(object)
+    text[~np.isfinite(values)] = "null"
+    return text
+
+
+def _object_fragments(series: pd.Series) -> np.ndarray:
+    """字符串/类别/混合对象列：先 factorize，只对唯一值编码一次"""
+    try:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    except TypeError:
+        # 单元格里有 dict/list 等不可哈希对象
+        return np.array([_encode_scalar(v) for v in series.tolist()], dtype=object)
+    encoded = np.empty(len(uniques) + 1, dtype=object)
+    uniques = uniques.tolist()
+    if all(type(v) is str for v in uniques):
+        encoded[:-1] = list(map(_encode_str, uniques))
+    else:
+        encoded[:-1] = list(map(_encode_scalar, uniques))
+    encoded[-1] = "null"
+    return encoded[codes]
+
+
+def _column_fragments(series: pd.Series) -> np.ndarray:
+    """把一列编码为 JSON 片段数组（dtype=object）"""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind == "b":
+            return np.where(series.to_numpy(), "true", "false").astype(object)
+        if dtype.kind in "iu":
+            return series.to_numpy().astype(str).astype(object)
+        if dtype.kind == "f":
+            return _float_fragments(series.to_numpy())
+        if dtype.kind == "M":
+            return _datetime_fragments(series)
+    elif isinstance(dtype, pd.DatetimeTZDtype):
+        return _datetime_fragments(series)
+    elif pd.api.types.is_integer_dtype(dtype):
+        # Int64 等可空整数
+        mask = series.isna().to_numpy()
+        values = series.to_numpy(dtype="int64", na_value=0).astype(str)
+        return np.where(mask, "null", values).astype(object)
+    elif pd.api.types.is_float_dtype(dtype):
+        return _float_fragments(series.to_numpy(dtype="float64", na_value=np.nan))
+    return _object_fragments(series)
+
+
+def dataframe_to_json(df: pd.DataFrame, indent: Optional[int] = None) -> str:
+    """把 DataFrame 按 records 方向直接编码为 JSON 文本
+
+    Args:
+        df: 待编码的 DataFrame，索引会被忽略
+        indent: 缩进空格数，None 表示紧凑输出
+    """
+    n_rows = len(df)
+    if n_rows == 0:
+        return "[]"
+    n_cols = df.shape[1]
+    if n_cols == 0:
+        return "[" + ",".join(["{}"] * n_rows) + "]"
+
+    if indent is None:
+        row_open, key_sep, item_sep, row_close, row_sep = "{", ":", ",", "}", ","
+        head, tail = "[", "]"
+    else:
+        pad = " " * indent
+        row_open = "{\n" + pad * 2
+        key_sep, item_sep = ": ", ",\n" + pad * 2
+        row_close, row_sep = "\n" + pad + "}", ",\n" + pad
+        head, tail = "[\n" + pad, "\n]"
+
+    # 每行布局: [键0, 值0, 键1, 值1, ..., 行尾]，最后整体一次 join
+    grid = np.empty((n_rows, 2 * n_cols + 1), dtype=object)
+    for i, (name, series) in enumerate(df.items()):
+        key = _encode_str(str(name)) + key_sep
+        grid[:, 2 * i] = (row_open if i == 0 else item_sep) + key
+        grid[:, 2 * i + 1] = _column_fragments(series)
+    grid[:, -1] = row_close + row_sep
+    grid[-1, -1] = row_close
+    return head + "".join(grid.ravel().tolist()) + tail
+
+
+def dumps(obj: Any) -> str:
+    """编码任意结果为紧凑 JSON，dict/list 中的 DataFrame 走列式快速路径"""
+    if isinstance(obj, pd.DataFrame):
+        return dataframe_to_json(obj)
+    if isinstance(obj, pd.Series):
+        return "[" + ",".join(_column_fragments(obj).tolist()) + "]"
+    if isinstance(obj, dict):
+        return "{" + ",".join(
+            _encode_str(str(k)) + ":" + dumps(v) for k, v in obj.items()
+        ) + "}"
+    if isinstance(obj, (list, tuple)):
+        return "[" + ",".join(dumps(v) for v in obj) + "]"
+    return _encode_scalar(obj)
@@ -12,14 +12,26 @@ import akshare as ak
 import pandas as pd
 from fastmcp import FastMCP
 import datetime
+import time
 import urllib3
 import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Any, Optional, List, Callable, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import wraps
 import logging
 
+try:
+    from .json_encoder import dumps as encode_json
+    from .cache import MemoryManager, ResultCache
+    from .history_store import FUND_FLOW_WINDOWS, FundFlowHistoryStore, FundFlowSnapshotter
+    from .disk_cache import DateKeyedDiskCache, period_dates
+except ImportError:  # 以脚本方式运行 main.py 时
+    from json_encoder import dumps as encode_json
+    from cache import MemoryManager, ResultCache
+    from history_store import FUND_FLOW_WINDOWS, FundFlowHistoryStore, FundFlowSnapshotter
+    from disk_cache import DateKeyedDiskCache, period_dates
+
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -29,6 +41,15 @@ for var in proxy_env_vars:
     if var in os.environ:
         del os.environ[var]
         
+def default_data_dir() -> str:
+    """本地数据目录，MCP_AKSHARE_DATA_DIR 优先，默认 ~/.cache/mcp_akshare"""
+    return os.environ.get("MCP_AKSHARE_DATA_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "mcp_akshare")
+
+def default_fund_flow_interval() -> int:
+    """资金流排行快照间隔，取环境变量 MCP_AKSHARE_FUND_FLOW_INTERVAL，默认0"""
+    return int(os.environ.get("MCP_AKSHARE_FUND_FLOW_INTERVAL") or 0)
+
 # 配置类
 @dataclass
 class MCPConfig:
@@ -37,14 +58,35 @@ class MCPConfig:
     default_timeout: int = 30
     service_name: str = "AKShare股票数据服务"
     dependencies: List[str] = None
+    # 结果缓存：默认TTL(秒，0为不缓存，历史类工具在注册时单独开启)、最大条目数、
+    # float64转float32允许的相对误差(0为无损)
+    cache_ttl: int = 0
+    # 历史行情、交易所统计等不随盘中变化的工具的缓存TTL(秒)
+    history_cache_ttl: int = 300
+    cache_max_entries: int = 128
+    cache_float_rtol: float = 0.0
+    # 所有服务端缓存共享的内存预算(字节)
+    cache_memory_budget: int = 256 * 1024 * 1024
+    # 本地数据目录（资金流历史等），见 default_data_dir
+    data_dir: str = field(default_factory=default_data_dir)
+    # 资金流排行快照间隔(秒)，0表示不启动后台快照，见 default_fund_flow_interval
+    fund_flow_snapshot_interval: int = field(default_factory=default_fund_flow_interval)
+    fund_flow_windows: List[str] = None
+    # 历史统计数据批量回填的并发数
+    stats_backfill_workers: int = 4
     
     def __post_init__(self):
         if self.dependencies is None:
             self.dependencies = ["akshare>=1.16.76"]
+        if self.fund_flow_windows is None:
+            self.fund_flow_windows = list(FUND_FLOW_WINDOWS)
 
 # 全局配置实例
 config = MCPConfig()
 
+# 进程级缓存内存预算，所有缓存共用
+memory_manager = MemoryManager(config.cache_memory_budget)
+
 # 日志配置
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -55,23 +97,39 @@ class MCPToolRegistry:
     def __init__(self, mcp_instance: FastMCP):
         self.mcp = mcp_instance
         self.tools = {}
+        self.cache = ResultCache(max_entries=config.cache_max_entries,
+                                 float_rtol=config.cache_float_rtol,
+                                 memory=memory_manager)
         
     def register_tool(self, 
                      category: str = "default",
                      name: Optional[str] = None,
-                     description: Optional[str] = None):
-        """工具注册装饰器"""
+                     description: Optional[str] = None,
+                     cache_ttl: Optional[int] = None):
+        """工具注册装饰器
+        
+        Args:
+            cache_ttl: 结果缓存秒数，None使用config.cache_ttl，0表示不缓存
+        """
         def decorator(func: Callable):
             tool_name = name or func.__name__
             tool_description = description or func.__doc__ or ""
+            ttl = config.cache_ttl if cache_ttl is None else cache_ttl
+            cached_func = self._with_cache(func, ttl, category)
             
             @wraps(func)
             def wrapper(*args, **kwargs):
-                return self._execute_with_error_handling(func, *args, **kwargs)
+                return self._execute_with_error_handling(cached_func, *args, **kwargs)
+            
+            # MCP入口直接返回编码好的JSON文本，FastMCP不再二次序列化
+            @wraps(func)
+            def mcp_wrapper(*args, **kwargs):
+                return self._execute_encoded(cached_func, *args, **kwargs)
+            mcp_wrapper.__annotations__ = {**func.__annotations__, "return": str}
             
             # 注册到FastMCP
             try:
-                mcp_tool = self.mcp.tool()(wrapper)
+                mcp_tool = self.mcp.tool(output_schema=None)(mcp_wrapper)
             except Exception as e:
                 logger.error(f"Failed to register tool {tool_name}: {e}")
                 return func
@@ -88,6 +146,34 @@ class MCPToolRegistry:
             return wrapper
         return decorator
     
+    def _with_cache(self, func: Callable, ttl: int, category: str = "default") -> Callable:
+        """为工具函数加上结果缓存，只缓存非空的DataFrame和列表
+        
+        缓存中保存压缩后的DataFrame，未命中时返回原值，命中时按原dtype还原
+        内存按工具类别统计，重新获取的耗时参与全局淘汰排序
+        """
+        if not ttl:
+            return func
+        
+        @wraps(func)
+        def cached(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                hit, value = self.cache.get(key)
+            except TypeError:  # 参数不可哈希
+                return func(*args, **kwargs)
+            if hit:
+                return value
+            started = time.perf_counter()
+            value = func(*args, **kwargs)
+            cost = time.perf_counter() - started
+            if isinstance(value, (pd.DataFrame, list)) and len(value) > 0:
+                entry = self.cache.put(key, value, ttl, category=category, cost=cost)
+                if entry.nbytes_raw:
+                    logger.info(f"缓存 {func.__name__}: {entry.nbytes_raw} -> {entry.nbytes} bytes")
+            return value
+        return cached
+    
     def _execute_with_error_handling(self, func: Callable, *args, **kwargs) -> Dict[str, Any]:
         """统一的错误处理执行器"""
         try:
@@ -97,8 +183,20 @@ class MCPToolRegistry:
             logger.error(f"Error in {func.__name__}: {str(e)}")
             return {"success": False, "error": str(e), "function": func.__name__}
     
-    def _process_result(self, result: Any, func_name: str) -> Dict[str, Any]:
-        """统一的结果处理器"""
+    def _execute_encoded(self, func: Callable, *args, **kwargs) -> str:
+        """MCP调用入口：结果直接编码为JSON文本，DataFrame不经过to_dict"""
+        try:
+            result = func(*args, **kwargs)
+            return encode_json(self._process_result(result, func.__name__, as_records=False))
+        except Exception as e:
+            logger.error(f"Error in {func.__name__}: {str(e)}")
+            return encode_json({"success": False, "error": str(e), "function": func.__name__})
+    
+    def _process_result(self, result: Any, func_name: str, as_records: bool = True) -> Dict[str, Any]:
+        """统一的结果处理器
+        
+        as_records为False时data保留为DataFrame，交给encode_json按列编码
+        """
         if isinstance(result, pd.DataFrame):
             if result.empty:
                 return {
@@ -114,7 +212,7 @@ class MCPToolRegistry:
                 "success": True,
                 "count": len(limited_result),
                 "total_count": len(result),
-                "data": limited_result.to_dict(orient="records"),
+                "data": limited_result.to_dict(orient="records") if as_records else limited_result,
                 "function": func_name
             }
         elif isinstance(result, dict):
@@ -207,8 +305,20 @@ registry = MCPToolRegistry(mcp)
 akshare_provider = AKShareDataProvider()
 news_provider = NewsDataProvider()
 
+# 资金流排行历史存储
+fund_flow_store = FundFlowHistoryStore(os.path.join(config.data_dir, "fund_flow"))
+
+# 交易所历史统计的永久磁盘缓存（过去日期的数据不可变），首次使用时创建
+_stats_cache: Optional[DateKeyedDiskCache] = None
+
+def get_stats_cache() -> DateKeyedDiskCache:
+    global _stats_cache
+    if _stats_cache is None:
+        _stats_cache = DateKeyedDiskCache(os.path.join(config.data_dir, "exchange_stats"))
+    return _stats_cache
+
 # ==================== 基础工具 ====================
-@registry.register_tool(category="basic", description="获取当前时间")
+@registry.register_tool(category="basic", description="获取当前时间", cache_ttl=0)
 def get_current_time() -> dict:
     """获取当前时间"""
     return {"current_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
@@ -223,7 +333,7 @@ def stock_bid_ask_em(symbol: str) -> dict:
     """
     return akshare_provider.stock_bid_ask_em(symbol)
 
-@registry.register_tool(category="stock_quote", description="获取A股分时行情数据")
+@registry.register_tool(category="stock_quote", description="获取A股分时行情数据", cache_ttl=config.history_cache_ttl)
 def get_stock_data(symbol: str) -> dict:
     """ 沪深京 A 股-每日行情
         https://quote.eastmoney.com/concept/sh603777.html?from=classic
@@ -299,35 +409,35 @@ def stock_sse_summary() -> dict:
     """获取上海证券交易所-股票数据总貌"""
     return ak.stock_sse_summary()
 
-@registry.register_tool(category="market_stats", description="获取深圳证券交易所证券类别统计")
+@registry.register_tool(category="market_stats", description="获取深圳证券交易所证券类别统计", cache_ttl=config.history_cache_ttl)
 def stock_szse_summary(date: str) -> dict:
     """获取深圳证券交易所-市场总貌-证券类别统计
     
     Args:
         date: 统计日期，格式为YYYYMMDD，如"20200619"
     """
-    return ak.stock_szse_summary(date=date)
+    return get_stats_cache().fetch("stock_szse_summary", ak.stock_szse_summary, date=date)
 
-@registry.register_tool(category="market_stats", description="获取深圳证券交易所地区交易排序")
+@registry.register_tool(category="market_stats", description="获取深圳证券交易所地区交易排序", cache_ttl=config.history_cache_ttl)
 def stock_szse_area_summary(date: str) -> dict:
     """获取深圳证券交易所-市场总貌-地区交易排序
     
     Args:
         date: 统计年月，格式为YYYYMM，如"202203"
     """
-    return ak.stock_szse_area_summary(date=date)
+    return get_stats_cache().fetch("stock_szse_area_summary", ak.stock_szse_area_summary, date=date)
 
-@registry.register_tool(category="market_stats", description="获取深圳证券交易所股票行业成交数据")
+@registry.register_tool(category="market_stats", description="获取深圳证券交易所股票行业成交数据", cache_ttl=config.history_cache_ttl)
 def stock_szse_industry_summary(date: str) -> dict:
     """获取深圳证券交易所-市场总貌-股票行业成交数据
     
     Args:
         date: 统计日期，格式为YYYYMMDD，如"20200619"
     """
-    return ak.stock_szse_industry_summary(date=date)
+    return get_stats_cache().fetch("stock_szse_industry_summary", ak.stock_szse_industry_summary, date=date)
 
 # ==================== 历史数据工具 ====================
-@registry.register_tool(category="historical", description="获取美股历史行情数据")
+@registry.register_tool(category="historical", description="获取美股历史行情数据", cache_ttl=config.history_cache_ttl)
 def stock_us_hist(symbol: str, period: str = "daily", 
                   start_date: str = "", end_date: str = "", 
                   adjust: str = "") -> dict:
@@ -345,7 +455,7 @@ def stock_us_hist(symbol: str, period: str = "daily",
                            adjust=adjust)
 
 # ==================== 工具管理功能 ====================
-@registry.register_tool(category="meta", description="获取所有可用工具列表")
+@registry.register_tool(category="meta", description="获取所有可用工具列表", cache_ttl=0)
 def list_available_tools() -> dict:
     """获取所有可用工具列表，按类别分组"""
     tools_by_category = {}
@@ -356,6 +466,11 @@ def list_available_tools() -> dict:
         }
     return tools_by_category
 
+@registry.register_tool(category="meta", description="获取结果缓存的条目与内存占用", cache_ttl=0)
+def cache_stats() -> dict:
+    """获取缓存内存占用(按类别)以及每个条目压缩前后的字节数"""
+    return {"memory": memory_manager.usage(), "entries": registry.cache.stats()}
+
 # 工具函数：个股资金流数据 - 修复版本
 @registry.register_tool(category="stock_stats", description="获取个股资金流数据")
 def stock_fund_flow_individual(symbol: str) -> dict:
@@ -373,6 +488,29 @@ def stock_fund_flow_individual(symbol: str) -> dict:
     """
     return ak.stock_fund_flow_individual(symbol=symbol)
 
+@registry.register_tool(category="stock_stats", description="获取个股资金流排名与净额的历史变化", cache_ttl=0)
+def stock_fund_flow_history(symbol: str, window: str = "即时",
+                            start_date: str = "", end_date: str = "") -> dict:
+    """获取个股资金流排名与净额的历史时间序列（来自本地定时快照）
+    
+    快照默认关闭，需以 --fund-flow-interval 或环境变量 MCP_AKSHARE_FUND_FLOW_INTERVAL
+    设置间隔(秒)启动服务，否则本工具返回空结果。
+    Args:
+        symbol: 股票代码，如"000001"
+        window: 排行周期，可选值: "即时", "3日排行", "5日排行", "10日排行", "20日排行"
+        start_date: 开始时间，格式为"YYYY-MM-DD"或"YYYY-MM-DD HH:MM:SS"，默认不限
+        end_date: 结束时间，格式同上，默认不限
+    Returns:
+        dict: 按时间倒序的时间、排名、净额(元)、最新价、涨跌幅(%)
+    """
+    def to_epoch(text: str) -> Optional[float]:
+        if not text:
+            return None
+        return pd.Timestamp(text).tz_localize("Asia/Shanghai").timestamp()
+    
+    history = fund_flow_store.query(symbol, window, to_epoch(start_date), to_epoch(end_date))
+    return history.iloc[::-1].reset_index(drop=True)
+
 @registry.register_tool(category="stock_stats", description=" 获取沪深港通-港股通(沪>港)-股票")
 def stock_hsgt_sh_hk_spot_em() -> dict:
     """ 获取沪深港通-港股通(沪>港)-股票
@@ -392,7 +530,7 @@ def stock_comment_detail_zlkp_jgcyd_em(symbol: str) -> dict:
     """
     return ak.stock_comment_detail_zlkp_jgcyd_em(symbol=symbol)
 
-@registry.register_tool(category="stock_stats", description=" 获取上市公司主营构成数据")
+@registry.register_tool(category="stock_stats", description=" 获取上市公司主营构成数据", cache_ttl=config.history_cache_ttl)
 def stock_zygc_em(symbol: str) -> dict:
     """获取上市公司主营构成数据
     Args:
@@ -434,7 +572,7 @@ def stock_us_hist_min_em(symbol: str, start_date: str = "1979-09-01 09:32:00", e
     """
     return ak.stock_us_hist_min_em(symbol=symbol, start_date=start_date, end_date=end_date)
 
-@registry.register_tool(category="stock_quote", description="获取A+H股历史行情数据")
+@registry.register_tool(category="stock_quote", description="获取A+H股历史行情数据", cache_ttl=config.history_cache_ttl)
 def stock_zh_ah_daily(symbol: str, start_year: str, end_year: str, adjust: str = "") -> dict:
     """获取A+H股历史行情数据
     Args:
@@ -459,7 +597,7 @@ def stock_xgsr_ths() -> dict:
     """
     return ak.stock_xgsr_ths()
 
-@registry.register_tool(category="stock_quote", description="获取科创板股票历史行情数据")
+@registry.register_tool(category="stock_quote", description="获取科创板股票历史行情数据", cache_ttl=config.history_cache_ttl)
 def stock_zh_kcb_daily(symbol: str, adjust: str = "") -> dict:
     """获取科创板股票历史行情数据
     Args:
@@ -475,7 +613,7 @@ def stock_zh_kcb_daily(symbol: str, adjust: str = "") -> dict:
     """
     return ak.stock_zh_kcb_daily(symbol=symbol, adjust=adjust)
 
-@registry.register_tool(category="market_stats", description="获取深圳证券交易所-统计资料-股票行业成交数据")
+@registry.register_tool(category="market_stats", description="获取深圳证券交易所-统计资料-股票行业成交数据", cache_ttl=config.history_cache_ttl)
 def stock_szse_sector_summary(symbol: str, date: str) -> dict:
     """获取深圳证券交易所-统计资料-股票行业成交数据
     Args:
@@ -484,13 +622,67 @@ def stock_szse_sector_summary(symbol: str, date: str) -> dict:
     Returns:
         dict: 包含股票行业成交数据的字典，包括交易天数、成交金额、成交股数、成交笔数等
     """
-    return ak.stock_szse_sector_summary(symbol=symbol, date=date)
+    return get_stats_cache().fetch("stock_szse_sector_summary", ak.stock_szse_sector_summary,
+                             date=date, symbol=symbol)
+
+@registry.register_tool(category="market_stats", description="批量回填深圳证券交易所历史统计数据", cache_ttl=0)
+def stock_szse_stats_backfill(start_month: str, end_month: str, tables: Optional[List[str]] = None) -> dict:
+    """并发预取一段月份的深交所历史统计数据到本地磁盘缓存，之后的查询直接读本地
+    Args:
+        start_month: 开始年月，格式为YYYYMM，如"202201"
+        end_month: 结束年月，格式为YYYYMM，如"202412"
+        tables: 要回填的数据表，可选值: "summary"(证券类别统计，按交易日),
+                "area_summary"(地区交易排序), "sector_summary"(股票行业成交，当月和当年),
+                "industry_summary"(股票行业成交数据，按交易日)，默认除industry_summary外全部
+    Returns:
+        dict: 各数据表的回填结果统计，cached/fetched/empty/mutable/error 的数量
+    """
+    monthly = period_dates(start_month, end_month, daily=False)
+    jobs = {
+        "summary": ("stock_szse_summary", {}, True),
+        "area_summary": ("stock_szse_area_summary", {}, False),
+        "sector_summary/当月": ("stock_szse_sector_summary", {"symbol": "当月"}, False),
+        "sector_summary/当年": ("stock_szse_sector_summary", {"symbol": "当年"}, False),
+        "industry_summary": ("stock_szse_industry_summary", {}, True),
+    }
+    tables = tables or ["summary", "area_summary", "sector_summary"]
+    results = {}
+    for job, (func_name, kwargs, daily) in jobs.items():
+        if job.split("/")[0] not in tables:
+            continue
+        func = getattr(ak, func_name, None)
+        if func is None:
+            results[job] = {"error": f"当前akshare版本没有 {func_name}"}
+            continue
+        dates = period_dates(start_month, end_month, daily=True) if daily else monthly
+        results[job] = get_stats_cache().backfill(func_name, func, dates,
+                                            max_workers=config.stats_backfill_workers, **kwargs)
+    return results
 
 def main():
     """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=config.service_name)
+    parser.add_argument("--transport", default="stdio", choices=["stdio", "sse", "streamable-http"],
+                        help="传输类型")
+    parser.add_argument("--host", default="127.0.0.1", help="sse/streamable-http绑定地址")
+    parser.add_argument("--port", type=int, default=8000, help="sse/streamable-http绑定端口")
+    parser.add_argument("--fund-flow-interval", type=int, default=config.fund_flow_snapshot_interval,
+                        help="资金流排行快照间隔(秒)，0表示不快照，stock_fund_flow_history依赖该快照")
+    args = parser.parse_args()
+    config.fund_flow_snapshot_interval = args.fund_flow_interval
+
     logger.info(f"启动 {config.service_name}")
     logger.info(f"已注册 {sum(len(tools) for tools in registry.tools.values())} 个工具")
-    mcp.run()
+    if config.fund_flow_snapshot_interval > 0:
+        FundFlowSnapshotter(fund_flow_store, ak.stock_fund_flow_individual,
+                            interval=config.fund_flow_snapshot_interval,
+                            windows=config.fund_flow_windows).start()
+    if args.transport == "stdio":
+        mcp.run()
+    else:
+        mcp.run(transport=args.transport, host=args.host, port=args.port)
 
 if __name__ == "__main__":
     main()
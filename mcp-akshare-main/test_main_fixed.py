@@ -10,9 +10,14 @@ AKShare MCP Server 修复后的测试文件
 import unittest
 import sys
 import os
+import tempfile
+import time
 from unittest.mock import patch, MagicMock, Mock
 import pandas as pd
+import numpy as np
+import json
 import datetime
+from decimal import Decimal
 from typing import Dict, Any
 
 # 添加项目根目录到Python路径
@@ -27,6 +32,10 @@ from main import (
     get_current_time, stock_bid_ask_em, get_stock_data,
     stock_zh_a_st_em, stock_zh_a_new_em
 )
+from json_encoder import dataframe_to_json, dumps
+from cache import compact_frame, MemoryManager, ResultCache
+from history_store import FundFlowHistoryStore, FundFlowSnapshotter, parse_amount
+from disk_cache import DateKeyedDiskCache, period_dates
 
 class TestRegistryTools(unittest.TestCase):
     """测试所有注册的工具函数"""
@@ -36,6 +45,7 @@ class TestRegistryTools(unittest.TestCase):
         self.test_symbol = "000001"
         self.test_date = "20241201"
         self.test_year = "2024"
+        registry.cache.clear()
         
     def tearDown(self):
         """测试后清理"""
@@ -200,6 +210,206 @@ class TestWithoutMocks(TestRegistryTools):
         self.assertIsInstance(result, dict)
         # 注意：真实调用可能失败，所以这里不强制要求success=True
 
+class TestJsonEncoder(TestRegistryTools):
+    """测试列式JSON编码器"""
+    
+    def test_special_values(self):
+        """NaN/NaT/Decimal/category/日期的编码"""
+        df = pd.DataFrame({
+            '代码': ['000001', None],
+            '最新价': [10.5, np.nan],
+            '成交量': [100, 200],
+            '日期': pd.to_datetime(['2024-01-01 09:30:00', None]),
+            '金额': [Decimal('1.25'), datetime.date(2024, 1, 2)],
+            '行业': pd.Categorical(['银行', None]),
+        })
+        records = json.loads(dataframe_to_json(df))
+        self.assertEqual(records[0], {
+            '代码': '000001', '最新价': 10.5, '成交量': 100,
+            '日期': '2024-01-01T09:30:00', '金额': 1.25, '行业': '银行'
+        })
+        self.assertEqual(records[1], {
+            '代码': None, '最新价': None, '成交量': 200,
+            '日期': None, '金额': '2024-01-02', '行业': None
+        })
+        self.assertEqual(json.loads(dataframe_to_json(df, indent=2)), records)
+    
+    def test_matches_to_dict(self):
+        """与to_dict(records)的结果一致"""
+        df = pd.DataFrame({'a': [1.1, 2.25, -3e-7], 'b': ['x', 'y"z', '中文'], 'c': [True, False, True]})
+        self.assertEqual(json.loads(dataframe_to_json(df)), df.to_dict(orient='records'))
+        self.assertEqual(dataframe_to_json(df.iloc[0:0]), '[]')
+    
+    @patch('akshare.stock_zh_a_hist')
+    def test_encoded_envelope(self, mock_akshare):
+        """MCP入口返回与_process_result一致的JSON文本"""
+        mock_akshare.return_value = pd.DataFrame({'date': ['2024-01-01'], 'close': [np.nan]})
+        original = registry.tools["stock_quote"]["get_stock_data"]["original_func"]
+        text = registry._execute_encoded(original, self.test_symbol)
+        self.assertIsInstance(text, str)
+        self.assertEqual(json.loads(text), {
+            "success": True, "count": 1, "total_count": 1,
+            "data": [{"date": "2024-01-01", "close": None}],
+            "function": "get_stock_data"
+        })
+        self.assertEqual(dumps({"x": np.int64(1), "y": float('inf')}), '{"x":1,"y":null}')
+
+class TestResultCache(TestRegistryTools):
+    """测试结果缓存与DataFrame压缩"""
+    
+    def test_compact_frame(self):
+        """数值降精度不改变取值，重复字符串转为category"""
+        df = pd.DataFrame({
+            '代码': ['000001', '600000'] * 500,
+            '收盘': [10.5, 12.34] * 500,
+            '成交额': [123456789.12, 1.5] * 500,
+            '成交量': [100, 200] * 500,
+        })
+        compacted, before, after = compact_frame(df)
+        self.assertLess(after, before)
+        self.assertEqual(str(compacted['代码'].dtype), 'category')
+        self.assertEqual(compacted['收盘'].dtype, np.float32)
+        self.assertEqual(compacted['成交额'].dtype, np.float64)
+        self.assertEqual(compacted['成交量'].dtype, np.int16)
+        self.assertEqual(json.loads(dataframe_to_json(compacted)), json.loads(dataframe_to_json(df)))
+    
+    @patch('akshare.stock_zh_a_hist')
+    def test_cache_hit(self, mock_akshare):
+        """相同参数第二次调用命中缓存，并记录压缩前后字节数"""
+        mock_akshare.return_value = pd.DataFrame({'date': ['2024-01-01'] * 10, 'close': [10.5] * 10})
+        tool_func = registry.tools["stock_quote"]["get_stock_data"]["func"]
+        first = tool_func(self.test_symbol)
+        second = tool_func(self.test_symbol)
+        self.assertEqual(first, second)
+        mock_akshare.assert_called_once_with(symbol=self.test_symbol)
+        stats = registry.cache.stats()
+        self.assertEqual(len(stats), 1)
+        self.assertLessEqual(stats[0]["bytes_after"], stats[0]["bytes_before"])
+
+    def test_cache_restores_dtypes(self):
+        """缓存中保存压缩后的值，读出时还原原始列类型与取值"""
+        cache = ResultCache()
+        df = pd.DataFrame({'代码': ['000001', '600000'] * 500, 'close': [12.34, 10.5] * 500})
+        entry = cache.put('k', df, ttl=60)
+        self.assertEqual(entry.value['close'].dtype, np.float32)
+        hit, value = cache.get('k')
+        self.assertTrue(hit)
+        pd.testing.assert_frame_equal(value, df)
+        self.assertEqual(value['close'].iloc[0], 12.34)
+
+    def test_memory_budget_eviction(self):
+        """超出全局预算时跨缓存淘汰大而便宜的条目，并按类别统计占用"""
+        memory = MemoryManager(budget_bytes=60_000)
+        quotes = ResultCache(memory=memory)
+        history = ResultCache(memory=memory)
+        small = pd.DataFrame({'v': np.arange(100) * 1.5})
+        big = pd.DataFrame({'v': np.random.default_rng(0).random(5000)})
+        quotes.put('small', small, ttl=60, category='market_stats', cost=1.0)
+        history.put('big', big, ttl=60, category='historical', cost=0.01)
+        history.put('big2', big.copy(), ttl=60, category='historical', cost=0.01)
+        self.assertTrue(quotes.get('small')[0])
+        self.assertFalse(history.get('big')[0])
+        self.assertTrue(history.get('big2')[0])
+        usage = memory.usage()
+        self.assertLessEqual(usage['used_bytes'], usage['budget_bytes'])
+        self.assertEqual(set(usage['by_category']), {'market_stats', 'historical'})
+        # 超过整个预算的条目不会被缓存
+        history.put('huge', pd.DataFrame({'v': np.zeros(20000)}), ttl=60, category='historical')
+        self.assertFalse(history.get('huge')[0])
+
+    def test_oversized_overwrite_releases_budget(self):
+        """同一个键被超出预算的值覆盖时，原条目占用的预算随之释放"""
+        memory = MemoryManager(budget_bytes=60_000)
+        cache = ResultCache(memory=memory)
+        cache.put('k', pd.DataFrame({'v': np.arange(100) * 1.5}), ttl=60, category='historical')
+        self.assertGreater(memory.usage()['used_bytes'], 0)
+        cache.put('k', pd.DataFrame({'v': np.random.default_rng(0).random(20000)}), ttl=60, category='historical')
+        self.assertFalse(cache.get('k')[0])
+        usage = memory.usage()
+        self.assertEqual(usage['used_bytes'], 0)
+        self.assertEqual(usage['entries'], 0)
+        self.assertEqual(usage['by_category'], {})
+
+    def test_expired_release_keeps_new_entry(self):
+        """过期条目在锁外释放前同一个键被重新写入时，新条目的登记不被释放"""
+        memory = MemoryManager(budget_bytes=60_000)
+        cache = ResultCache(memory=memory)
+        cache.put('k', pd.DataFrame({'v': np.arange(100) * 1.5}), ttl=0.01)
+        time.sleep(0.02)
+        release = memory.release
+        fresh = {}
+
+        def put_then_release(owner, key, token=None):
+            # 模拟 get 删除过期条目之后、释放登记之前另一个线程写入了新值
+            fresh['entry'] = cache.put('k', pd.DataFrame({'v': np.arange(200) * 1.5}), ttl=60)
+            release(owner, key, token)
+
+        with patch.object(memory, 'release', side_effect=put_then_release):
+            self.assertFalse(cache.get('k')[0])
+        self.assertTrue(cache.get('k')[0])
+        self.assertEqual(memory.usage()['used_bytes'], fresh['entry'].nbytes)
+        cache.clear()
+        self.assertEqual(memory.usage()['used_bytes'], 0)
+
+class TestFundFlowHistory(TestRegistryTools):
+    """测试资金流排行历史存储"""
+    
+    def test_snapshot_and_query(self):
+        """多次快照后按股票查询排名和净额序列"""
+        def fetch(symbol):
+            if symbol == "即时":
+                return pd.DataFrame({
+                    '序号': [1, 2], '股票代码': ['000001', '600000'], '股票简称': ['平安银行', '浦发银行'],
+                    '最新价': ['10.50', '8.20'], '涨跌幅': ['1.5%', '-0.3%'], '净额': ['1.2亿', '-3400万'],
+                })
+            return pd.DataFrame({
+                '序号': [1], '股票代码': [1], '股票简称': ['平安银行'],
+                '最新价': [10.5], '阶段涨跌幅': ['2.0%'], '资金流入净额': ['5000万'],
+            })
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = FundFlowHistoryStore(root)
+            snapshotter = FundFlowSnapshotter(store, fetch, interval=60, windows=["即时", "3日排行"])
+            self.assertEqual(snapshotter.snapshot_once(), {"即时": 2, "3日排行": 1})
+            store.append("即时", fetch("即时").iloc[::-1].assign(序号=[1, 2]), ts=2_000_000_000)
+            
+            history = FundFlowHistoryStore(root).query("600000", "即时")
+            self.assertEqual(history['排名'].tolist(), [2, 1])
+            self.assertEqual(history['净额'].tolist(), [-3.4e7, -3.4e7])
+            self.assertAlmostEqual(history['涨跌幅'].iloc[0], -0.3, places=5)
+            self.assertEqual(len(store.query("000001", "3日排行")), 1)
+            self.assertEqual(len(store.query("600000", "即时", start=2_000_000_000)), 1)
+            self.assertTrue(store.query("300750", "即时").empty)
+        self.assertEqual(parse_amount("1.5亿"), 1.5e8)
+        self.assertTrue(np.isnan(parse_amount("--")))
+
+class TestExchangeStatsCache(TestRegistryTools):
+    """测试历史交易所统计的永久磁盘缓存"""
+    
+    def test_past_dates_cached_forever(self):
+        """过去的日期只请求一次上游，当前周期每次透传"""
+        fetch = Mock(return_value=pd.DataFrame({'证券类别': ['股票'], '数量': [2800]}))
+        today = datetime.date.today()
+        with tempfile.TemporaryDirectory() as root:
+            cache = DateKeyedDiskCache(root)
+            for _ in range(2):
+                result = DateKeyedDiskCache(root).fetch("stock_szse_summary", fetch, date="20200619")
+            self.assertEqual(result['数量'].tolist(), [2800])
+            fetch.assert_called_once_with(date="20200619")
+            
+            current = today.strftime("%Y%m")
+            cache.fetch("stock_szse_area_summary", fetch, date=current)
+            cache.fetch("stock_szse_area_summary", fetch, date=current)
+            self.assertEqual(fetch.call_count, 3)
+            
+            summary = cache.backfill("stock_szse_sector_summary", fetch,
+                                     period_dates("202201", "202203", daily=False), symbol="当月")
+            self.assertEqual(summary["fetched"], 3)
+            fetch.assert_any_call(date="202203", symbol="当月")
+            summary = cache.backfill("stock_szse_sector_summary", fetch, ["202201", current], symbol="当月")
+            self.assertEqual((summary["cached"], summary["mutable"]), (1, 1))
+        self.assertEqual(period_dates("202406", "202406", daily=True)[:2], ["20240603", "20240604"])
+
 def run_fixed_tests():
     """运行修复后的测试"""
     test_classes = [
@@ -208,7 +418,11 @@ def run_fixed_tests():
         TestIntegrationChain,
         TestRegistryWrapper,
         TestErrorHandlingReal,
-        TestWithoutMocks
+        TestWithoutMocks,
+        TestJsonEncoder,
+        TestResultCache,
+        TestFundFlowHistory,
+        TestExchangeStatsCache
     ]
     
     suite = unittest.TestSuite()
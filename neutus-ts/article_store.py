@@ -0,0 +1,222 @@
+# neutus-ts/article_store.py
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from reuters_client import Article
+from text_extract import article_paragraphs
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    path TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    published_time TEXT NOT NULL,
+    complete INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    body TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published_time);
+"""
+
+# 标题、摘要、正文的全文索引，由触发器与 articles 表同步
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE articles_fts USING fts5(
+    title, description, body, content='articles', content_rowid='rowid', tokenize='unicode61'
+);
+CREATE TRIGGER articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, description, body) VALUES (new.rowid, new.title, new.description, new.body);
+END;
+CREATE TRIGGER articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, description, body)
+    VALUES ('delete', old.rowid, old.title, old.description, old.body);
+END;
+CREATE TRIGGER articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, description, body)
+    VALUES ('delete', old.rowid, old.title, old.description, old.body);
+    INSERT INTO articles_fts(rowid, title, description, body) VALUES (new.rowid, new.title, new.description, new.body);
+END;
+INSERT INTO articles_fts(articles_fts) VALUES ('rebuild');
+"""
+
+# 排序权重：标题 > 摘要 > 正文
+_BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def default_store_path() -> str:
+    """默认数据库路径，REUTERS_MCP_DATA_DIR 优先"""
+    root = os.environ.get("REUTERS_MCP_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "reuters_mcp")
+    return os.path.join(root, "articles.sqlite3")
+
+
+def article_path(url: str) -> str:
+    """文章的规范路径：去掉域名、查询串，统一首尾斜杠"""
+    path = urlparse(url).path if "://" in url else url.split("?", 1)[0].split("#", 1)[0]
+    return "/" + path.strip("/") + "/"
+
+
+def article_text(article: Article) -> str:
+    """content_elements 中的正文，每段一行，见 text_extract.article_paragraphs"""
+    return "\n".join(article_paragraphs(article.content_elements))
+
+
+def fts_query(text: str, any_terms: bool = False) -> str:
+    """把自由文本转为 FTS5 查询：每个词加引号避免语法错误，默认要求全部命中"""
+    terms = ['"%s"' % term for term in _TERM.findall(text)]
+    return (" OR " if any_terms else " ").join(terms)
+
+
+def article_from_dict(data: dict) -> Article:
+    """由 Article.to_dict 的结果还原 Article，authors 与 thumbnail 访问时才解析"""
+    return Article(**data)
+
+
+class ArticleStore:
+    """本地文章库，按规范路径保存解析后的 Article
+
+    fetch_article_by_url 得到的文章含 content_elements，记为完整；搜索等列表接口
+    得到的只有摘要，仅在库中还没有该文章时写入，不会覆盖完整的文章。
+    """
+
+    def __init__(self, path: str = None, max_age: Optional[float] = None):
+        """
+        Args:
+            path: 数据库文件路径，默认见 default_store_path
+            max_age: 完整文章的有效秒数，超过后重新获取；None 表示一直有效
+        """
+        self.path = path or default_store_path()
+        self.max_age = max_age
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        if "body" not in columns:
+            self._conn.execute("ALTER TABLE articles ADD COLUMN body TEXT NOT NULL DEFAULT ''")
+        if self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'").fetchone() is None:
+            self._conn.executescript(_FTS_SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, url: str, complete: bool = True) -> Optional[Article]:
+        """按路径或完整 URL 读取文章；complete 为 True 时只返回未过期的完整文章"""
+        with self._lock:
+            row = self._conn.execute("SELECT data, complete, fetched_at FROM articles WHERE path = ?",
+                                     (article_path(url),)).fetchone()
+        if row is None:
+            return None
+        data, is_complete, fetched_at = row
+        if complete and (not is_complete or (self.max_age is not None and fetched_at + self.max_age <= time.time())):
+            return None
+        return article_from_dict(json.loads(data))
+
+    def body(self, url: str) -> Optional[str]:
+        """保存文章时提取的正文，只对未过期的完整文章返回，避免重复解析 content_elements"""
+        with self._lock:
+            row = self._conn.execute("SELECT body, complete, fetched_at FROM articles WHERE path = ?",
+                                     (article_path(url),)).fetchone()
+        if row is None:
+            return None
+        body, is_complete, fetched_at = row
+        if not is_complete or (self.max_age is not None and fetched_at + self.max_age <= time.time()):
+            return None
+        return body
+    
+    def put(self, article: Article, complete: bool = True, alias: str = None) -> None:
+        """保存文章；alias 为请求时使用的路径，与 canonical_url 不同时一并保存"""
+        self.put_many([article], complete=complete, aliases=[alias])
+
+    def put_many(self, articles: Iterable[Article], complete: bool = False, aliases: List[Optional[str]] = None) -> int:
+        """批量保存，返回写入的条数；摘要不覆盖已有的完整文章"""
+        rows = []
+        now = time.time()
+        articles = list(articles)
+        for article, alias in zip(articles, aliases or [None] * len(articles)):
+            if not article.canonical_url:
+                continue
+            data = json.dumps(article.to_dict(), ensure_ascii=False, default=str)
+            paths = {article_path(article.canonical_url)}
+            if alias:
+                paths.add(article_path(alias))
+            body = article_text(article)
+            for path in paths:
+                rows.append((path, article.canonical_url, article.title or "", article.description or "",
+                             article.published_time or "", int(complete), data, now, body))
+        if not rows:
+            return 0
+        # 用 UPSERT 而不是 REPLACE，更新时触发器同步全文索引
+        sql = ("INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+               "ON CONFLICT(path) DO UPDATE SET canonical_url = excluded.canonical_url, title = excluded.title, "
+               "description = excluded.description, published_time = excluded.published_time, "
+               "complete = excluded.complete, data = excluded.data, fetched_at = excluded.fetched_at, "
+               "body = excluded.body")
+        if not complete:
+            sql += " WHERE articles.complete = 0"
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(sql, rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def search(self, query: str, limit: int = 20, since: str = None, until: str = None,
+               any_terms: bool = False) -> List[Dict[str, Any]]:
+        """在标题、摘要和正文中全文检索，按 BM25 相关度排序
+
+        Args:
+            query: 检索词，空格分隔，默认要求全部命中
+            limit: 最多返回的条数
+            since: 发布时间下限（含），如 "2025-01-01" 或 "2025-01-01T08:00"
+            until: 发布时间上限（含），按给出的精度比较，"2025-01-31" 包含当天
+            any_terms: 为 True 时命中任一检索词即可
+        Returns:
+            list: 每项包含 article、score（越大越相关）、snippet、complete
+        """
+        match = fts_query(query, any_terms)
+        if not match:
+            return []
+        sql = ("SELECT a.data, a.complete, -bm25(articles_fts, ?, ?, ?) AS score, "
+               "snippet(articles_fts, -1, '[', ']', '…', 16) "
+               "FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid "
+               "WHERE articles_fts MATCH ?")
+        params: List[Any] = [*_BM25_WEIGHTS, match]
+        if since:
+            sql += " AND a.published_time >= ?"
+            params.append(since)
+        if until:
+            sql += " AND substr(a.published_time, 1, ?) <= ?"
+            params += [len(until), until]
+        sql += " ORDER BY score DESC LIMIT ?"
+        params.append(limit * 2)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        # 同一篇文章以多个路径保存时只返回一次
+        results, seen = [], set()
+        for data, complete, score, snippet in rows:
+            article = article_from_dict(json.loads(data))
+            if article.canonical_url in seen:
+                continue
+            seen.add(article.canonical_url)
+            results.append({"article": article, "score": score, "snippet": snippet, "complete": bool(complete)})
+        return results[:limit]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
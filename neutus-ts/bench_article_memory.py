@@ -0,0 +1,62 @@
+"""
+文章对象内存占用测量
+
+用与 Reuters 接口结构相同的合成数据，统计 ReutersClient 解析 N 篇文章后常驻的内存
+（tracemalloc），只计解析产生的对象，原始响应数据不计入。分别测量只解析、以及访问
+authors / thumbnail 之后的占用。
+
+运行:
+    python bench_article_memory.py --articles 5000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from reuters_client import ReutersClient
+
+
+def synthetic_articles(count: int) -> list:
+    """搜索接口中一页文章的结构：两位作者、一张缩略图、若干段正文"""
+    return [{
+        "title": f"Oil prices rise as OPEC extends output cuts {i}",
+        "subtype": "article",
+        "canonical_url": f"/business/energy/oil-prices-rise-{i}/",
+        "description": "Oil prices rose on Monday after OPEC+ agreed to extend output cuts into next year.",
+        "published_time": f"2025-01-{i % 28 + 1:02d}T08:00:00Z",
+        "authors": [
+            {"name": "Jane Doe", "topic_url": "/authors/jane-doe/", "byline": "Jane Doe"},
+            {"name": "John Roe", "topic_url": "/authors/john-roe/", "byline": "John Roe"},
+        ],
+        "thumbnail": {"caption": "An oil pump jack", "width": 1200, "height": 800,
+                      "resizer_url": f"https://www.reuters.com/resizer/{i}.jpg"},
+        "content_elements": [{"type": "text", "content": f"Paragraph {j} of article {i}."} for j in range(5)],
+    } for i in range(count)]
+
+
+def measure(payload: list, touch: bool) -> int:
+    client = ReutersClient(cache=None)
+    gc.collect()
+    tracemalloc.start()
+    articles = [client._parse_article(data) for data in payload]
+    if touch:
+        for article in articles:
+            article.authors, article.thumbnail
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del articles
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文章对象内存占用")
+    parser.add_argument("--articles", type=int, default=5000)
+    args = parser.parse_args()
+
+    payload = synthetic_articles(args.articles)
+    for label, touch in (("仅解析", False), ("访问 authors/thumbnail 后", True)):
+        size = measure(payload, touch)
+        print(f"{label:<24}{size / 2 ** 20:>8.2f} MB{size / args.articles:>10.0f} 字节/篇")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# neutus-ts/feed_watcher.py
+import asyncio
+import contextlib
+import random
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from reuters_client import Article
+
+
+def parse_feeds(spec: str) -> List[Tuple[str, str]]:
+    """解析订阅配置，如 "section:/markets/,topic:/markets/commodities/"，省略来源时视为 section"""
+    feeds = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        source, _, value = item.partition(":") if ":" in item else ("section", "", item)
+        feeds.append((source.strip(), value.strip()))
+    return feeds
+
+
+class _Feed:
+    """单个订阅的状态"""
+
+    def __init__(self, source: str, value: str, seen_size: int, buffer_size: int):
+        self.source = source
+        self.value = value
+        self.name = f"{source}:{value}"
+        # 已见过的最新发布时间
+        self.high_water: Optional[str] = None
+        # 最近见过的文章链接，超过 seen_size 时淘汰最早的
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+        self.seen_size = seen_size
+        # (序号, 文章)，按发现顺序
+        self.items: deque = deque(maxlen=buffer_size)
+        self.last_poll: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def remember(self, key: str) -> None:
+        self.seen[key] = None
+        while len(self.seen) > self.seen_size:
+            self.seen.popitem(last=False)
+
+
+class FeedWatcher:
+    """后台轮询若干 section / topic，把新文章保存在内存中
+
+    每个订阅记录已见过的最新 published_time（高水位）和最近见过的文章链接，轮询时
+    从最新一页往后读，遇到已见过且不晚于高水位的文章即停止，一般只需请求一页。
+    新文章按发现顺序编号，调用方用上次返回的 cursor 只取之后的文章。
+    """
+
+    def __init__(self, client, feeds: List[Tuple[str, str]], interval: float = 120, page_size: int = 20,
+                 max_pages: int = 5, seen_size: int = 1000, buffer_size: int = 200):
+        """
+        Args:
+            client: AsyncReutersClient
+            feeds: (来源, 值) 列表，来源为 section / topic / search
+            interval: 轮询间隔秒数
+            page_size: 每页文章数
+            max_pages: 每次轮询最多请求的页数，长时间未轮询时只补最近的部分
+            seen_size: 每个订阅记住的文章链接数
+            buffer_size: 每个订阅在内存中保留的新文章数
+        """
+        for source, _ in feeds:
+            if source not in client.PAGED_SOURCES:
+                raise ValueError(f"不支持的来源: {source}，可选: {list(client.PAGED_SOURCES)}")
+        self.client = client
+        self.interval = interval
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.feeds = [_Feed(source, value, seen_size, buffer_size) for source, value in feeds]
+        self.sequence = 0
+        self._task: Optional[asyncio.Task] = None
+        self._users = 0
+
+    async def poll(self, feed: _Feed) -> int:
+        """轮询一个订阅，返回新文章数"""
+        new: List[Article] = []
+        # 首次轮询只取第一页作为起点
+        limit = self.page_size if feed.high_water is None else self.page_size * self.max_pages
+        stream = self.client.iter_articles(feed.source, feed.value, page_size=self.page_size, limit=limit,
+                                           since=feed.high_water)
+        async with contextlib.aclosing(stream):
+            async for article in stream:
+                key = article.canonical_url or article.title
+                if key in feed.seen:
+                    if feed.high_water is None or (article.published_time or "") <= feed.high_water:
+                        break
+                    continue
+                new.append(article)
+        for article in reversed(new):
+            self.sequence += 1
+            feed.items.append((self.sequence, article))
+            feed.remember(article.canonical_url or article.title)
+            if article.published_time and (feed.high_water is None or article.published_time > feed.high_water):
+                feed.high_water = article.published_time
+        feed.last_poll = time.time()
+        feed.error = None
+        return len(new)
+
+    async def _poll_quietly(self, feed: _Feed) -> None:
+        try:
+            await self.poll(feed)
+        except Exception as e:
+            feed.error = str(e)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.gather(*(self._poll_quietly(feed) for feed in self.feeds))
+            await asyncio.sleep(self.interval * random.uniform(0.9, 1.1))
+
+    @contextlib.asynccontextmanager
+    async def running(self):
+        """在上下文中运行后台轮询；可嵌套进入，最后一个退出时停止"""
+        self._users += 1
+        if self._task is None and self.feeds:
+            self._task = asyncio.create_task(self._run())
+        try:
+            yield self
+        finally:
+            self._users -= 1
+            if self._users == 0 and self._task is not None:
+                task, self._task = self._task, None
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+    def new_since(self, cursor: int = 0, feed: Optional[str] = None,
+                  limit: Optional[int] = None) -> Tuple[List[Tuple[str, Article]], int]:
+        """返回序号大于 cursor 的新文章 (订阅名, 文章) 及新的 cursor
+
+        limit 截断时 cursor 停在最后一篇返回的文章，下次从这里继续。
+        """
+        items = [(sequence, item.name, article) for item in self.feeds if feed in (None, item.name, item.value)
+                 for sequence, article in item.items if sequence > cursor]
+        items.sort(key=lambda entry: entry[0])
+        if limit is not None:
+            items = items[:limit]
+        next_cursor = items[-1][0] if items else cursor
+        return [(name, article) for _, name, article in items], next_cursor
+
+    def status(self) -> List[Dict[str, Any]]:
+        """各订阅的高水位、上次轮询时间和错误"""
+        return [{
+            "feed": feed.name,
+            "high_water": feed.high_water,
+            "buffered": len(feed.items),
+            "last_poll": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(feed.last_poll)) if feed.last_poll else None,
+            "error": feed.error,
+        } for feed in self.feeds]
@@ -0,0 +1,127 @@
+# neutus-ts/rate_limiter.py
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+# 视为上游过载的状态码，None 表示连接失败或超时
+THROTTLE_STATUS = (429, 500, 502, 503, 504)
+
+# Retry-After 最多遵守的秒数
+MAX_RETRY_AFTER = 60.0
+
+
+def retry_after(headers) -> Optional[float]:
+    """解析 Retry-After 响应头，支持秒数和 HTTP 日期两种格式"""
+    value = headers.get('Retry-After') if headers is not None else None
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        seconds = parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+@dataclass
+class _Bucket:
+    """单个接口的令牌桶"""
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    decreased_at: float = 0.0
+    throttled: int = 0
+
+
+class RateLimiter:
+    """按接口限速的令牌桶，速率按 AIMD 自适应
+
+    每个接口（URL 最后一段）一个令牌桶。请求成功时速率加性增加，直到 max_rate；
+    遇到 429、5xx 或连接失败时速率减半，cooldown 秒内只减一次，避免同一批在途请求
+    连续减速。响应带 Retry-After 时，该接口在此之前不再发出请求。
+    线程安全，同步与异步客户端可共用同一个实例。
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, min_rate: float = 0.2, max_rate: float = 20.0,
+                 increase: float = 0.05, decrease: float = 0.5, cooldown: float = 1.0):
+        """
+        Args:
+            rate: 每个接口的初始速率（请求/秒）
+            burst: 令牌桶容量，即空闲后允许的突发请求数
+            min_rate: 速率下限
+            max_rate: 速率上限
+            increase: 每次成功后速率增加的量
+            decrease: 过载时速率乘以的系数
+            cooldown: 两次减速的最小间隔秒数
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _endpoint(url: str) -> str:
+        return url.rstrip('/').rsplit('/', 1)[-1]
+
+    def _bucket(self, url: str, now: float) -> _Bucket:
+        endpoint = self._endpoint(url)
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            bucket = self._buckets[endpoint] = _Bucket(rate=self.rate, tokens=float(self.burst), updated=now)
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        """尝试取一个令牌：取到返回 0，否则返回预计还需等待的秒数，等待后再次调用
+
+        不预先排队，等待中的请求在速率调整后按新速率获取令牌。
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(url, now)
+            if bucket.blocked_until > now:
+                return bucket.blocked_until - now
+            bucket.tokens = min(float(self.burst), bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / bucket.rate
+
+    def feedback(self, url: str, status: Optional[int], retry_after: Optional[float] = None) -> None:
+        """记录请求结果并调整速率"""
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(url, now)
+            if status is None or status in THROTTLE_STATUS:
+                bucket.throttled += 1
+                if now - bucket.decreased_at >= self.cooldown:
+                    bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                    bucket.decreased_at = now
+                if retry_after:
+                    bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+            else:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """各接口当前速率、被限流次数和剩余封禁秒数"""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                endpoint: {
+                    "rate": round(bucket.rate, 3),
+                    "throttled": bucket.throttled,
+                    "blocked_for": round(max(0.0, bucket.blocked_until - now), 3),
+                }
+                for endpoint, bucket in self._buckets.items()
+            }
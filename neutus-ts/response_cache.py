@@ -0,0 +1,140 @@
+# neutus-ts/response_cache.py
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+# 各接口的缓存秒数：列表类接口变化快，文章正文和网站结构基本不变
+ENDPOINT_TTL = {
+    "articles-by-search-v2": 60,
+    "recent-stories-by-sections-v1": 60,
+    "articles-by-stock-symbol-v1": 60,
+    "articles-by-topic-v1": 120,
+    "article-by-id-or-url-v1": 24 * 3600,
+    "site-hierarchy-by-name-v1": 24 * 3600,
+}
+
+DEFAULT_TTL = 60
+
+
+@dataclass
+class CachedResponse:
+    """缓存的 API 结果及其校验信息"""
+    result: Any
+    expires_at: float
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+
+def _header(headers, name: str) -> Optional[str]:
+    value = headers.get(name) if headers is not None else None
+    return value if isinstance(value, str) else None
+
+
+class ResponseCache:
+    """Reuters API 响应缓存
+
+    键为接口 URL、规范化后的 query JSON 与额外参数。过期后若服务端给过 ETag 或
+    Last-Modified，下次请求带上 If-None-Match / If-Modified-Since，返回 304 时
+    直接续期。总大小超过 max_bytes 时淘汰最久未使用的条目。
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttl: Dict[str, int] = None):
+        self.max_bytes = max_bytes
+        self.ttl = {**ENDPOINT_TTL, **(ttl or {})}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _endpoint(url: str) -> str:
+        return url.rstrip('/').rsplit('/', 1)[-1]
+
+    def key(self, url: str, query: str, extra_params: dict = None) -> str:
+        """缓存键，query 中字段的顺序和空白不影响命中"""
+        try:
+            query = json.dumps(json.loads(query), sort_keys=True, separators=(',', ':'))
+        except ValueError:
+            pass
+        extra = json.dumps(extra_params, sort_keys=True, default=str) if extra_params else ""
+        return f"{url}\n{query}\n{extra}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """返回条目（可能已过期，过期条目用于条件请求）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.fresh:
+                    self.hits += 1
+                    return entry
+            self.misses += 1
+            return entry
+
+    def validators(self, entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """过期条目的条件请求头"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidate(self, key: str, url: str) -> Optional[CachedResponse]:
+        """服务端返回 304，条目续期"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.time() + self.ttl.get(self._endpoint(url), DEFAULT_TTL)
+                self.revalidated += 1
+            return entry
+
+    def put(self, key: str, url: str, result: Any, headers=None, size: int = 0) -> None:
+        """写入结果，服务端要求 no-store 时不缓存"""
+        cache_control = _header(headers, 'Cache-Control') or ''
+        ttl = self.ttl.get(self._endpoint(url), DEFAULT_TTL)
+        if 'no-store' in cache_control or ttl <= 0 or size > self.max_bytes:
+            return
+        entry = CachedResponse(
+            result=result,
+            expires_at=time.time() + ttl,
+            size=size,
+            etag=_header(headers, 'ETag'),
+            last_modified=_header(headers, 'Last-Modified'),
+        )
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+            self._entries[key] = entry
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+            }
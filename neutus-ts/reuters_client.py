@@ -1,10 +1,19 @@
 # neutus-ts/reuters_client.py
+import asyncio
+import itertools
 import json
+import random
+import time
 import requests
-from typing import Optional, Dict, List, Any, Union
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Dict, List, Any, Union, Iterator, AsyncIterator, Callable
+from dataclasses import asdict, dataclass
 from enum import Enum
 
+from rate_limiter import THROTTLE_STATUS, RateLimiter, retry_after
+from response_cache import CachedResponse, ResponseCache
+
 
 class ApiError(Exception):
     """API 错误基类"""
@@ -32,7 +41,7 @@ class InternalError(ApiError):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Image:
     """图片信息"""
     caption: Optional[str] = None
@@ -41,7 +50,7 @@ class Image:
     resizer_url: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Topic:
     """主题/作者信息"""
     name: str
@@ -49,17 +58,179 @@ class Topic:
     byline: str = ""
 
 
-@dataclass
+BASE_URL = "https://www.reuters.com"
+
+
+def full_url(url: str) -> str:
+    """确保URL是完整的绝对链接"""
+    if not url:
+        return ""
+    
+    # 如果已经是完整URL，直接返回
+    if url.startswith('http://') or url.startswith('https://'):
+        return url
+    
+    # 如果是相对路径，添加基础URL
+    if url.startswith('/'):
+        return f"{BASE_URL}{url}"
+    else:
+        return f"{BASE_URL}/{url}"
+
+
+def _topic_dict(author: Union[Topic, Dict[str, Any]]) -> Dict[str, Any]:
+    """Topic 或原始字典转为 asdict 的格式，不创建 Topic 对象"""
+    if isinstance(author, Topic):
+        return asdict(author)
+    return {"name": author.get('name', ''), "topic_url": full_url(author.get('topic_url', '')),
+            "byline": author.get('byline', '')}
+
+
+def _image_dict(image: Union[Image, Dict[str, Any]]) -> Dict[str, Any]:
+    """Image 或原始字典转为 asdict 的格式"""
+    if isinstance(image, Image):
+        return asdict(image)
+    return {"caption": image.get('caption'), "width": image.get('width'), "height": image.get('height'),
+            "resizer_url": image.get('resizer_url', '')}
+
+
 class Article:
-    """文章信息"""
-    title: str
-    subtype: Optional[str] = None
-    canonical_url: str = ""
-    description: str = ""
-    content_elements: Optional[List[Dict[str, Any]]] = None
-    authors: Optional[List[Topic]] = None
-    thumbnail: Optional[Image] = None
-    published_time: str = ""
+    """文章信息
+    
+    列表接口一次返回大量文章，多数调用只用到标题、链接和时间，因此使用 __slots__，
+    authors 与 thumbnail 保留接口返回的原始字典，首次访问时才转换为 Topic / Image；
+    content_elements 始终是接口返回的原始列表。
+    """
+    __slots__ = ("title", "subtype", "canonical_url", "description", "published_time",
+                 "content_elements", "_authors", "_thumbnail")
+    
+    def __init__(self, title: str, subtype: Optional[str] = None, canonical_url: str = "",
+                 description: str = "", content_elements: Optional[List[Dict[str, Any]]] = None,
+                 authors: Optional[List[Union[Topic, Dict[str, Any]]]] = None,
+                 thumbnail: Optional[Union[Image, Dict[str, Any]]] = None, published_time: str = ""):
+        self.title = title
+        self.subtype = subtype
+        self.canonical_url = canonical_url
+        self.description = description
+        self.content_elements = content_elements
+        self._authors = authors
+        self._thumbnail = thumbnail
+        self.published_time = published_time
+    
+    @property
+    def authors(self) -> Optional[List[Topic]]:
+        if self._authors and isinstance(self._authors[0], dict):
+            self._authors = [Topic(**_topic_dict(author)) for author in self._authors]
+        return self._authors
+    
+    @authors.setter
+    def authors(self, value: Optional[List[Union[Topic, Dict[str, Any]]]]):
+        self._authors = value
+    
+    @property
+    def thumbnail(self) -> Optional[Image]:
+        if isinstance(self._thumbnail, dict):
+            self._thumbnail = Image(**_image_dict(self._thumbnail))
+        return self._thumbnail
+    
+    @thumbnail.setter
+    def thumbnail(self, value: Optional[Union[Image, Dict[str, Any]]]):
+        self._thumbnail = value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典，结构与 Article 的构造参数一致"""
+        return {
+            "title": self.title,
+            "subtype": self.subtype,
+            "canonical_url": self.canonical_url,
+            "description": self.description,
+            "content_elements": self.content_elements,
+            "authors": [_topic_dict(author) for author in self._authors] if self._authors is not None else None,
+            "thumbnail": _image_dict(self._thumbnail) if self._thumbnail is not None else None,
+            "published_time": self.published_time,
+        }
+    
+    def __eq__(self, other):
+        if not isinstance(other, Article):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+    
+    def __repr__(self):
+        return f"Article(title={self.title!r}, canonical_url={self.canonical_url!r}, published_time={self.published_time!r})"
+
+
+def _authors_field(article: Article) -> List[Dict[str, Any]]:
+    return [_topic_dict(author) for author in article._authors] if article._authors else []
+
+
+def _thumbnail_field(article: Article) -> Optional[Dict[str, Any]]:
+    return _image_dict(article._thumbnail) if article._thumbnail is not None else None
+
+
+# 可投影的文章字段及取值函数；authors / thumbnail 直接由原始数据生成，不创建 Topic / Image
+ARTICLE_FIELDS: Dict[str, Callable[[Article], Any]] = {
+    "title": lambda article: article.title,
+    "canonical_url": lambda article: article.canonical_url,
+    "description": lambda article: article.description,
+    "published_time": lambda article: article.published_time,
+    "subtype": lambda article: article.subtype,
+    "authors": _authors_field,
+    "thumbnail": _thumbnail_field,
+    "content_elements": lambda article: article.content_elements or [],
+}
+
+# 列表类接口默认返回的字段
+SUMMARY_FIELDS = ("title", "canonical_url", "description", "published_time", "subtype", "authors", "thumbnail")
+
+
+def article_serializer(fields: Optional[List[str]] = None, default: tuple = SUMMARY_FIELDS,
+                       description_limit: Optional[int] = None) -> Callable[[Article], Dict[str, Any]]:
+    """生成只含指定字段的文章序列化函数，未请求的字段不会读取
+    
+    Args:
+        fields: 需要的字段，见 ARTICLE_FIELDS；为空时使用 default
+        default: 默认字段
+        description_limit: description 超过该长度时截断并加"..."
+    Raises:
+        ValueError: 包含未知字段
+    """
+    fields = list(dict.fromkeys(fields or default))
+    unknown = [name for name in fields if name not in ARTICLE_FIELDS]
+    if unknown:
+        raise ValueError(f"未知字段: {unknown}，可选: {list(ARTICLE_FIELDS)}")
+    getters = [(name, ARTICLE_FIELDS[name]) for name in fields]
+    if description_limit is not None and "description" in fields:
+        def description(article: Article) -> str:
+            text = article.description or ""
+            return text[:description_limit] + "..." if len(text) > description_limit else text
+        getters = [(name, description if name == "description" else getter) for name, getter in getters]
+    
+    def serialize(article: Article) -> Dict[str, Any]:
+        return {name: getter(article) for name, getter in getters}
+    
+    return serialize
+
+
+def merge_articles(groups: Dict[str, List[Article]]) -> List[tuple]:
+    """合并多组搜索结果，同一篇文章只保留一次
+    
+    Args:
+        groups: 关键词 -> 该关键词搜到的文章
+    Returns:
+        list: (文章, 命中的关键词列表)，按命中关键词数、发布时间倒序排列
+    """
+    merged: Dict[str, tuple] = {}
+    for keyword, articles in groups.items():
+        for article in articles or []:
+            key = (article.canonical_url or article.title).split('?', 1)[0].rstrip('/')
+            if key in merged:
+                if keyword not in merged[key][1]:
+                    merged[key][1].append(keyword)
+            else:
+                merged[key] = (article, [keyword])
+    # 稳定排序：先按时间，再按命中数
+    ranked = sorted(merged.values(), key=lambda item: item[0].published_time or "", reverse=True)
+    ranked.sort(key=lambda item: len(item[1]), reverse=True)
+    return ranked
 
 
 @dataclass
@@ -92,196 +263,212 @@ class ApiResponse:
     result: Optional[Any] = None
 
 
-class ReutersClient:
-    """Reuters API 客户端"""
+class _ReutersClientBase:
+    """同步与异步客户端共用的请求构造与响应解析"""
     
-    BASE_URL = "https://www.reuters.com"
+    BASE_URL = BASE_URL
     
-    def __init__(self, timeout: int = 30):
-        self.session = requests.Session()
-        self.timeout = timeout
+    # 默认请求头
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+        'Accept': 'application/json, text/plain, */*',
+        'Accept-Language': 'en-GB,en;q=0.9',
+        'Referer': 'https://www.reuters.com/',
+        'Origin': 'https://www.reuters.com',
+        'Cookie': 'cleared-onetrust-cookies=Thu, 17 Feb 2022 19:17:07 GMT; usprivacy=1---; _gcl_au=1.1.1644174517.1755241032; _li_dcdm_c=.reuters.com; _lc2_fpi=f511229f0ef8--01k2p89arht3qzwny252ghayyr; _lc2_fpi_js=f511229f0ef8--01k2p89arht3qzwny252ghayyr; _fbp=fb.1.1755241033497.268690643371457521; sa-user-id=s%253A0-ab2954a1-a1bf-4b41-52cb-feb95f725f44.MYGdUTr3B5SteYctSaYNYGLOiH%252B3F5xdjRTh6cfOwnw; sa-user-id-v2=s%253AqylUoaG_S0FSy_65X3JfRD7Ar18.AtY6docCCFyF%252FqNSdIzfRWlwXQWDWKTxpxEwrUdW2dA; sa-user-id-v3=s%253AAQAKIBgvtu6HwSxupj2zC5qYZU6_AD1kquAm4DOYSWrd75yhEHwYAiDj2vrBBjoEtKIe0EIEiwQquQ.Lk%252BKeHlNTEEKcCcqIcD7M%252BdwOQMuVJ0pzoNyPw3n11Y; permutive-id=4582370c-99ea-47b1-b5b4-c821075f9cf2; _cb=CPNBaHCtxdvGsjk5H; _ga=GA1.2.753013835.1755241036; _gid=GA1.2.263185755.1755241036; cnx_userId=2-fc73794db9fd472ab4cd10ad51d79fac; ajs_anonymous_id=cb0ac241-f21d-4995-9f96-ebe6d65ad046; _v__chartbeat3=0G1CrDTjGWhCkziQJ; _cc_id=39be7e078d2a9d90c1d9feef044b65ac; panoramaId_expiry=1755327440485; panoramaId=0294451ead73ad503acecc6f9e88a9fb927a243e43ca048a043438eed0c2db09; panoramaIdType=panoDevice; idw-fe-id=5250eea5-a507-4516-ac8d-31781c530906; BOOMR_CONSENT="opted-in"; bounceClientVisit5431v=N4IgNgDiBcIBYBcEQM4FIDMBBNAmAYnvgO6kB0ATgKYCuCVFKZAxgPYC2RKNKCAhgEsAdnwBGAsAIQBPIs0ns+9ALRUhDAOayCEMH14DmyiKzBg6A1kOX8wAaxTKNrZcIQvWANwYIB7KspsNEIIFAJUjhA8cMp6KqLUfHYIcBSsNBoxuAAMuACsytkAHMoAjAAsRCAANCAUMCA1ILxKVDCgACZUnoZUAPoCHQ2luKUY2QBsGCMA7DOleeXlpbkYTRodEPXQAGZ8YChUtcz6YDB7B0cgPOf7h7VdPcxt0KAJrMSH2yAAwqkcbVq3kYliEwwwRTI2ShUKauiUO1YFHYDQA6sIOh8UE1Hr0+jIIC8QF0UMlWFBagk+EIhrAmsQqKIelRiLdLgBfWpCVh9OzCCICbHQUI0K7UACOot4+NYdjUDQweVE2VEAE48kVVYzssxRHqJpNyqIKkUinwqDtVR1cKrcFQ+B1shg+BNVbaOhMZswOsxTcwdkVRDNyhMDUrcEUmuxWOIwC8LvcQD0oLAJrgyKVbRmZnkM0UZusqKx2iAgiEKNIGgAJADSTQAXgIU41aiYWmA+mwug0mswpJXYFWrBoAAQ14e9qy+dQhTusbuwLAAZSa1A0oJ7tTXoL6In8m9L6XL0l3fH3g+HY4nxyPoRPXaJtcnwTvc66a0HNYA4k0+Ik30SOKKABMDZLU-ihDyD6gbUcRSDQC64OmGCwcO8ELqUFRkLgnIgKwOw7L0bKJigKA7J4CAwSACBgtApQ5nkuDLJMEy1O4cpCAAaoKUgAJK0iA9F5IxzGhnk2T0RgExND0KB8QAIsMDFMSsYkSTMUkgOy7JAA; OneTrustWPCCPAGoogleOptOut=false; _lr_retry_request=true; _lr_env_src_ats=false; _cb_svref=external; _lr_sampling_rate=100; _pbjs_userid_consent_data=3524755945110770; __gads=ID=621a923ae4af9ed1:T=1755241038:RT=1755241461:S=ALNI_MabX7LzAQdikEO9xZmn9qrUPaJ9jg; __gpi=UID=0000118075137b68:T=1755241038:RT=1755241461:S=ALNI_MbQjtXIoUrEP-Apps5HW0ek26X2mA; __eoi=ID=8f9883b9e0b28a09:T=1755241038:RT=1755241461:S=AA-AfjYsKHwaU9yqxPIuEZWBkC7A; dicbo_id=%7B%22dicbo_fetch%22%3A1755241643202%7D; _awl=2.1755241646.5-5dd0209f83c437a6053f786c790c4f7b-6763652d617369612d6561737431-0; cto_bundle=qczVwV9HQW15VjJsTkFuMiUyQlFnQ1JKTjlHS1JnRDJyWkk4OXFiUFJIeU9qalRWcmFwWWh3QVpyN3hLcjhiTVBNMnFDUDduYlJCTUdwN29vVEtBeWtiN09jMVczRlN3SW1jSlE0WVF0ekV4SGdNMHhUYWElMkZhdGFrY3RrNFlIMWxmdSUyRmFYejh6TkxyalEwZ0JQUWlJMHNGcTQxVHA2a2VsR3V5dllEOVRnTm1BSjFPSE5ickFhMWlTRndaWTFudlk5T0VnbGc5d3l1bnFtTG5RZDV6YkxSJTJGaEphWEElM0QlM0Q; _gat=1; reuters-geo={"country":"-", "region":"-"}; datadome=pu9J7SCuXhsWlqyhGO4d_QKpgaxAe3GqC0vn6mMiUswvjVBJ1xzO1ZYhuD0c1UlK3UlEmiUGa71HYfEYVIw7bIs22IX4SEWEztQU75RCEqbWn7E53TvHWjK9pzib6L2v; ABTasty=uid=qrdd8pk3zqqy7ymk; ABTastySession=mrasn=&lp=https%253A%252F%252Fwww.reuters.com%252Fsustainability%252Fclimate-energy%252Fplastic-pollution-talks-go-into-overtime-countries-push-late-breakthrough-2025-08-14%252F; OptanonConsent=isGpcEnabled=0&datestamp=Fri+Aug+15+2025+15%3A08%3A40+GMT%2B0800+(%E4%B8%AD%E5%9B%BD%E6%A0%87%E5%87%86%E6%97%B6%E9%97%B4)&version=202505.2.0&browserGpcFlag=0&isIABGlobal=false&hosts=&consentId=95dbfeb6-4330-4fbc-a69e-9d3866ef28e9&interactionCount=0&isAnonUser=1&landingPath=NotLandingPage&groups=1%3A1%2C2%3A1%2C3%3A1%2C4%3A1&AwaitingReconsent=false; _li_ss=CrcBCgYI-QEQvxsKBgj3ARC_GwoFCAoQvxsKBgjdARC_GwoGCPgBEL8bCgYIgQEQvxsKBQgMEMkbCgYI9QEQvxsKBQgLEL8bCgYI4wEQvxsKBgikARC_GwoGCLMBEL8bCgYIiQEQvxsKBgilARC_GwoGCIACEMEbCgYI4QEQvxsKBgiiARC_GwoGCP8BEL8bCgkI_____wcQyRsKBgiHAhC_GwoGCNIBEL8bCgUIfhC_GwoGCIgBEL8b; _chartbeat2=.1755241034327.1755241723589.1.BDkzGYDJaVEeuVYKiDIkF3uBoiWW_.3; _chartbeat5=46|786|%2Fmarkets%2Fus%2F|https%3A%2F%2Fwww.reuters.com%2Fmarkets%2Fquote%2F.DJI%2F|DfzhrFCD7w1WDOoGpsDLar1CBmdxo6||c|DS4V75DSSN9sDRgAYxCnIEHmzl4Mf|reuters.com||; _dd_s=rum=0&expire=1755242627928; _chartbeat4=t=D4pgAKC25dcqkFf0X6ffowCmFG_k&E=2&x=300&c=0.09&y=7850&w=991; _v__cb_cp=B6PxK9Bap5OhDb9vJofLTMTDKP4FY'
+    }
+    
+    def _request_params(self, url: str, query: str, extra_params: dict = None) -> dict:
+        """请求参数"""
+        # 基础参数
+        params = {'query': query}
         
-        # 设置默认请求头
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-GB,en;q=0.9',
-            'Referer': 'https://www.reuters.com/',
-            'Origin': 'https://www.reuters.com',
-            'Cookie': 'cleared-onetrust-cookies=Thu, 17 Feb 2022 19:17:07 GMT; usprivacy=1---; _gcl_au=1.1.1644174517.1755241032; _li_dcdm_c=.reuters.com; _lc2_fpi=f511229f0ef8--01k2p89arht3qzwny252ghayyr; _lc2_fpi_js=f511229f0ef8--01k2p89arht3qzwny252ghayyr; _fbp=fb.1.1755241033497.268690643371457521; sa-user-id=s%253A0-ab2954a1-a1bf-4b41-52cb-feb95f725f44.MYGdUTr3B5SteYctSaYNYGLOiH%252B3F5xdjRTh6cfOwnw; sa-user-id-v2=s%253AqylUoaG_S0FSy_65X3JfRD7Ar18.AtY6docCCFyF%252FqNSdIzfRWlwXQWDWKTxpxEwrUdW2dA; sa-user-id-v3=s%253AAQAKIBgvtu6HwSxupj2zC5qYZU6_AD1kquAm4DOYSWrd75yhEHwYAiDj2vrBBjoEtKIe0EIEiwQquQ.Lk%252BKeHlNTEEKcCcqIcD7M%252BdwOQMuVJ0pzoNyPw3n11Y; permutive-id=4582370c-99ea-47b1-b5b4-c821075f9cf2; _cb=CPNBaHCtxdvGsjk5H; _ga=GA1.2.753013835.1755241036; _gid=GA1.2.263185755.1755241036; cnx_userId=2-fc73794db9fd472ab4cd10ad51d79fac; ajs_anonymous_id=cb0ac241-f21d-4995-9f96-ebe6d65ad046; _v__chartbeat3=0G1CrDTjGWhCkziQJ; _cc_id=39be7e078d2a9d90c1d9feef044b65ac; panoramaId_expiry=1755327440485; panoramaId=0294451ead73ad503acecc6f9e88a9fb927a243e43ca048a043438eed0c2db09; panoramaIdType=panoDevice; idw-fe-id=5250eea5-a507-4516-ac8d-31781c530906; BOOMR_CONSENT="opted-in"; bounceClientVisit5431v=N4IgNgDiBcIBYBcEQM4FIDMBBNAmAYnvgO6kB0ATgKYCuCVFKZAxgPYC2RKNKCAhgEsAdnwBGAsAIQBPIs0ns+9ALRUhDAOayCEMH14DmyiKzBg6A1kOX8wAaxTKNrZcIQvWANwYIB7KspsNEIIFAJUjhA8cMp6KqLUfHYIcBSsNBoxuAAMuACsytkAHMoAjAAsRCAANCAUMCA1ILxKVDCgACZUnoZUAPoCHQ2luKUY2QBsGCMA7DOleeXlpbkYTRodEPXQAGZ8YChUtcz6YDB7B0cgPOf7h7VdPcxt0KAJrMSH2yAAwqkcbVq3kYliEwwwRTI2ShUKauiUO1YFHYDQA6sIOh8UE1Hr0+jIIC8QF0UMlWFBagk+EIhrAmsQqKIelRiLdLgBfWpCVh9OzCCICbHQUI0K7UACOot4+NYdjUDQweVE2VEAE48kVVYzssxRHqJpNyqIKkUinwqDtVR1cKrcFQ+B1shg+BNVbaOhMZswOsxTcwdkVRDNyhMDUrcEUmuxWOIwC8LvcQD0oLAJrgyKVbRmZnkM0UZusqKx2iAgiEKNIGgAJADSTQAXgIU41aiYWmA+mwug0mswpJXYFWrBoAAQ14e9qy+dQhTusbuwLAAZSa1A0oJ7tTXoL6In8m9L6XL0l3fH3g+HY4nxyPoRPXaJtcnwTvc66a0HNYA4k0+Ik30SOKKABMDZLU-ihDyD6gbUcRSDQC64OmGCwcO8ELqUFRkLgnIgKwOw7L0bKJigKA7J4CAwSACBgtApQ5nkuDLJMEy1O4cpCAAaoKUgAJK0iA9F5IxzGhnk2T0RgExND0KB8QAIsMDFMSsYkSTMUkgOy7JAA; OneTrustWPCCPAGoogleOptOut=false; _lr_retry_request=true; _lr_env_src_ats=false; _cb_svref=external; _lr_sampling_rate=100; _pbjs_userid_consent_data=3524755945110770; __gads=ID=621a923ae4af9ed1:T=1755241038:RT=1755241461:S=ALNI_MabX7LzAQdikEO9xZmn9qrUPaJ9jg; __gpi=UID=0000118075137b68:T=1755241038:RT=1755241461:S=ALNI_MbQjtXIoUrEP-Apps5HW0ek26X2mA; __eoi=ID=8f9883b9e0b28a09:T=1755241038:RT=1755241461:S=AA-AfjYsKHwaU9yqxPIuEZWBkC7A; dicbo_id=%7B%22dicbo_fetch%22%3A1755241643202%7D; _awl=2.1755241646.5-5dd0209f83c437a6053f786c790c4f7b-6763652d617369612d6561737431-0; cto_bundle=qczVwV9HQW15VjJsTkFuMiUyQlFnQ1JKTjlHS1JnRDJyWkk4OXFiUFJIeU9qalRWcmFwWWh3QVpyN3hLcjhiTVBNMnFDUDduYlJCTUdwN29vVEtBeWtiN09jMVczRlN3SW1jSlE0WVF0ekV4SGdNMHhUYWElMkZhdGFrY3RrNFlIMWxmdSUyRmFYejh6TkxyalEwZ0JQUWlJMHNGcTQxVHA2a2VsR3V5dllEOVRnTm1BSjFPSE5ickFhMWlTRndaWTFudlk5T0VnbGc5d3l1bnFtTG5RZDV6YkxSJTJGaEphWEElM0QlM0Q; _gat=1; reuters-geo={"country":"-", "region":"-"}; datadome=pu9J7SCuXhsWlqyhGO4d_QKpgaxAe3GqC0vn6mMiUswvjVBJ1xzO1ZYhuD0c1UlK3UlEmiUGa71HYfEYVIw7bIs22IX4SEWEztQU75RCEqbWn7E53TvHWjK9pzib6L2v; ABTasty=uid=qrdd8pk3zqqy7ymk; ABTastySession=mrasn=&lp=https%253A%252F%252Fwww.reuters.com%252Fsustainability%252Fclimate-energy%252Fplastic-pollution-talks-go-into-overtime-countries-push-late-breakthrough-2025-08-14%252F; OptanonConsent=isGpcEnabled=0&datestamp=Fri+Aug+15+2025+15%3A08%3A40+GMT%2B0800+(%E4%B8%AD%E5%9B%BD%E6%A0%87%E5%87%86%E6%97%B6%E9%97%B4)&version=202505.2.0&browserGpcFlag=0&isIABGlobal=false&hosts=&consentId=95dbfeb6-4330-4fbc-a69e-9d3866ef28e9&interactionCount=0&isAnonUser=1&landingPath=NotLandingPage&groups=1%3A1%2C2%3A1%2C3%3A1%2C4%3A1&AwaitingReconsent=false; _li_ss=CrcBCgYI-QEQvxsKBgj3ARC_GwoFCAoQvxsKBgjdARC_GwoGCPgBEL8bCgYIgQEQvxsKBQgMEMkbCgYI9QEQvxsKBQgLEL8bCgYI4wEQvxsKBgikARC_GwoGCLMBEL8bCgYIiQEQvxsKBgilARC_GwoGCIACEMEbCgYI4QEQvxsKBgiiARC_GwoGCP8BEL8bCgkI_____wcQyRsKBgiHAhC_GwoGCNIBEL8bCgUIfhC_GwoGCIgBEL8b; _chartbeat2=.1755241034327.1755241723589.1.BDkzGYDJaVEeuVYKiDIkF3uBoiWW_.3; _chartbeat5=46|786|%2Fmarkets%2Fus%2F|https%3A%2F%2Fwww.reuters.com%2Fmarkets%2Fquote%2F.DJI%2F|DfzhrFCD7w1WDOoGpsDLar1CBmdxo6||c|DS4V75DSSN9sDRgAYxCnIEHmzl4Mf|reuters.com||; _dd_s=rum=0&expire=1755242627928; _chartbeat4=t=D4pgAKC25dcqkFf0X6ffowCmFG_k&E=2&x=300&c=0.09&y=7850&w=991; _v__cb_cp=B6PxK9Bap5OhDb9vJofLTMTDKP4FY'
-        })
+        # 根据不同的API端点添加不同的参数
+        if extra_params:
+            params.update(extra_params)
+        elif 'articles-by-stock-symbol' in url:
+            # 只对股票API添加这些参数
+            params.update({
+                'd': 303,
+                'mxId': '00000000',
+                '_website': 'reuters'
+            })
+        return params
     
-    def _make_request(self, url: str, query: str, debug: bool = False, extra_params: dict = None) -> Any:
-        """发起 API 请求"""
+    def _init_cache(self, cache: Union[ResponseCache, bool]):
+        """cache 为 True 时使用独立的缓存，传入 ResponseCache 实例时可在多个客户端间共享"""
+        self.cache = ResponseCache() if cache is True else (cache or None)
+    
+    # 重试的退避：第 n 次重试前等待 [0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2^n)] 内的随机秒数
+    RETRY_BACKOFF = 0.5
+    RETRY_BACKOFF_MAX = 10.0
+    
+    def _init_limiter(self, limiter: Union[RateLimiter, bool], retries: int):
+        """limiter 为 True 时使用独立的限速器，传入 RateLimiter 实例时可在多个客户端间共享"""
+        self.limiter = RateLimiter() if limiter is True else (limiter or None)
+        self.retries = retries
+    
+    def _request_delay(self, url: str) -> float:
+        """取限速令牌，返回 0 时可以发出请求，否则等待返回的秒数后再取"""
+        return self.limiter.acquire(url) if self.limiter is not None else 0.0
+    
+    def _retry_delay(self, url: str, response, attempt: int) -> Optional[float]:
+        """记录请求结果，返回重试前等待的秒数；不需要或不能再重试时返回 None
+        
+        response 为 None 表示连接失败或超时。接口都是 GET，可以安全重试。
+        """
+        status = response.status_code if response is not None else None
+        wait = retry_after(response.headers) if status in THROTTLE_STATUS else None
+        if self.limiter is not None:
+            self.limiter.feedback(url, status, wait)
+        if attempt >= self.retries or (status is not None and status not in THROTTLE_STATUS):
+            return None
+        backoff = random.uniform(0, min(self.RETRY_BACKOFF_MAX, self.RETRY_BACKOFF * 2 ** attempt))
+        return max(backoff, wait or 0.0)
+    
+    def _stored_article(self, path: str) -> Optional[Article]:
+        """本地文章库中的完整文章"""
+        return self.store.get(path) if self.store is not None else None
+    
+    def _store_article(self, article: Article, path: str) -> Article:
+        if self.store is not None:
+            self.store.put(article, complete=True, alias=path)
+        return article
+    
+    def _store_summaries(self, articles: Union[Articles, List[Article]]):
+        """列表接口返回的文章摘要顺带写入文章库"""
+        items = articles.articles if isinstance(articles, Articles) else articles
+        if self.store is not None and items:
+            self.store.put_many(items, complete=False)
+        return articles
+    
+    def _cache_lookup(self, url: str, query: str, extra_params: dict = None):
+        """返回 (缓存键, 条目, 条件请求头)；未启用缓存时均为 None"""
+        if self.cache is None:
+            return None, None, None
+        key = self.cache.key(url, query, extra_params)
+        entry = self.cache.get(key)
+        return key, entry, self.cache.validators(entry) or None
+    
+    def _cache_response(self, key: Optional[str], entry: Optional[CachedResponse], url: str, response) -> Any:
+        """处理响应：304 时沿用缓存的结果，否则检查响应并写入缓存"""
+        if response.status_code == 304 and entry is not None:
+            refreshed = self.cache.revalidate(key, url)
+            return (refreshed or entry).result
+        result = self._handle_response(response)
+        if self.cache is not None:
+            content = getattr(response, 'content', b'')
+            size = len(content) if isinstance(content, (bytes, str)) else 0
+            self.cache.put(key, url, result, response.headers, size)
+        return result
+    
+    def _handle_response(self, response) -> Any:
+        """检查响应并返回 result，requests 与 httpx 的响应对象均可"""
+        # 处理重定向
+        if 300 <= response.status_code < 400:
+            location = response.headers.get('Location', '/')
+            raise RedirectError(response.status_code, location)
+        
+        # 检查 HTTP 状态码
+        if not (200 <= response.status_code < 300):
+            raise ExternalError(response.status_code, response.text)
+        
+        # 解析 JSON 响应
         try:
-            if debug:
-                print(f"🔍 请求URL: {url}")
-                print(f"🔍 查询参数: {query}")
-            
-            # 基础参数
-            params = {'query': query}
-            
-            # 根据不同的API端点添加不同的参数
-            if extra_params:
-                params.update(extra_params)
-            elif 'articles-by-stock-symbol' in url:
-                # 只对股票API添加这些参数
-                params.update({
-                    'd': 303,
-                    'mxId': '00000000',
-                    '_website': 'reuters'
-                })
-            
-            response = self.session.get(
-                url,
-                params=params,
-                timeout=self.timeout
-            )
-            
-            if debug:
-                print(f"🔍 响应状态码: {response.status_code}")
-                print(f"🔍 响应内容: {response.text[:500]}...")
-            
-            # 处理重定向
-            if 300 <= response.status_code < 400:
-                location = response.headers.get('Location', '/')
-                raise RedirectError(response.status_code, location)
-            
-            # 检查 HTTP 状态码
-            if not (200 <= response.status_code < 300):
-                raise ExternalError(response.status_code, response.text)
-            
-            # 解析 JSON 响应
             api_response = response.json()
-            
-            # 检查 API 响应状态
-            status_code = api_response.get('statusCode', response.status_code)
-            if not (200 <= status_code < 300) or api_response.get('result') is None:
-                message = api_response.get('message', 'Unknown error')
-                raise ExternalError(status_code, message)
-            
-            return api_response['result']
-            
-        except requests.RequestException as e:
-            raise InternalError(f"Request failed: {str(e)}")
         except json.JSONDecodeError as e:
             raise InternalError(f"Failed to parse JSON response: {str(e)}")
+        
+        # 检查 API 响应状态
+        status_code = api_response.get('statusCode', response.status_code)
+        if not (200 <= status_code < 300) or api_response.get('result') is None:
+            message = api_response.get('message', 'Unknown error')
+            raise ExternalError(status_code, message)
+        
+        return api_response['result']
     
-    def fetch_article_by_url(self, path: str) -> Article:
-        """通过 URL 获取文章"""
+    # 各接口的 URL 与查询参数
+    
+    def _article_by_url_query(self, path: str):
         url = "https://www.reuters.com/pf/api/v3/content/fetch/article-by-id-or-url-v1"
-        query = json.dumps({"website_url": path, "website": "reuters"})
-        
-        result = self._make_request(url, query)
-        return self._parse_article(result)
+        return url, json.dumps({"website_url": path, "website": "reuters"})
     
-    def search_articles(self, keyword: str, offset: int = 0, size: int = 20) -> Articles:
-        """按关键词搜索文章"""
+    def _search_query(self, keyword: str, offset: int, size: int):
         url = "https://www.reuters.com/pf/api/v3/content/fetch/articles-by-search-v2"
-        query = json.dumps({
+        return url, json.dumps({
             "keyword": keyword,
             "offset": offset,
             "orderby": "display_date:desc",
             "size": size,
             "website": "reuters"
         })
-        
-        result = self._make_request(url, query)
-        return self._parse_articles(result)
     
-    def fetch_articles_by_stock_symbol(self, symbol: str) -> List[Article]:
-        """按股票代码获取相关文章"""
+    def _stock_symbol_query(self, symbol: str):
         url = "https://www.reuters.com/pf/api/v3/content/fetch/articles-by-stock-symbol-v1"
-        
         # 确保与Rust版本完全一致的JSON格式
-        query = f'{{"website":"reuters","symbol":"{symbol}","size": 1 }}'
-        
-        try:
-            result = self._make_request(url, query)
-            articles_data = result.get('articles', [])
-            return [self._parse_article(article_data) for article_data in articles_data]
-        except ExternalError as e:
-            # 如果404，可能是股票代码不存在，返回空列表而不是抛出异常
-            if e.status_code == 404:
-                return []
-            raise
+        return url, f'{{"website":"reuters","symbol":"{symbol}","size": 1 }}'
     
-    def fetch_articles_by_topic(self, path: str, offset: int = 0, size: int = 20) -> Articles:
-        """按主题获取文章"""
+    def _topic_query(self, path: str, offset: int, size: int):
         url = "https://www.reuters.com/pf/api/v3/content/fetch/articles-by-topic-v1"
-        
         # 确保路径格式正确
         if not path.startswith('/'):
             path = '/' + path
-        
-        query = json.dumps({
+        return url, json.dumps({
             "offset": offset,
             "size": size,
             "topic_url": path,
             "website": "reuters"
         })
-        
-        result = self._make_request(url, query)
-        return self._parse_articles(result)
     
-    def fetch_articles_by_section(self, path: str, offset: int = 0, size: int = 20) -> Articles:
-        """按分类获取文章"""
+    def _section_query(self, path: str, offset: int, size: int):
         url = "https://www.reuters.com/pf/api/v3/content/fetch/recent-stories-by-sections-v1"
-        query = json.dumps({
+        return url, json.dumps({
             "offset": offset,
             "size": size,
             "section_ids": path,
             "website": "reuters"
         })
-        
-        result = self._make_request(url, query)
-        return self._parse_articles(result)
     
-    def fetch_site_hierarchy(self) -> Section:
-        """获取网站层级结构"""
-        url = "https://www.reuters.com/pf/api/v3/content/fetch/site-hierarchy-by-name-v1"
+    def _site_hierarchy_query(self):
+        return "https://www.reuters.com/pf/api/v3/content/fetch/site-hierarchy-by-name-v1", ""
+    
+    # 支持翻页的接口：来源 -> (方法名, 参数名)
+    PAGED_SOURCES = {
+        "search": ("search_articles", "keyword"),
+        "topic": ("fetch_articles_by_topic", "path"),
+        "section": ("fetch_articles_by_section", "path"),
+    }
+    
+    def _page_call(self, source: str, value: str, offset: int, size: int) -> Callable:
+        """获取某一页的调用"""
+        if source not in self.PAGED_SOURCES:
+            raise ValueError(f"不支持的来源: {source}，可选: {list(self.PAGED_SOURCES)}")
+        method, argument = self.PAGED_SOURCES[source]
+        return partial(getattr(self, method), **{argument: value, "offset": offset, "size": size})
+    
+    @staticmethod
+    def _next_offset(page: Articles, offset: int, page_size: int, count: int,
+                     limit: Optional[int], since: Optional[str]) -> Optional[int]:
+        """下一页的偏移量，没有更多需要的文章时返回 None
         
-        result = self._make_request(url, "")
-        return self._parse_section(result)
+        count 为包括本页在内最多能得到的文章数；文章按发布时间倒序，本页最后一篇早于 since 时不再翻页
+        """
+        articles = page.articles or []
+        total = page.pagination.total_size
+        if len(articles) < page_size or (total is not None and offset + page_size >= total):
+            return None
+        if limit is not None and count >= limit:
+            return None
+        if since and articles[-1].published_time and articles[-1].published_time < since:
+            return None
+        return offset + page_size
     
     def _ensure_full_url(self, url: str) -> str:
         """确保URL是完整的绝对链接"""
-        if not url:
-            return ""
-        
-        # 如果已经是完整URL，直接返回
-        if url.startswith('http://') or url.startswith('https://'):
-            return url
-        
-        # 如果是相对路径，添加基础URL
-        if url.startswith('/'):
-            return f"{self.BASE_URL}{url}"
-        else:
-            return f"{self.BASE_URL}/{url}"
+        return full_url(url)
     
     def _parse_article(self, data: Dict[str, Any]) -> Article:
-        """解析文章数据"""
-        thumbnail = None
-        if data.get('thumbnail'):
-            thumbnail_data = data['thumbnail']
-            thumbnail = Image(
-                caption=thumbnail_data.get('caption'),
-                width=thumbnail_data.get('width'),
-                height=thumbnail_data.get('height'),
-                resizer_url=thumbnail_data.get('resizer_url', '')
-            )
-        
-        authors = None
-        if data.get('authors'):
-            authors = [
-                Topic(
-                    name=author.get('name', ''),
-                    topic_url=self._ensure_full_url(author.get('topic_url', '')),
-                    byline=author.get('byline', '')
-                )
-                for author in data['authors']
-            ]
-        
+        """解析文章数据，authors 和 thumbnail 在首次访问时才解析"""
         # 确保canonical_url是完整的URL
         canonical_url = self._ensure_full_url(data.get('canonical_url', ''))
         
@@ -291,8 +478,8 @@ class ReutersClient:
             canonical_url=canonical_url,
             description=data.get('description', ''),
             content_elements=data.get('content_elements'),
-            authors=authors,
-            thumbnail=thumbnail,
+            authors=data.get('authors') or None,
+            thumbnail=data.get('thumbnail') or None,
             published_time=data.get('published_time', '')
         )
     
@@ -335,6 +522,267 @@ class ReutersClient:
         )
 
 
+class ReutersClient(_ReutersClientBase):
+    """Reuters API 客户端"""
+    
+    def __init__(self, timeout: int = 30, cache: Union[ResponseCache, bool] = True, store=None,
+                 limiter: Union[RateLimiter, bool] = True, retries: int = 3):
+        """
+        Args:
+            timeout: 请求超时秒数
+            cache: 响应缓存，见 response_cache.ResponseCache
+            store: 本地文章库（article_store.ArticleStore），已保存的文章不再请求
+            limiter: 按接口限速，见 rate_limiter.RateLimiter；False 表示不限速
+            retries: 遇到 429、5xx 或连接失败时的最多重试次数
+        """
+        self.session = requests.Session()
+        self.timeout = timeout
+        self.store = store
+        self._init_cache(cache)
+        self._init_limiter(limiter, retries)
+        
+        # 设置默认请求头
+        self.session.headers.update(self.HEADERS)
+    
+    def _make_request(self, url: str, query: str, debug: bool = False, extra_params: dict = None) -> Any:
+        """发起 API 请求"""
+        try:
+            if debug:
+                print(f"🔍 请求URL: {url}")
+                print(f"🔍 查询参数: {query}")
+            
+            key, entry, headers = self._cache_lookup(url, query, extra_params)
+            if entry is not None and entry.fresh:
+                if debug:
+                    print("🔍 命中缓存")
+                return entry.result
+            
+            params = self._request_params(url, query, extra_params)
+            for attempt in itertools.count():
+                while (delay := self._request_delay(url)) > 0:
+                    time.sleep(delay)
+                try:
+                    response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+                except requests.RequestException:
+                    delay = self._retry_delay(url, None, attempt)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    continue
+                
+                if debug:
+                    print(f"🔍 响应状态码: {response.status_code}")
+                    print(f"🔍 响应内容: {response.text[:500]}...")
+                
+                delay = self._retry_delay(url, response, attempt)
+                if delay is None:
+                    break
+                if debug:
+                    print(f"🔍 {delay:.1f} 秒后重试")
+                time.sleep(delay)
+            
+            return self._cache_response(key, entry, url, response)
+            
+        except requests.RequestException as e:
+            raise InternalError(f"Request failed: {str(e)}")
+    
+    def fetch_article_by_url(self, path: str) -> Article:
+        """通过 URL 获取文章，文章库中已有时不再请求"""
+        article = self._stored_article(path)
+        if article is not None:
+            return article
+        result = self._make_request(*self._article_by_url_query(path))
+        return self._store_article(self._parse_article(result), path)
+    
+    def search_articles(self, keyword: str, offset: int = 0, size: int = 20) -> Articles:
+        """按关键词搜索文章"""
+        result = self._make_request(*self._search_query(keyword, offset, size))
+        return self._store_summaries(self._parse_articles(result))
+    
+    def fetch_articles_by_stock_symbol(self, symbol: str) -> List[Article]:
+        """按股票代码获取相关文章"""
+        try:
+            result = self._make_request(*self._stock_symbol_query(symbol))
+            articles_data = result.get('articles', [])
+            return self._store_summaries([self._parse_article(article_data) for article_data in articles_data])
+        except ExternalError as e:
+            # 如果404，可能是股票代码不存在，返回空列表而不是抛出异常
+            if e.status_code == 404:
+                return []
+            raise
+    
+    def fetch_articles_by_topic(self, path: str, offset: int = 0, size: int = 20) -> Articles:
+        """按主题获取文章"""
+        result = self._make_request(*self._topic_query(path, offset, size))
+        return self._store_summaries(self._parse_articles(result))
+    
+    def fetch_articles_by_section(self, path: str, offset: int = 0, size: int = 20) -> Articles:
+        """按分类获取文章"""
+        result = self._make_request(*self._section_query(path, offset, size))
+        return self._store_summaries(self._parse_articles(result))
+    
+    def fetch_site_hierarchy(self) -> Section:
+        """获取网站层级结构"""
+        result = self._make_request(*self._site_hierarchy_query())
+        return self._parse_section(result)
+    
+    def iter_articles(self, source: str, value: str, page_size: int = 20, limit: Optional[int] = None,
+                      since: Optional[str] = None) -> Iterator[Article]:
+        """逐篇返回文章并自动翻页，调用方处理当前页时后台预取下一页
+        
+        Args:
+            source: "search"（按关键词）、"topic"（按主题路径）或 "section"（按分类ID）
+            value: 关键词、主题路径或分类ID
+            page_size: 每页文章数
+            limit: 最多返回的文章数，None 表示取到最后一页
+            since: 只返回该时间之后发布的文章，如 "2025-01-01"，遇到更早的文章即停止
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reuters-prefetch")
+        offset, count = 0, 0
+        pending = executor.submit(self._page_call(source, value, offset, page_size))
+        try:
+            while pending is not None:
+                page = pending.result()
+                articles = page.articles or []
+                offset = self._next_offset(page, offset, page_size, count + len(articles), limit, since)
+                pending = None if offset is None else executor.submit(self._page_call(source, value, offset, page_size))
+                for article in articles:
+                    if since and article.published_time and article.published_time < since:
+                        return
+                    yield article
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+
+
+class AsyncReutersClient(_ReutersClientBase):
+    """Reuters API 异步客户端
+    
+    基于 httpx.AsyncClient，连接在请求间复用；max_concurrency 限制同时进行的请求数，
+    多个请求可用 asyncio.gather 并发发起。
+    """
+    
+    def __init__(self, timeout: int = 30, max_concurrency: int = 8, cache: Union[ResponseCache, bool] = True,
+                 store=None, limiter: Union[RateLimiter, bool] = True, retries: int = 3):
+        import httpx
+        
+        self.timeout = timeout
+        self.store = store
+        self._init_cache(cache)
+        self._init_limiter(limiter, retries)
+        self.client = httpx.AsyncClient(
+            headers=self.HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http_error = httpx.HTTPError
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """关闭连接池"""
+        await self.client.aclose()
+    
+    async def _make_request(self, url: str, query: str, extra_params: dict = None) -> Any:
+        """发起 API 请求"""
+        key, entry, headers = self._cache_lookup(url, query, extra_params)
+        if entry is not None and entry.fresh:
+            return entry.result
+        params = self._request_params(url, query, extra_params)
+        for attempt in itertools.count():
+            while (delay := self._request_delay(url)) > 0:
+                await asyncio.sleep(delay)
+            try:
+                async with self._semaphore:
+                    response = await self.client.get(url, params=params, headers=headers)
+            except self._http_error as e:
+                delay = self._retry_delay(url, None, attempt)
+                if delay is None:
+                    raise InternalError(f"Request failed: {str(e)}")
+                await asyncio.sleep(delay)
+                continue
+            delay = self._retry_delay(url, response, attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        return self._cache_response(key, entry, url, response)
+    
+    async def fetch_article_by_url(self, path: str) -> Article:
+        """通过 URL 获取文章，文章库中已有时不再请求"""
+        article = self._stored_article(path)
+        if article is not None:
+            return article
+        result = await self._make_request(*self._article_by_url_query(path))
+        return self._store_article(self._parse_article(result), path)
+    
+    async def search_articles(self, keyword: str, offset: int = 0, size: int = 20) -> Articles:
+        """按关键词搜索文章"""
+        result = await self._make_request(*self._search_query(keyword, offset, size))
+        return self._store_summaries(self._parse_articles(result))
+    
+    async def fetch_articles_by_stock_symbol(self, symbol: str) -> List[Article]:
+        """按股票代码获取相关文章"""
+        try:
+            result = await self._make_request(*self._stock_symbol_query(symbol))
+        except ExternalError as e:
+            # 如果404，可能是股票代码不存在，返回空列表而不是抛出异常
+            if e.status_code == 404:
+                return []
+            raise
+        return self._store_summaries([self._parse_article(article_data) for article_data in result.get('articles', [])])
+    
+    async def fetch_articles_by_topic(self, path: str, offset: int = 0, size: int = 20) -> Articles:
+        """按主题获取文章"""
+        result = await self._make_request(*self._topic_query(path, offset, size))
+        return self._store_summaries(self._parse_articles(result))
+    
+    async def fetch_articles_by_section(self, path: str, offset: int = 0, size: int = 20) -> Articles:
+        """按分类获取文章"""
+        result = await self._make_request(*self._section_query(path, offset, size))
+        return self._store_summaries(self._parse_articles(result))
+    
+    async def fetch_site_hierarchy(self) -> Section:
+        """获取网站层级结构"""
+        result = await self._make_request(*self._site_hierarchy_query())
+        return self._parse_section(result)
+    
+    async def iter_articles(self, source: str, value: str, page_size: int = 20, limit: Optional[int] = None,
+                            since: Optional[str] = None) -> AsyncIterator[Article]:
+        """逐篇返回文章并自动翻页，调用方处理当前页时预取下一页，参数同 ReutersClient.iter_articles
+        
+        提前结束迭代时请用 contextlib.aclosing，以便取消正在预取的请求
+        """
+        offset, count = 0, 0
+        pending = asyncio.ensure_future(self._page_call(source, value, offset, page_size)())
+        try:
+            while pending is not None:
+                page = await pending
+                articles = page.articles or []
+                offset = self._next_offset(page, offset, page_size, count + len(articles), limit, since)
+                pending = None if offset is None else asyncio.ensure_future(
+                    self._page_call(source, value, offset, page_size)())
+                for article in articles:
+                    if since and article.published_time and article.published_time < since:
+                        return
+                    yield article
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+
 # 使用示例
 if __name__ == "__main__":
     client = ReutersClient()
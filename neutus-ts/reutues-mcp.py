@@ -8,6 +8,8 @@ Reuters MCP Server
 它提供了对Reuters新闻数据的访问，通过MCP协议暴露Reuters API。
 """
 
+import asyncio
+import contextlib
 import sys
 import os
 from typing import Dict, List, Optional, Any
@@ -18,7 +20,7 @@ import pandas as pd
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from reuters_client import (
-    ReutersClient, 
+    AsyncReutersClient, 
     ApiError, 
     RedirectError, 
     ExternalError, 
@@ -26,46 +28,64 @@ from reuters_client import (
     Article,
     Articles,
     Topic,
-    Section
+    Section,
+    SUMMARY_FIELDS,
+    article_serializer,
+    merge_articles
 )
 
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from article_store import ArticleStore, article_text
+from feed_watcher import FeedWatcher, parse_feeds
+from text_extract import estimate_tokens, truncate_paragraphs
+
 from fastmcp import FastMCP
 
 # 限制返回的最大数据行数
 MAX_DATA_ROW = 50
 
-# 创建MCP服务器实例
-mcp = FastMCP("Reuters新闻数据服务", dependencies=["requests>=2.25.0"])
+# reuters_latest_articles 最多返回的文章数
+MAX_STREAM_ARTICLES = 200
+
+# 精简列表默认返回的字段
+BRIEF_FIELDS = ("title", "canonical_url", "description", "published_time")
+
+# 创建MCP服务器实例，服务运行期间在后台轮询订阅的分类和主题
+mcp = FastMCP("Reuters新闻数据服务", dependencies=["requests>=2.25.0", "httpx>=0.24.0"],
+              lifespan=lambda server: feed_watcher.running())
+
+# 客户端的响应缓存
+response_cache = ResponseCache(max_bytes=64 * 1024 * 1024)
 
-# 创建全局Reuters客户端实例
-reuters_client = ReutersClient(timeout=30)
+# 本地文章库，已获取过的文章直接从本地读取，路径见 REUTERS_MCP_DATA_DIR
+article_store = ArticleStore()
+
+# 客户端的限速器，Reuters 返回 429 或 5xx 时自动降速
+rate_limiter = RateLimiter()
+
+# 全局Reuters客户端；工具均为异步函数，限速与重试等待不阻塞事件循环
+async_reuters_client = AsyncReutersClient(timeout=30, max_concurrency=8, cache=response_cache, store=article_store,
+                                          limiter=rate_limiter)
+
+# 后台订阅，REUTERS_WATCH_FEEDS 如 "section:/markets/,topic:/markets/commodities/"，
+# REUTERS_WATCH_INTERVAL 为轮询间隔秒数
+feed_watcher = FeedWatcher(
+    async_reuters_client,
+    parse_feeds(os.environ.get("REUTERS_WATCH_FEEDS", "")),
+    interval=float(os.environ.get("REUTERS_WATCH_INTERVAL", 120))
+)
 
 # 通用的数据处理函数
-def process_articles_result(articles: List[Article], description: str = "articles") -> dict:
-    """处理文章列表结果，确保返回正确的字典格式"""
+def process_articles_result(articles: List[Article], description: str = "articles", serialize=None) -> dict:
+    """处理文章列表结果，确保返回正确的字典格式；serialize 见 article_serializer"""
     try:
         # 限制返回的文章数量
         limited_articles = articles[:min(MAX_DATA_ROW, len(articles))]
         
         # 将Article对象转换为字典
-        articles_data = []
-        for article in limited_articles:
-            article_dict = {
-                "title": article.title,
-                "canonical_url": article.canonical_url,
-                "description": article.description,
-                "published_time": article.published_time,
-                "subtype": article.subtype,
-                "authors": [{"name": author.name, "topic_url": author.topic_url, "byline": author.byline} 
-                           for author in article.authors] if article.authors else [],
-                "thumbnail": {
-                    "caption": article.thumbnail.caption,
-                    "width": article.thumbnail.width,
-                    "height": article.thumbnail.height,
-                    "resizer_url": article.thumbnail.resizer_url
-                } if article.thumbnail else None
-            }
-            articles_data.append(article_dict)
+        serialize = serialize or article_serializer()
+        articles_data = [serialize(article) for article in limited_articles]
         
         return {
             "success": True,
@@ -80,8 +100,9 @@ def process_articles_result(articles: List[Article], description: str = "article
             description: []
         }
 
-def process_articles_with_pagination_result(articles_result: Articles, description: str = "articles") -> dict:
-    """处理带分页的文章结果"""
+def process_articles_with_pagination_result(articles_result: Articles, description: str = "articles",
+                                            serialize=None) -> dict:
+    """处理带分页的文章结果；serialize 见 article_serializer"""
     try:
         articles_data = []
         
@@ -90,23 +111,8 @@ def process_articles_with_pagination_result(articles_result: Articles, descripti
             limited_articles = articles_result.articles[:min(MAX_DATA_ROW, len(articles_result.articles))]
             
             # 将Article对象转换为字典
-            for article in limited_articles:
-                article_dict = {
-                    "title": article.title,
-                    "canonical_url": article.canonical_url,
-                    "description": article.description,
-                    "published_time": article.published_time,
-                    "subtype": article.subtype,
-                    "authors": [{"name": author.name, "topic_url": author.topic_url, "byline": author.byline} 
-                               for author in article.authors] if article.authors else [],
-                    "thumbnail": {
-                        "caption": article.thumbnail.caption,
-                        "width": article.thumbnail.width,
-                        "height": article.thumbnail.height,
-                        "resizer_url": article.thumbnail.resizer_url
-                    } if article.thumbnail else None
-                }
-                articles_data.append(article_dict)
+            serialize = serialize or article_serializer()
+            articles_data = [serialize(article) for article in limited_articles]
         
         # 处理主题信息
         topics_data = []
@@ -152,7 +158,8 @@ def reuters_get_current_time() -> dict:
 
 # 工具函数：搜索Reuters文章
 @mcp.tool()
-def reuters_search_articles(keyword: str, offset: int = 0, size: int = 20) -> dict:
+async def reuters_search_articles(keyword: str, offset: int = 0, size: int = 20,
+                                  fields: Optional[List[str]] = None) -> dict:
     """按关键词搜索Reuters文章
     
     数据来源: Reuters API - 文章搜索
@@ -161,6 +168,8 @@ def reuters_search_articles(keyword: str, offset: int = 0, size: int = 20) -> di
         keyword: 搜索关键词，如"technology"、"artificial intelligence"等
         offset: 偏移量，用于分页，默认0
         size: 返回文章数量，默认20，最大50
+        fields: 每篇文章返回的字段，可选title、canonical_url、description、published_time、subtype、
+                authors、thumbnail，默认全部；只需标题列表时传["title", "canonical_url", "published_time"]
         
     Returns:
         dict: 包含搜索结果的字典，包括文章列表、分页信息等
@@ -168,9 +177,10 @@ def reuters_search_articles(keyword: str, offset: int = 0, size: int = 20) -> di
     try:
         # 限制size的最大值
         size = min(size, MAX_DATA_ROW)
+        serialize = article_serializer(fields)
         
-        search_results = reuters_client.search_articles(keyword=keyword, offset=offset, size=size)
-        return process_articles_with_pagination_result(search_results, "search_results")
+        search_results = await async_reuters_client.search_articles(keyword=keyword, offset=offset, size=size)
+        return process_articles_with_pagination_result(search_results, "search_results", serialize)
     except ApiError as e:
         return {
             "success": False,
@@ -186,37 +196,26 @@ def reuters_search_articles(keyword: str, offset: int = 0, size: int = 20) -> di
 
 # 工具函数：通过URL获取文章详情
 @mcp.tool()
-def reuters_article_by_url(article_path: str) -> dict:
+async def reuters_article_by_url(article_path: str, fields: Optional[List[str]] = None) -> dict:
     """通过URL路径获取文章详情
     
     数据来源: Reuters API - 文章详情
     
     Args:
         article_path: 文章URL路径，如"/business/energy/oil-prices-rise-2024-01-15/"
+        fields: 返回的字段，同reuters_search_articles，另可选content_elements（正文），默认全部
         
     Returns:
-        dict: 包含文章详情的字典，包括完整内容、作者信息等
+        dict: 包含文章详情的字典，包括完整内容、作者信息等；只需要正文时用reuters_article_text
     """
     try:
-        article = reuters_client.fetch_article_by_url(article_path)
+        serialize = article_serializer(fields, default=SUMMARY_FIELDS + ("content_elements",))
+        article = await async_reuters_client.fetch_article_by_url(article_path)
         
         # 将单个Article对象转换为字典
-        article_dict = {
-            "title": article.title,
-            "canonical_url": article.canonical_url,
-            "description": article.description,
-            "published_time": article.published_time,
-            "subtype": article.subtype,
-            "authors": [{"name": author.name, "topic_url": author.topic_url, "byline": author.byline} 
-                       for author in article.authors] if article.authors else [],
-            "thumbnail": {
-                "caption": article.thumbnail.caption,
-                "width": article.thumbnail.width,
-                "height": article.thumbnail.height,
-                "resizer_url": article.thumbnail.resizer_url
-            } if article.thumbnail else None,
-            "content_elements": article.content_elements[:10] if article.content_elements else []  # 限制内容元素数量
-        }
+        article_dict = serialize(article)
+        if "content_elements" in article_dict:
+            article_dict["content_elements"] = article_dict["content_elements"][:10]  # 限制内容元素数量
         
         return {
             "success": True,
@@ -235,31 +234,228 @@ def reuters_article_by_url(article_path: str) -> dict:
             "article_detail": None
         }
 
+# 工具函数：获取文章正文
+@mcp.tool()
+async def reuters_article_text(article_path: str, max_tokens: Optional[int] = 3000,
+                               max_chars: Optional[int] = None) -> dict:
+    """获取文章的纯文本正文
+    
+    把content_elements转为按段落分行的纯文本，去掉HTML和图片、视频等元数据，
+    比reuters_article_by_url返回的原始内容元素小得多。提取结果随文章保存在本地，
+    再次读取不重复解析。超出预算时整段截取，最后一段在句末或词边界处截断。
+    
+    Args:
+        article_path: 文章URL路径，如"/business/energy/oil-prices-rise-2024-01-15/"
+        max_tokens: 正文的token预算（估算值），默认3000，None表示不限制
+        max_chars: 正文的字符数上限，默认不限制
+        
+    Returns:
+        dict: 标题、链接、发布时间和正文text，truncated表示是否被截断
+    """
+    try:
+        article = await async_reuters_client.fetch_article_by_url(article_path)
+        body = await asyncio.to_thread(article_store.body, article_path)
+        if body is None:
+            body = article_text(article)
+        paragraphs = body.split("\n") if body else []
+        kept, truncated = truncate_paragraphs(paragraphs, max_chars=max_chars, max_tokens=max_tokens)
+        text = "\n".join(kept)
+        return {
+            "success": True,
+            "title": article.title,
+            "canonical_url": article.canonical_url,
+            "published_time": article.published_time,
+            "text": text,
+            "truncated": truncated,
+            "paragraphs": len(kept),
+            "total_paragraphs": len(paragraphs),
+            "estimated_tokens": estimate_tokens(text)
+        }
+    except ApiError as e:
+        return {
+            "success": False,
+            "error": f"Reuters API错误: {str(e)}",
+            "text": ""
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"获取文章正文失败: {str(e)}",
+            "text": ""
+        }
+
+# 工具函数：本地全文检索
+@mcp.tool()
+async def reuters_local_search(query: str, since: Optional[str] = None, until: Optional[str] = None,
+                               limit: int = 20, any_terms: bool = False, fields: Optional[List[str]] = None) -> dict:
+    """在本地已获取过的Reuters文章中全文检索
+    
+    检索范围是本服务获取过的所有文章（搜索结果只含标题和摘要，读取过详情的文章含正文），
+    不请求Reuters，上游限流时也可使用，不受上游分页数量限制。
+    
+    Args:
+        query: 检索词，多个词用空格分隔，如"oil opec"
+        since: 发布时间下限（含），如"2025-01-01"
+        until: 发布时间上限（含），如"2025-01-31"
+        limit: 返回文章数量，默认20，最大50
+        any_terms: 为True时命中任一检索词即可，默认须全部命中
+        fields: 返回的文章字段，同reuters_search_articles，默认title、canonical_url、description、published_time
+        
+    Returns:
+        dict: 按相关度排序的文章列表，snippet为命中片段
+    """
+    try:
+        serialize = article_serializer(fields, default=BRIEF_FIELDS)
+        # 本地库查询在线程中执行，不阻塞事件循环
+        matches = await asyncio.to_thread(article_store.search, query, limit=min(limit, MAX_DATA_ROW),
+                                          since=since, until=until, any_terms=any_terms)
+        results = []
+        for match in matches:
+            results.append({
+                **serialize(match["article"]),
+                "snippet": match["snippet"],
+                "score": round(match["score"], 3),
+                "has_body": match["complete"]
+            })
+        return {
+            "success": True,
+            "count": len(results),
+            "indexed_articles": len(article_store),
+            "local_results": results
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"本地检索失败: {str(e)}",
+            "local_results": []
+        }
+
+# 工具函数：连续翻页获取最新文章
+@mcp.tool()
+async def reuters_latest_articles(value: str, source: str = "search", limit: int = 100,
+                                  since: Optional[str] = None, fields: Optional[List[str]] = None) -> dict:
+    """获取某个关键词、主题或分类下最新的若干篇文章
+    
+    自动连续翻页，处理当前页时预取下一页，达到数量或早于since的文章即停止。
+    每篇只保留标题、链接、摘要和发布时间，适合"最近200篇关于X的文章"这类请求。
+    
+    Args:
+        value: 关键词（source为search）、主题路径（topic，如"/markets/"）或分类ID（section，如"/world/"）
+        source: "search"、"topic"或"section"，默认search
+        limit: 返回文章数量，默认100，最大200
+        since: 只返回该时间之后发布的文章，如"2025-01-01"
+        fields: 返回的文章字段，同reuters_search_articles，默认title、canonical_url、description、published_time
+        
+    Returns:
+        dict: 按发布时间倒序的文章列表
+    """
+    articles_data = []
+    try:
+        limit = max(1, min(limit, MAX_STREAM_ARTICLES))
+        serialize = article_serializer(fields, default=BRIEF_FIELDS, description_limit=200)
+        # 逐篇转为精简字典，不保留整页的原始结果
+        async with contextlib.aclosing(async_reuters_client.iter_articles(
+                source, value, page_size=MAX_DATA_ROW, limit=limit, since=since)) as stream:
+            async for article in stream:
+                articles_data.append(serialize(article))
+        return {
+            "success": True,
+            "count": len(articles_data),
+            "latest_articles": articles_data
+        }
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "latest_articles": []
+        }
+    except Exception as e:
+        # 中途失败时返回已获取的部分
+        return {
+            "success": False,
+            "error": f"获取文章失败: {str(e)}",
+            "count": len(articles_data),
+            "latest_articles": articles_data
+        }
+
+# 工具函数：订阅的新文章
+@mcp.tool()
+async def reuters_new_since(cursor: int = 0, feed: Optional[str] = None, limit: int = 50,
+                            fields: Optional[List[str]] = None) -> dict:
+    """获取后台订阅的分类和主题中新出现的文章
+    
+    服务端按REUTERS_WATCH_FEEDS配置的分类和主题定时轮询，新文章保存在内存中，
+    本工具不请求Reuters。首次调用传cursor=0，之后传上次返回的cursor只取新增的文章。
+    
+    Args:
+        cursor: 上次返回的cursor，默认0表示内存中的全部文章
+        feed: 只看某个订阅，如"section:/markets/"或"/markets/"，默认全部
+        limit: 返回文章数量，默认50，最大50；超出时下次用返回的cursor继续
+        fields: 返回的文章字段，同reuters_search_articles，默认title、canonical_url、description、published_time
+        
+    Returns:
+        dict: 新文章列表（按发现顺序，feed为来源订阅）、新的cursor和各订阅状态
+    """
+    try:
+        serialize = article_serializer(fields, default=BRIEF_FIELDS)
+        if not feed_watcher.feeds:
+            return {
+                "success": False,
+                "error": "未配置订阅，请设置环境变量REUTERS_WATCH_FEEDS，如\"section:/markets/,topic:/markets/commodities/\"",
+                "new_articles": []
+            }
+        items, next_cursor = feed_watcher.new_since(cursor, feed=feed, limit=max(1, min(limit, MAX_DATA_ROW)))
+        return {
+            "success": True,
+            "count": len(items),
+            "cursor": next_cursor,
+            "new_articles": [{"feed": name, **serialize(article)} for name, article in items],
+            "feeds": feed_watcher.status()
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"获取新文章失败: {str(e)}",
+            "new_articles": []
+        }
+
 # 工具函数：多关键词搜索（高级搜索）
 @mcp.tool()
-def reuters_advanced_search(keywords: List[str], max_results_per_keyword: int = 10) -> dict:
+async def reuters_advanced_search(keywords: List[str], max_results_per_keyword: int = 10,
+                                  fields: Optional[List[str]] = None) -> dict:
     """多关键词高级搜索
     
-    对多个关键词分别进行搜索并合并结果
+    对多个关键词分别进行搜索并合并结果，多个关键词搜到的同一篇文章只返回一次
     
     Args:
         keywords: 关键词列表，如["technology", "AI", "blockchain"]
         max_results_per_keyword: 每个关键词的最大结果数，默认10
+        fields: 返回的文章字段，同reuters_search_articles，默认不含thumbnail
         
     Returns:
-        dict: 包含所有关键词搜索结果的合并字典
+        dict: 包含所有关键词搜索结果的合并字典，按命中关键词数和发布时间排序，
+              search_keywords为该文章命中的关键词
     """
     try:
-        all_results = []
+        serialize = article_serializer(fields, default=SUMMARY_FIELDS[:-1])
+        groups = {}
         search_summary = []
         
         # 限制关键词数量和每个关键词的结果数
         keywords = keywords[:5]  # 最多5个关键词
         max_results_per_keyword = min(max_results_per_keyword, 10)
         
-        for keyword in keywords:
+        # 所有关键词并发搜索，耗时取决于最慢的一个
+        responses = await asyncio.gather(
+            *(async_reuters_client.search_articles(keyword=keyword, size=max_results_per_keyword)
+              for keyword in keywords),
+            return_exceptions=True
+        )
+        
+        for keyword, search_results in zip(keywords, responses):
             try:
-                search_results = reuters_client.search_articles(keyword=keyword, size=max_results_per_keyword)
+                if isinstance(search_results, BaseException):
+                    raise search_results
                 
                 keyword_summary = {
                     "keyword": keyword,
@@ -267,20 +463,7 @@ def reuters_advanced_search(keywords: List[str], max_results_per_keyword: int =
                     "returned_count": len(search_results.articles) if search_results.articles else 0
                 }
                 search_summary.append(keyword_summary)
-                
-                if search_results.articles:
-                    for article in search_results.articles:
-                        article_dict = {
-                            "search_keyword": keyword,  # 标记来源关键词
-                            "title": article.title,
-                            "canonical_url": article.canonical_url,
-                            "description": article.description,
-                            "published_time": article.published_time,
-                            "subtype": article.subtype,
-                            "authors": [{"name": author.name, "topic_url": author.topic_url} 
-                                       for author in article.authors] if article.authors else []
-                        }
-                        all_results.append(article_dict)
+                groups[keyword] = search_results.articles
                         
             except Exception as e:
                 keyword_summary = {
@@ -291,6 +474,13 @@ def reuters_advanced_search(keywords: List[str], max_results_per_keyword: int =
                 }
                 search_summary.append(keyword_summary)
         
+        all_results = []
+        for article, matched in merge_articles(groups):
+            all_results.append({
+                "search_keywords": matched,  # 命中的关键词
+                **serialize(article)
+            })
+        
         return {
             "success": True,
             "search_summary": search_summary,
@@ -307,12 +497,14 @@ def reuters_advanced_search(keywords: List[str], max_results_per_keyword: int =
 
 # 工具函数：热门主题文章聚合
 @mcp.tool()
-def reuters_trending_topics(topics: List[str] = None, articles_per_topic: int = 5) -> dict:
+async def reuters_trending_topics(topics: List[str] = None, articles_per_topic: int = 5,
+                                  fields: Optional[List[str]] = None) -> dict:
     """获取热门主题的文章聚合
     
     Args:
         topics: 主题列表，如果为None则使用默认热门主题
         articles_per_topic: 每个主题的文章数量，默认5
+        fields: 返回的文章字段，同reuters_search_articles，默认title、canonical_url、description、published_time
         
     Returns:
         dict: 包含各主题文章的聚合结果
@@ -325,24 +517,22 @@ def reuters_trending_topics(topics: List[str] = None, articles_per_topic: int =
         # 限制主题数量和每个主题的文章数
         topics = topics[:5]
         articles_per_topic = min(articles_per_topic, 10)
+        serialize = article_serializer(fields, default=BRIEF_FIELDS, description_limit=200)
         
         trending_results = {}
         
-        for topic in topics:
+        # 所有主题并发搜索
+        responses = await asyncio.gather(
+            *(async_reuters_client.search_articles(keyword=topic, size=articles_per_topic) for topic in topics),
+            return_exceptions=True
+        )
+        
+        for topic, search_results in zip(topics, responses):
             try:
-                # 先尝试作为搜索关键词
-                search_results = reuters_client.search_articles(keyword=topic, size=articles_per_topic)
+                if isinstance(search_results, BaseException):
+                    raise search_results
                 
-                topic_articles = []
-                if search_results.articles:
-                    for article in search_results.articles:
-                        article_dict = {
-                            "title": article.title,
-                            "canonical_url": article.canonical_url,
-                            "description": article.description[:200] + "..." if len(article.description) > 200 else article.description,
-                            "published_time": article.published_time
-                        }
-                        topic_articles.append(article_dict)
+                topic_articles = [serialize(article) for article in search_results.articles or []]
                 
                 trending_results[topic] = {
                     "total_available": search_results.pagination.total_size,
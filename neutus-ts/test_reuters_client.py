@@ -1,7 +1,14 @@
 # neutus-ts/test_reuters_client.py
+import asyncio
+import json
+import os
+import tempfile
+import time
 import unittest
 from unittest.mock import Mock, patch
-from reuters_client import ReutersClient, ApiError, ExternalError, InternalError
+from reuters_client import AsyncReutersClient, ReutersClient, ApiError, ExternalError, InternalError
+from response_cache import ResponseCache
+from article_store import ArticleStore
 
 class TestReutersClient(unittest.TestCase):
     
@@ -54,6 +61,52 @@ class TestReutersClient(unittest.TestCase):
         
         self.assertEqual(context.exception.status_code, 404)
     
+    @patch('time.monotonic')
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_retry_on_throttle(self, mock_get, mock_sleep, mock_monotonic):
+        """测试 429 时按 Retry-After 等待后重试，限速器降速"""
+        from rate_limiter import RateLimiter
+        # 模拟时钟，sleep 时推进
+        clock = [1000.0]
+        mock_monotonic.side_effect = lambda: clock[0]
+        mock_sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        throttled = Mock(status_code=429, headers={'Retry-After': '2'})
+        ok = Mock(status_code=200, headers={})
+        ok.json.return_value = {'statusCode': 200, 'result': {'pagination': {'total_size': 0}, 'articles': []}}
+        mock_get.side_effect = [throttled, ok]
+        limiter = RateLimiter(rate=4)
+        client = ReutersClient(cache=None, limiter=limiter)
+        
+        result = client.search_articles("test")
+        
+        self.assertEqual(result.pagination.total_size, 0)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertGreaterEqual(mock_sleep.call_args_list[0].args[0], 2)
+        stats = limiter.stats()['articles-by-search-v2']
+        self.assertEqual(stats['throttled'], 1)
+        self.assertAlmostEqual(stats['rate'], 2.05)  # 减半后成功一次加 0.05
+        
+        # 重试用尽后抛出 ExternalError
+        mock_get.side_effect = None
+        mock_get.return_value = Mock(status_code=503, headers={}, text='busy')
+        with self.assertRaises(ExternalError):
+            ReutersClient(cache=None, limiter=False, retries=2).search_articles("test")
+        self.assertEqual(mock_get.call_count, 5)
+    
+    def test_rate_limiter_spacing(self):
+        """测试令牌用完后按速率等待，Retry-After 期间暂停该接口"""
+        from rate_limiter import RateLimiter, retry_after
+        limiter = RateLimiter(rate=10, burst=2)
+        delays = [limiter.acquire('https://x/api/search') for _ in range(3)]
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        self.assertAlmostEqual(delays[2], 0.1, places=2)
+        self.assertEqual(limiter.acquire('https://x/api/topic'), 0.0)  # 各接口独立
+        limiter.feedback('https://x/api/topic', 429, retry_after=5)
+        self.assertAlmostEqual(limiter.acquire('https://x/api/topic'), 5, places=1)
+        self.assertEqual(retry_after({'Retry-After': '5'}), 5.0)
+        self.assertIsNone(retry_after({'Retry-After': 'soon'}))
+    
     def test_article_parsing(self):
         """测试文章数据解析"""
         article_data = {
@@ -80,6 +133,287 @@ class TestReutersClient(unittest.TestCase):
         self.assertEqual(article.authors[0].name, 'John Doe')
         self.assertIsNotNone(article.thumbnail)
         self.assertEqual(article.thumbnail.width, 800)
+    
+    def test_article_lazy_fields(self):
+        """测试 authors / thumbnail 首次访问时才解析，to_dict 不触发解析"""
+        from reuters_client import Article, Topic
+        article = self.client._parse_article({
+            'title': 'Lazy', 'canonical_url': '/world/lazy/',
+            'authors': [{'name': 'Jane', 'topic_url': '/authors/jane/'}],
+            'thumbnail': {'width': 10}
+        })
+        self.assertFalse(hasattr(article, '__dict__'))
+        data = article.to_dict()
+        self.assertIsInstance(article._authors[0], dict)
+        self.assertEqual(data['authors'][0]['topic_url'], 'https://www.reuters.com/authors/jane/')
+        
+        self.assertEqual(article.authors, [Topic(name='Jane', topic_url='https://www.reuters.com/authors/jane/')])
+        self.assertEqual(article.thumbnail.width, 10)
+        self.assertEqual(Article(**data), article)
+        self.assertEqual(article.to_dict(), data)
+
+    @patch('requests.Session.get')
+    def test_response_cache_and_revalidation(self, mock_get):
+        """测试响应缓存：未过期时不发请求，过期后带 ETag 条件请求，304 时沿用缓存"""
+        ok = Mock(status_code=200, headers={'ETag': '"v1"'}, content=b'x' * 100)
+        ok.json.return_value = {'statusCode': 200, 'result': {'pagination': {'total_size': 1}}}
+        mock_get.return_value = ok
+        
+        self.client.search_articles("test")
+        self.client.search_articles("test")
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertIsNone(mock_get.call_args.kwargs['headers'])
+        
+        # 过期后条件请求
+        for entry in self.client.cache._entries.values():
+            entry.expires_at = 0
+        mock_get.return_value = Mock(status_code=304, headers={})
+        result = self.client.search_articles("test")
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        self.assertEqual(result.pagination.total_size, 1)
+        self.assertEqual(self.client.cache.stats()['revalidated'], 1)
+    
+    def test_response_cache_key_and_eviction(self):
+        """测试缓存键忽略 query 字段顺序，超过大小上限时淘汰最久未使用的条目"""
+        cache = ResponseCache(max_bytes=250)
+        url = "https://www.reuters.com/pf/api/v3/content/fetch/articles-by-search-v2"
+        self.assertEqual(cache.key(url, '{"a": 1, "b": 2}'), cache.key(url, '{"b":2,"a":1}'))
+        for i in range(3):
+            cache.put(cache.key(url, str(i)), url, {"i": i}, size=100)
+        self.assertIsNone(cache.get(cache.key(url, "0")))
+        self.assertEqual(cache.get(cache.key(url, "2")).result, {"i": 2})
+        self.assertEqual(cache.stats()['bytes'], 200)
+
+    @patch('requests.Session.get')
+    def test_article_store(self, mock_get):
+        """测试文章库：搜索结果只写入摘要，完整文章读取一次后从本地返回"""
+        with tempfile.TemporaryDirectory() as root:
+            store = ArticleStore(os.path.join(root, "articles.sqlite3"))
+            client = ReutersClient(cache=False, store=store)
+            summary = {'title': 'Oil rises', 'canonical_url': '/business/oil-rises-2025-01-01/'}
+            search = Mock(status_code=200, headers={})
+            search.json.return_value = {'statusCode': 200, 'result': {'pagination': {}, 'articles': [summary]}}
+            detail = Mock(status_code=200, headers={})
+            detail.json.return_value = {'statusCode': 200, 'result': {
+                **summary, 'content_elements': [{'type': 'text', 'content': 'Body'}],
+                'authors': [{'name': 'Jane Roe'}]}}
+            
+            mock_get.return_value = search
+            client.search_articles("oil")
+            self.assertEqual(store.get('/business/oil-rises-2025-01-01/', complete=False).title, 'Oil rises')
+            
+            mock_get.return_value = detail
+            client.fetch_article_by_url('business/oil-rises-2025-01-01')
+            mock_get.return_value = search
+            client.search_articles("oil")  # 摘要不覆盖完整文章
+            article = client.fetch_article_by_url('https://www.reuters.com/business/oil-rises-2025-01-01/')
+            
+            self.assertEqual(mock_get.call_count, 3)
+            self.assertEqual(article.content_elements[0]['content'], 'Body')
+            self.assertEqual(article.authors[0].name, 'Jane Roe')
+            store.close()
+    
+    def test_article_store_search(self):
+        """测试本地全文检索：正文可检索，标题命中排在前面，按日期过滤"""
+        from reuters_client import Article
+        with tempfile.TemporaryDirectory() as root:
+            store = ArticleStore(os.path.join(root, "articles.sqlite3"))
+            store.put_many([
+                Article(title='Markets wrap', canonical_url='/markets/wrap/', published_time='2025-01-02T08:00:00Z',
+                        description='Stocks mixed as oil slips'),
+                Article(title='Oil jumps on OPEC cut', canonical_url='/markets/oil/',
+                        published_time='2025-01-03T08:00:00Z', description='Crude rallies'),
+            ])
+            store.put(Article(title='Chip stocks', canonical_url='/tech/chips/', published_time='2024-12-30T08:00:00Z',
+                              content_elements=[{'type': 'text', 'content': 'Shipping costs and <b>oil</b> prices'}]))
+            
+            hits = store.search("oil")
+            self.assertEqual([h['article'].canonical_url for h in hits], ['/markets/oil/', '/markets/wrap/', '/tech/chips/'])
+            self.assertIn('[oil]', hits[2]['snippet'])
+            self.assertTrue(hits[2]['complete'])
+            self.assertEqual(len(store.search("oil", since="2025-01-01", until="2025-01-02")), 1)
+            self.assertEqual(len(store.search('oil "AND chip')), 1)
+            self.assertEqual(len(store.search("opec chip", any_terms=True)), 2)
+            store.close()
+
+    
+    def test_iter_articles_pages_and_stops(self):
+        """测试自动翻页：预取下一页，达到数量或早于 since 时停止"""
+        offsets = []
+        
+        def fake_get(self, url, params=None, **kwargs):
+            query = json.loads(params['query'])
+            offsets.append(query['offset'])
+            # 共 10 篇，第 i 篇发布于 1 月 (20 - i) 日
+            articles = [{'title': f'a{i}', 'canonical_url': f'/world/a{i}/',
+                         'published_time': f'2025-01-{20 - i:02d}T00:00:00Z'}
+                        for i in range(query['offset'], min(query['offset'] + query['size'], 10))]
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                'statusCode': 200,
+                'result': {'pagination': {'total_size': 10}, 'articles': articles}
+            }
+            return response
+        
+        client = ReutersClient(cache=None)
+        with patch('requests.Session.get', fake_get):
+            titles = [a.title for a in client.iter_articles("search", "oil", page_size=3)]
+            self.assertEqual(titles, [f'a{i}' for i in range(10)])
+            self.assertEqual(sorted(offsets), [0, 3, 6, 9])
+            
+            offsets.clear()
+            titles = [a.title for a in client.iter_articles("search", "oil", page_size=3, limit=4)]
+            self.assertEqual(titles, ['a0', 'a1', 'a2', 'a3'])
+            self.assertEqual(sorted(offsets), [0, 3])
+            
+            offsets.clear()
+            titles = [a.title for a in client.iter_articles("topic", "/world/", page_size=3, since="2025-01-16")]
+            self.assertEqual(titles, ['a0', 'a1', 'a2', 'a3', 'a4'])
+            self.assertEqual(sorted(offsets), [0, 3])  # 第二页最后一篇已早于 since，不再预取
+        
+        with self.assertRaises(ValueError):
+            next(client.iter_articles("stock", "AAPL"))
+
+    
+    def test_article_serializer(self):
+        """测试字段投影：只输出请求的字段，不解析 authors / thumbnail"""
+        from reuters_client import article_serializer
+        article = self.client._parse_article({
+            'title': 'T', 'canonical_url': '/a/', 'description': 'x' * 10, 'published_time': '2025',
+            'authors': [{'name': 'Jane', 'topic_url': '/authors/jane/'}], 'thumbnail': {'width': 1}
+        })
+        
+        headline = article_serializer(["title", "canonical_url", "title"])(article)
+        self.assertEqual(headline, {'title': 'T', 'canonical_url': 'https://www.reuters.com/a/'})
+        
+        full = article_serializer(description_limit=4)(article)
+        self.assertEqual(full['description'], 'xxxx...')
+        self.assertEqual(full['authors'][0]['topic_url'], 'https://www.reuters.com/authors/jane/')
+        self.assertEqual(full['thumbnail']['width'], 1)
+        self.assertIsInstance(article._authors[0], dict)
+        
+        with self.assertRaises(ValueError):
+            article_serializer(["title", "body"])
+    
+    def test_text_extraction_and_budget(self):
+        """测试正文提取：只取文本类元素，按预算整段截取"""
+        from text_extract import article_paragraphs, truncate_paragraphs
+        paragraphs = article_paragraphs([
+            {'type': 'text', 'content': 'First <a href="x">para</a>graph &amp; more.'},
+            {'type': 'image', 'url': 'https://example.com/a.jpg', 'caption': 'skip'},
+            {'type': 'header', 'content': 'Section'},
+            {'type': 'list', 'items': [{'type': 'text', 'content': 'one'}, {'type': 'text', 'content': 'two'}]},
+            {'type': 'raw_html', 'content': '<script>skip()</script>'},
+        ])
+        self.assertEqual(paragraphs, ['First paragraph & more.', 'Section', '- one', '- two'])
+        
+        self.assertEqual(truncate_paragraphs(paragraphs), (paragraphs, False))
+        self.assertEqual(truncate_paragraphs(paragraphs, max_chars=36), (paragraphs[:2], True))
+        long = ['Sentence one is here. Sentence two goes on and on. ' * 4]
+        kept, truncated = truncate_paragraphs(long, max_tokens=10)
+        self.assertTrue(truncated)
+        self.assertTrue(kept[0].endswith('.'))
+        self.assertLessEqual(len(kept[0]), 40)
+    
+    def test_merge_articles(self):
+        """测试多关键词结果合并：按链接去重，记录命中关键词，按命中数和时间排序"""
+        from reuters_client import Article, merge_articles
+        oil = Article(title='Oil', canonical_url='https://www.reuters.com/oil/', published_time='2025-01-01')
+        opec = Article(title='OPEC', canonical_url='https://www.reuters.com/opec/', published_time='2025-01-03')
+        gas = Article(title='Gas', canonical_url='https://www.reuters.com/gas/', published_time='2025-01-02')
+        oil_again = Article(title='Oil', canonical_url='https://www.reuters.com/oil', published_time='2025-01-01')
+        
+        merged = merge_articles({'oil': [oil, opec], 'opec': [opec, oil_again], 'gas': [gas], 'none': None})
+        
+        self.assertEqual([(a.title, keywords) for a, keywords in merged],
+                         [('OPEC', ['oil', 'opec']), ('Oil', ['oil', 'opec']), ('Gas', ['gas'])])
+
+
+class TestAsyncReutersClient(unittest.TestCase):
+    
+    def test_concurrent_search_bounded(self):
+        """测试并发搜索：同时进行的请求数不超过 max_concurrency"""
+        active = 0
+        peak = 0
+        
+        async def fake_get(self, url, params=None, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.1)
+            active -= 1
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                'statusCode': 200,
+                'result': {
+                    'pagination': {'total_size': 1},
+                    'articles': [{'title': params['query'], 'canonical_url': '/world/a/'}]
+                }
+            }
+            return response
+        
+        async def search_all():
+            async with AsyncReutersClient(max_concurrency=3) as client:
+                return await asyncio.gather(*(client.search_articles(f"k{i}") for i in range(6)))
+        
+        with patch('httpx.AsyncClient.get', fake_get):
+            started = time.perf_counter()
+            results = asyncio.run(search_all())
+            elapsed = time.perf_counter() - started
+        
+        self.assertEqual(peak, 3)
+        self.assertLess(elapsed, 0.5)  # 串行需要 0.6 秒
+        self.assertIn('"keyword": "k5"', results[5].articles[0].title)
+        self.assertEqual(results[0].articles[0].canonical_url, 'https://www.reuters.com/world/a/')
+
+
+class TestFeedWatcher(unittest.TestCase):
+    
+    def test_incremental_polling(self):
+        """测试增量轮询：读到已见过的文章即停止，cursor 之后只返回新文章"""
+        from reuters_client import Article
+        from feed_watcher import FeedWatcher, parse_feeds
+        
+        class FakeClient:
+            PAGED_SOURCES = {"section": None, "topic": None}
+            
+            def __init__(self):
+                self.articles = [Article(title=f'a{i}', canonical_url=f'/a{i}/', published_time=f'2025-01-{i:02d}')
+                                 for i in range(3, 0, -1)]
+                self.read = 0
+            
+            async def iter_articles(self, source, value, page_size=20, limit=None, since=None):
+                for article in self.articles[:limit]:
+                    if since and article.published_time < since:
+                        return
+                    self.read += 1
+                    yield article
+        
+        self.assertEqual(parse_feeds("section:/markets/, /world/,topic:/markets/oil/"),
+                         [("section", "/markets/"), ("section", "/world/"), ("topic", "/markets/oil/")])
+        client = FakeClient()
+        watcher = FeedWatcher(client, [("section", "/markets/")])
+        feed = watcher.feeds[0]
+        
+        self.assertEqual(asyncio.run(watcher.poll(feed)), 3)
+        items, cursor = watcher.new_since(0)
+        self.assertEqual([a.title for _, a in items], ['a1', 'a2', 'a3'])
+        self.assertEqual(feed.high_water, '2025-01-03')
+        
+        client.articles = [Article(title='a5', canonical_url='/a5/', published_time='2025-01-05'),
+                           Article(title='a4', canonical_url='/a4/', published_time='2025-01-04')] + client.articles
+        client.read = 0
+        self.assertEqual(asyncio.run(watcher.poll(feed)), 2)
+        self.assertEqual(client.read, 3)  # 读到已见过的 a3 即停止
+        items, cursor = watcher.new_since(cursor)
+        self.assertEqual([(name, a.title) for name, a in items], [('section:/markets/', 'a4'), ('section:/markets/', 'a5')])
+        self.assertEqual(watcher.new_since(cursor), ([], cursor))
+        self.assertEqual(asyncio.run(watcher.poll(feed)), 0)
+        
+        with self.assertRaises(ValueError):
+            FeedWatcher(client, [("stock", "AAPL")])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+# neutus-ts/text_extract.py
+import html
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# 作为正文提取的元素类型；图片、视频、嵌入 HTML 等跳过
+TEXT_TYPES = ("text", "header", "list")
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+# 中日韩文字每字约一个 token，其余文本约 4 个字符一个 token
+_CJK = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+_SENTENCE_END = re.compile(r"[.!?。！？](?=\s|$)")
+
+
+def clean_html(content: str) -> str:
+    """去掉 HTML 标签与实体，合并空白"""
+    return _SPACE.sub(" ", html.unescape(_TAG.sub("", content))).strip()
+
+
+def element_paragraphs(element: Dict[str, Any]) -> List[str]:
+    """单个 content_element 中的段落"""
+    if not isinstance(element, dict) or element.get("type", "text") not in TEXT_TYPES:
+        return []
+    if element.get("type") == "list":
+        items = [clean_html(item["content"]) for item in element.get("items") or []
+                 if isinstance(item, dict) and isinstance(item.get("content"), str)]
+        return ["- " + item for item in items if item]
+    content = element.get("content")
+    text = clean_html(content) if isinstance(content, str) else ""
+    return [text] if text else []
+
+
+def article_paragraphs(content_elements: Optional[List[Dict[str, Any]]]) -> List[str]:
+    """把 content_elements 转为正文段落列表"""
+    paragraphs = []
+    for element in content_elements or []:
+        paragraphs.extend(element_paragraphs(element))
+    return paragraphs
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估计 token 数，不依赖分词器"""
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def _cut(paragraph: str, size: int) -> str:
+    """在 size 个字符内截断，尽量停在句末，其次是词边界"""
+    head = paragraph[:size]
+    ends = [match.end() for match in _SENTENCE_END.finditer(head)]
+    if ends and ends[-1] >= size // 2:
+        return head[:ends[-1]]
+    space = head.rfind(" ")
+    return (head[:space] if space >= size // 2 else head).rstrip() + "…"
+
+
+def truncate_paragraphs(paragraphs: List[str], max_chars: Optional[int] = None,
+                        max_tokens: Optional[int] = None) -> Tuple[List[str], bool]:
+    """按字符数和估计的 token 数截取段落，返回 (保留的段落, 是否截断)
+
+    整段保留直到预算用完；放不下的段落在句末或词边界处截断，剩余预算太少时直接丢弃。
+    """
+    kept: List[str] = []
+    chars = tokens = 0
+    for paragraph in paragraphs:
+        size, cost = len(paragraph) + 1, estimate_tokens(paragraph) + 1
+        room = min(max_chars - chars if max_chars is not None else size,
+                   (max_tokens - tokens) * size // cost if max_tokens is not None else size)
+        if room >= size:
+            kept.append(paragraph)
+            chars, tokens = chars + size, tokens + cost
+            continue
+        # 剩余预算不足 40 个字符时不再截半段
+        if room >= 40 or (not kept and room > 1):
+            kept.append(_cut(paragraph, max(room - 1, 0)))
+        return kept, True
+    return kept, False